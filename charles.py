@@ -1,8 +1,21 @@
-# Import the necessary libraries
+# Import the necessary libraries and scripts
 import random
+import numpy as np
+from random_streams import batch_generator
 
+# Names of every possible block value. The position of each name in this list is its integer code in the compact
+# (encoded) representation, so 'Break' is always encoded as 0 and 'Subject_i' as i
+BLOCK_NAMES = ['Break'] + [f"Subject_{i + 1}" for i in range(31)]
 
-def initialize_population(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day):
+# Reverse lookup from block name to its integer code
+BLOCK_CODES = {name: code for code, name in enumerate(BLOCK_NAMES)}
+
+# Integer code of the 'Break' block
+BREAK_CODE = 0
+
+
+def initialize_population(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day,
+                          rng=None):
     """
     Generates a population of schedules for a given number of individuals, where each individual
     consists of a possible weekly schedule for all the Practical Turns
@@ -13,12 +26,15 @@ def initialize_population(pop_size, num_practical_turns, subjects_per_practical_
     - subjects_per_practical_turn (int): Number of unique subjects each Practical Turn can have.
     - days_per_week (int): Number of days per week that classes are scheduled.
     - blocks_per_day (int): Number of blocks (periods) in each day's schedule.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - list: A list of individuals, where each individual is a list of Practical Turns, and each Practical Turn is a list
     of week days, with each day being a list of subjects (or 'Break') representing the schedule for that day for that
     Practical Turn.
     """
+    rng = random if rng is None else rng
 
     # Initialize an empty list to store the Population
     population = []
@@ -34,7 +50,7 @@ def initialize_population(pop_size, num_practical_turns, subjects_per_practical_
 
             # Generate a list of subject names from 'Subject_1' to 'Subject_30'
             subjects = [f"Subject_{i + 1}" for i in range(31)]
-            random.shuffle(subjects)  # Shuffle the list to randomize subject assignment
+            rng.shuffle(subjects)  # Shuffle the list to randomize subject assignment
 
             # Slice the list to get the desired number of subjects for the current Practical Turn
             class_subjects = subjects[:subjects_per_practical_turn]
@@ -45,19 +61,19 @@ def initialize_population(pop_size, num_practical_turns, subjects_per_practical_
             for day in range(days_per_week):
 
                 # Randomly decide how many Break blocks the current day will have
-                num_break_blocks = random.randint(1, blocks_per_day)
+                num_break_blocks = rng.randint(1, blocks_per_day)
 
                 # The number of subjects blocks the current day will have is the blocks per day - number of break blocks
                 num_subject_blocks = blocks_per_day - num_break_blocks
 
                 # Randomly select which subjects the current Practical Turn will have using the count of subjects blocks
                 # and selecting only from the subjects that the current Practical Turn is enrolled in
-                day_schedule = random.choices(class_subjects, k=num_subject_blocks)
+                day_schedule = rng.choices(class_subjects, k=num_subject_blocks)
 
                 # Fulfil the rest of the day with only Break blocks
                 day_schedule.extend(['Break'] * num_break_blocks)
 
-                random.shuffle(day_schedule)  # Shuffle to randomize the position of the 'Break' and subjects blocks
+                rng.shuffle(day_schedule)  # Shuffle to randomize the position of the 'Break' and subjects blocks
 
                 weekly_schedule.append(day_schedule)  # Append the daily schedule to the weekly schedule of the current Practical Turn
 
@@ -70,6 +86,157 @@ def initialize_population(pop_size, num_practical_turns, subjects_per_practical_
     return population
 
 
+def copy_individual(individual):
+    """
+    Create an independent copy of an individual, so that in-place mutations of the copy do not affect the original.
+
+    Parameters:
+    - individual (list): The individual to be copied.
+
+    Returns:
+    - list: A copy of the individual with new lists for every Practical Turn and day.
+    """
+    return [[day[:] for day in turn] for turn in individual]
+
+
+def encode_individual(individual):
+    """
+    Encodes an individual into its compact representation, a numpy array of integer block codes.
+
+    Parameters:
+    - individual (list): An individual (weekly schedule for all Practical Turns).
+
+    Returns:
+    - np.ndarray: An int8 array of shape (Practical Turns, days, blocks) where each cell holds the code of its block.
+    """
+    # Encoding a flat list and reshaping it is much faster than building the nested array directly
+    codes = [BLOCK_CODES[block] for turn in individual for day in turn for block in day]
+    return np.array(codes, dtype=np.int8).reshape(len(individual), len(individual[0]), len(individual[0][0]))
+
+
+def encode_population(population):
+    """
+    Encodes a whole population into a single compact population buffer.
+
+    Parameters:
+    - population (list): A list of individuals.
+
+    Returns:
+    - np.ndarray: An int8 array of shape (individuals, Practical Turns, days, blocks).
+    """
+    # Encoding a flat list and reshaping it is much faster than building the nested array directly
+    codes = [BLOCK_CODES[block] for individual in population for turn in individual for day in turn for block in day]
+    shape = (len(population), len(population[0]), len(population[0][0]), len(population[0][0][0]))
+    return np.array(codes, dtype=np.int8).reshape(shape)
+
+
+def decode_individual(encoded_individual):
+    """
+    Decodes a compact individual back into the nested list representation used by the Genetic Algorithm operators.
+
+    Parameters:
+    - encoded_individual (np.ndarray): An array of block codes of shape (Practical Turns, days, blocks).
+
+    Returns:
+    - list: The individual as a list of Practical Turns, each a list of days, each a list of block names.
+    """
+    return np.array(BLOCK_NAMES, dtype=object)[encoded_individual].tolist()
+
+
+def decode_population(encoded_population):
+    """
+    Decodes a compact population buffer back into a list of individuals.
+
+    Parameters:
+    - encoded_population (np.ndarray): An array of block codes of shape (individuals, Practical Turns, days, blocks).
+
+    Returns:
+    - list: A list of individuals in the nested list representation.
+    """
+    return np.array(BLOCK_NAMES, dtype=object)[encoded_population].tolist()
+
+
+def initialize_population_array(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week,
+                                blocks_per_day, out=None, rng=None, chunk_size=None):
+    """
+    Vectorized counterpart of 'initialize_population'. Generates the whole population with batched random draws and
+    writes it directly into a compact population buffer of block codes (see 'BLOCK_NAMES').
+
+    The distribution is the same as the one of 'initialize_population': every Practical Turn is enrolled in a random
+    set of distinct subjects, every day has a uniformly random number of 'Break' blocks between 1 and
+    'blocks_per_day', every other block is drawn uniformly from the Practical Turn's subjects, and the positions of the
+    'Break' blocks within the day are uniformly random.
+
+    Parameters:
+    - pop_size (int): Number of individuals (schedules) in the population.
+    - num_practical_turns (int): Number of Practical Turns.
+    - subjects_per_practical_turn (int): Number of unique subjects each Practical Turn can have.
+    - days_per_week (int): Number of days per week that classes are scheduled.
+    - blocks_per_day (int): Number of blocks (periods) in each day's schedule.
+    - out (np.ndarray): Optional preallocated integer buffer of shape (pop_size, num_practical_turns, days_per_week,
+      blocks_per_day) to write the population into. If None, a new int8 buffer is allocated.
+    - rng (np.random.Generator or random.Random): Random number generator to draw from. A random stream (see
+      'random_streams.py') is turned into a numpy generator seeded from it. If None, a fresh default generator is used.
+    - chunk_size (int): Number of individuals generated per batch, which bounds the size of the temporary arrays.
+      If None, it is chosen so that each batch draws roughly 4 million random numbers.
+
+    Returns:
+    - np.ndarray: The population buffer, with shape (pop_size, num_practical_turns, days_per_week, blocks_per_day).
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+    elif isinstance(rng, random.Random):
+        rng = batch_generator(rng)
+
+    shape = (pop_size, num_practical_turns, days_per_week, blocks_per_day)
+
+    # Allocate the population buffer, or check that the given one can hold the population
+    if out is None:
+        out = np.empty(shape, dtype=np.int8)
+    elif out.shape != shape:
+        raise ValueError(f"The population buffer must have shape {shape}, got {out.shape}")
+
+    num_subjects = len(BLOCK_NAMES) - 1
+    blocks_per_week = days_per_week * blocks_per_day
+
+    # Bound the memory of the temporary arrays by generating the population in chunks of individuals
+    if chunk_size is None:
+        draws_per_individual = num_practical_turns * max(num_subjects, 2 * blocks_per_week)
+        chunk_size = max(1, (1 << 22) // max(1, draws_per_individual))
+
+    for start in range(0, pop_size, chunk_size):
+        stop = min(start + chunk_size, pop_size)
+        size = stop - start
+
+        # Select the distinct subjects of every Practical Turn by keeping the first positions of a random permutation
+        # of all subjects (codes start at 1, since 0 is the 'Break' block)
+        turn_subjects = np.argsort(rng.random((size, num_practical_turns, num_subjects), dtype=np.float32),
+                                   axis=-1)[..., :subjects_per_practical_turn] + 1
+
+        # Draw the subject of every block uniformly from the subjects of its Practical Turn
+        subject_choices = rng.integers(0, subjects_per_practical_turn, size=(size, num_practical_turns,
+                                                                              blocks_per_week))
+        blocks = np.take_along_axis(turn_subjects, subject_choices, axis=-1).reshape(size, num_practical_turns,
+                                                                                     days_per_week, blocks_per_day)
+
+        # Randomly decide how many Break blocks every day will have
+        num_break_blocks = rng.integers(1, blocks_per_day + 1, size=(size, num_practical_turns, days_per_week))
+
+        # Place the Break blocks on the first positions of a random permutation of the day's blocks
+        positions = np.argsort(rng.random((size, num_practical_turns, days_per_week, blocks_per_day),
+                                          dtype=np.float32), axis=-1)
+        is_break = np.arange(blocks_per_day) < num_break_blocks[..., None]
+        break_mask = np.empty_like(is_break)
+        np.put_along_axis(break_mask, positions, is_break, axis=-1)
+        blocks[break_mask] = BREAK_CODE
+
+        # Write the chunk directly into the population buffer
+        out[start:stop] = blocks
+
+    return out
+
+
 # Generate a population with 100 individuals, each with 10 Practical Turns, 4 subjects per Practical Turn,
 # 5 days per week, and 8 blocks per day
 population = initialize_population(100, 10, 4, 5,
@@ -0,0 +1,299 @@
+# Import the necessary libraries and scripts
+from functools import partial
+import numpy as np
+from charles import BLOCK_CODES, BLOCK_NAMES, BREAK_CODE, encode_population
+
+# Default constraint specification. With it, the compiled evaluator scores every individual exactly as
+# 'fitness.fitness_individual' does
+DEFAULT_CONSTRAINTS = {
+    'min_blocks_per_subject': 8,       # Minimum number of blocks each subject must have in a week
+    'subject_quotas': {},              # Per-subject minimum number of weekly blocks, overriding the one above
+    'preferred_break_blocks': (3, 4),  # Preferred positions for 'Break' blocks (0-based indexing)
+    'max_consecutive_blocks': None,    # Maximum number of consecutive blocks of the same subject in a day (None = any)
+    'resources': None,                 # Teacher and room tables of the instance (see 'data.generate_resources')
+    'weights': {
+        'overlap': 3,                  # Penalty for each overlap of a subject across Practical Turns
+        'break_outside_preferred': 2,  # Penalty for each 'Break' outside the preferred blocks
+        'missing_break': 4,            # Penalty for each day without a 'Break'
+        'quota_shortfall': 5,          # Penalty for each block missing to reach a subject's weekly quota
+        'consecutive_blocks': 1,       # Penalty for each block beyond the maximum consecutive blocks of a subject
+        'teacher_clash': 3,            # Penalty for each extra subject a teacher must teach in the same slot
+        'room_overflow': 3,            # Penalty for each class in a slot beyond the number of available rooms
+        'teacher_unavailable': 4       # Penalty for each class in a slot where its teacher is unavailable
+    }
+}
+
+# Names of the penalty components, in the order 'penalty_components' returns them
+PENALTY_COMPONENTS = ['overlap', 'break_outside_preferred', 'missing_break', 'quota_shortfall', 'consecutive_blocks',
+                      'teacher_clash', 'room_overflow', 'teacher_unavailable']
+
+
+def compile_constraints(constraints=None, blocks_per_day=8, days_per_week=5):
+    """
+    Compile a constraint specification once into the lookup tables used by the fast evaluator.
+
+    Parameters:
+    - constraints (dict): The constraint specification. Missing entries (and missing weights) take their values from
+      'DEFAULT_CONSTRAINTS'. If None, the default specification is used.
+    - blocks_per_day (int): Number of blocks in each day.
+    - days_per_week (int): Number of days in a week.
+
+    Returns:
+    - dict: The compiled constraints, with:
+      - 'weights' (np.ndarray): The weight of every penalty component, in the order of 'PENALTY_COMPONENTS'.
+      - 'break_penalty' (np.ndarray): The penalty of a 'Break' in every block of the day.
+      - 'quotas' (np.ndarray): The minimum weekly blocks of every block value (0 for 'Break').
+      - 'max_consecutive_blocks' (int or None): The maximum consecutive blocks of a subject in a day.
+      - 'teacher_of_value' (np.ndarray or None): A (block values, teachers) 0/1 matrix assigning every subject to its
+        teacher, or None without resources.
+      - 'rooms' (np.ndarray or None): The number of rooms available in every (day, block) slot.
+      - 'unavailable' (np.ndarray or None): For every (day, block) slot and block value, whether the subject's teacher
+        is unavailable in the slot.
+    """
+    constraints = {**DEFAULT_CONSTRAINTS, **(constraints or {})}
+    weights = {**DEFAULT_CONSTRAINTS['weights'], **constraints['weights']}
+
+    # Penalty of a 'Break' in every block of the day
+    break_penalty = np.full(blocks_per_day, weights['break_outside_preferred'])
+    break_penalty[list(constraints['preferred_break_blocks'])] = 0
+
+    # Minimum weekly blocks of every block value
+    quotas = np.full(len(BLOCK_NAMES), constraints['min_blocks_per_subject'])
+    for subject, quota in constraints['subject_quotas'].items():
+        quotas[BLOCK_CODES[subject]] = quota
+    quotas[BREAK_CODE] = 0
+
+    compiled_constraints = {
+        'weights': np.array([weights[component] for component in PENALTY_COMPONENTS]),
+        'break_penalty': break_penalty,
+        'quotas': quotas,
+        'max_consecutive_blocks': constraints['max_consecutive_blocks'],
+        'teacher_of_value': None,
+        'rooms': None,
+        'unavailable': None
+    }
+
+    resources = constraints['resources']
+    if resources is None:
+        return compiled_constraints
+
+    # Index the teachers, including the ones that are only listed as unavailable (e.g. teachers without subjects), and
+    # assign every subject to its teacher
+    teacher_unavailability = resources.get('teacher_unavailability', {})
+    teachers = sorted(set(resources['teachers'].values()) | set(teacher_unavailability))
+    teacher_codes = {teacher: code for code, teacher in enumerate(teachers)}
+    teacher_of_value = np.zeros((len(BLOCK_NAMES), len(teachers)), dtype=np.int64)
+    for subject, teacher in resources['teachers'].items():
+        teacher_of_value[BLOCK_CODES[subject], teacher_codes[teacher]] = 1
+
+    # Rooms available in every slot, given either once for all slots or per day and block
+    rooms = np.broadcast_to(np.asarray(resources.get('rooms', np.iinfo(np.int64).max), dtype=np.int64),
+                            (days_per_week, blocks_per_day)).reshape(-1)
+
+    # Mark the slots where the teacher of every subject is unavailable
+    unavailable_teachers = np.zeros((days_per_week * blocks_per_day, len(teachers)), dtype=np.int64)
+    for teacher, slots in teacher_unavailability.items():
+        for day, block in slots:
+            unavailable_teachers[day * blocks_per_day + block, teacher_codes[teacher]] = 1
+
+    compiled_constraints['teacher_of_value'] = teacher_of_value
+    compiled_constraints['rooms'] = rooms
+    compiled_constraints['unavailable'] = unavailable_teachers @ teacher_of_value.T
+    return compiled_constraints
+
+
+def count_slots(encoded_population):
+    """
+    Count every block value in every (day, block) slot of every individual of a compact population, across all
+    Practical Turns. 'Break' blocks are never counted, since they can not conflict.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer, of shape (individuals, Practical Turns, days,
+      blocks).
+
+    Returns:
+    - np.ndarray: An array of shape (individuals, slots, block values) with the count of every value in every slot,
+      where slot 'day * blocks + block' is the block of the day.
+    """
+    pop_size, num_turns, num_days, num_blocks = encoded_population.shape
+    num_values = len(BLOCK_NAMES)
+    encoded = encoded_population.astype(np.intp)
+
+    # Give every (individual, day, block, value) tuple its own bin and count all of them in a single pass
+    slots = (np.arange(pop_size)[:, None, None, None] * num_days * num_blocks
+             + np.arange(num_days)[:, None] * num_blocks + np.arange(num_blocks)) * num_values
+    slot_counts = np.bincount((encoded + slots).ravel(), minlength=pop_size * num_days * num_blocks * num_values)
+    slot_counts = slot_counts.reshape(pop_size, -1, num_values)
+    slot_counts[:, :, BREAK_CODE] = 0
+    return slot_counts
+
+
+def slot_penalty_components(slot_counts, compiled_constraints):
+    """
+    Calculate the unweighted penalty components that depend on several Practical Turns at once (overlaps and resource
+    conflicts) from the per-slot counters of a population. The other components are left at 0.
+
+    Parameters:
+    - slot_counts (np.ndarray): The per-slot counters of the population, as returned by 'count_slots'.
+    - compiled_constraints (dict): The constraints compiled by 'compile_constraints'.
+
+    Returns:
+    - np.ndarray: An array of shape (individuals, components) with the unweighted penalty of every component, in the
+      order of 'PENALTY_COMPONENTS'.
+    """
+    components = np.zeros((len(slot_counts), len(PENALTY_COMPONENTS)), dtype=np.int64)
+
+    # Every occupied (slot, subject) pair holds one block without overlap, and every other block is an overlap
+    components[:, 0] = slot_counts.sum(axis=(1, 2)) - np.count_nonzero(slot_counts, axis=(1, 2))
+
+    # Resource conflicts are scored from the same per-slot counters, in time proportional to the schedule size
+    if compiled_constraints['teacher_of_value'] is not None:
+
+        # Teachers with more than one distinct subject in the same slot (the same subject in several Practical Turns is
+        # already penalized as an overlap)
+        subjects_per_teacher = (slot_counts > 0).astype(np.int64) @ compiled_constraints['teacher_of_value']
+        components[:, 5] = np.clip(subjects_per_teacher - 1, 0, None).sum(axis=(1, 2))
+
+        # Classes beyond the number of rooms available in the slot
+        classes_per_slot = slot_counts.sum(axis=2)
+        components[:, 6] = np.clip(classes_per_slot - compiled_constraints['rooms'], 0, None).sum(axis=1)
+
+        # Classes in slots where their teacher is unavailable
+        components[:, 7] = (slot_counts * compiled_constraints['unavailable']).sum(axis=(1, 2))
+
+    return components
+
+
+def penalty_components(encoded_population, compiled_constraints):
+    """
+    Calculate the weighted penalty of every component of the constraints for a whole compact population at once.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer, of shape (individuals, Practical Turns, days,
+      blocks).
+    - compiled_constraints (dict): The constraints compiled by 'compile_constraints'.
+
+    Returns:
+    - np.ndarray: An array of shape (individuals, components) with the penalty of every component, in the order of
+      'PENALTY_COMPONENTS'.
+    """
+    pop_size, num_turns, num_days, num_blocks = encoded_population.shape
+    num_values = len(BLOCK_NAMES)
+    encoded = encoded_population.astype(np.intp)
+    is_break = encoded == BREAK_CODE
+
+    # Overlaps and resource conflicts, from the counters of every value in every slot
+    components = slot_penalty_components(count_slots(encoded_population), compiled_constraints)
+
+    # 'Break' blocks outside the preferred blocks, weighted by the block's penalty
+    components[:, 1] = (is_break * compiled_constraints['break_penalty']).sum(axis=(1, 2, 3))
+
+    # Days without a 'Break'
+    components[:, 2] = (~is_break.any(axis=3)).sum(axis=(1, 2))
+
+    # Weekly shortfall of every subject present in each Practical Turn
+    turns = encoded.reshape(pop_size * num_turns, num_days * num_blocks)
+    rows = (np.arange(pop_size * num_turns) * num_values)[:, None]
+    turn_counts = np.bincount((turns + rows).ravel(), minlength=pop_size * num_turns * num_values)
+    turn_counts = turn_counts.reshape(pop_size, num_turns, num_values)
+    shortfall = np.where(turn_counts > 0, np.clip(compiled_constraints['quotas'] - turn_counts, 0, None), 0)
+    components[:, 3] = shortfall.sum(axis=(1, 2))
+
+    # Blocks beyond the maximum number of consecutive blocks of the same subject in a day
+    max_consecutive_blocks = compiled_constraints['max_consecutive_blocks']
+    if max_consecutive_blocks is not None:
+        run_length = np.ones(encoded.shape[:3], dtype=np.intp)
+        for block in range(1, num_blocks):
+            continues = (encoded[..., block] == encoded[..., block - 1]) & ~is_break[..., block]
+            run_length = np.where(continues, run_length + 1, 1)
+            components[:, 4] += ((run_length > max_consecutive_blocks) & ~is_break[..., block]).sum(axis=(1, 2))
+
+    # Weigh every component, except the 'Break' placement one, which is already weighted by block
+    weights = compiled_constraints['weights'].copy()
+    weights[1] = 1
+    return components * weights
+
+
+def evaluate_encoded_population(encoded_population, compiled_constraints):
+    """
+    Evaluate the fitness of a whole compact population with the compiled constraints.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer, of shape (individuals, Practical Turns, days,
+      blocks).
+    - compiled_constraints (dict): The constraints compiled by 'compile_constraints'.
+
+    Returns:
+    - np.ndarray: The total penalty of every individual (lower is better).
+    """
+    return penalty_components(encoded_population, compiled_constraints).sum(axis=1)
+
+
+def evaluate_population_compiled(population, compiled_constraints):
+    """
+    Evaluate the fitness of a population of individuals with the compiled constraints. It returns the same list of
+    scores as 'fitness.evaluate_population' does with the default constraints.
+
+    Parameters:
+    - population (list): A list of individuals.
+    - compiled_constraints (dict): The constraints compiled by 'compile_constraints'.
+
+    Returns:
+    - list: A list of fitness scores for each individual in the population.
+    """
+    return evaluate_encoded_population(encode_population(population), compiled_constraints).tolist()
+
+
+def make_population_evaluator(constraints=None, blocks_per_day=8, days_per_week=5):
+    """
+    Compile a constraint specification into a population evaluator that can be given to the Genetic Algorithm in place
+    of 'fitness.evaluate_population'. The evaluator can be sent to other processes, e.g. for the asynchronous
+    evaluation pipeline.
+
+    Parameters:
+    - constraints (dict): The constraint specification (see 'DEFAULT_CONSTRAINTS'). If None, the defaults are used.
+    - blocks_per_day (int): Number of blocks in each day.
+    - days_per_week (int): Number of days in a week.
+
+    Returns:
+    - function: A function that takes a population (list of individuals) and returns its list of fitness scores.
+    """
+    return partial(evaluate_population_compiled,
+                   compiled_constraints=compile_constraints(constraints, blocks_per_day, days_per_week))
+
+
+def evaluate_objectives_compiled(population, compiled_constraints, objectives):
+    """
+    Evaluate the penalty components of a population of individuals as separate objectives, for multi-objective
+    optimization.
+
+    Parameters:
+    - population (list): A list of individuals.
+    - compiled_constraints (dict): The constraints compiled by 'compile_constraints'.
+    - objectives (list): The indexes, in 'PENALTY_COMPONENTS', of the components used as objectives.
+
+    Returns:
+    - np.ndarray: An array of shape (individuals, objectives) with the weighted penalty of every objective.
+    """
+    return penalty_components(encode_population(population), compiled_constraints)[:, objectives]
+
+
+def make_objectives_evaluator(constraints=None, objectives=('overlap', 'break_outside_preferred', 'missing_break',
+                                                            'quota_shortfall'), blocks_per_day=8, days_per_week=5):
+    """
+    Compile a constraint specification into an evaluator returning a vector of penalty components per individual,
+    instead of their sum.
+
+    Parameters:
+    - constraints (dict): The constraint specification (see 'DEFAULT_CONSTRAINTS'). If None, the defaults are used.
+    - objectives (tuple): The names of the penalty components (see 'PENALTY_COMPONENTS') used as objectives.
+    - blocks_per_day (int): Number of blocks in each day.
+    - days_per_week (int): Number of days in a week.
+
+    Returns:
+    - function: A function that takes a population (list of individuals) and returns an array of shape
+      (individuals, objectives) with their penalty components.
+    """
+    return partial(evaluate_objectives_compiled,
+                   compiled_constraints=compile_constraints(constraints, blocks_per_day, days_per_week),
+                   objectives=[PENALTY_COMPONENTS.index(objective) for objective in objectives])
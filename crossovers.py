@@ -1,8 +1,9 @@
-# Import the necessary libraries
-from random import random, randint
+# Import the necessary libraries and scripts
+import random
+from kernels import get_kernel, register_kernel
 
 
-def uniform_day_crossover(parent1, parent2):
+def uniform_day_crossover(parent1, parent2, rng=None):
     """
     Perform uniform crossover on two parent individuals at the day level.
     Each day's schedule is swapped between parents with a 50% probability.
@@ -10,11 +11,14 @@ def uniform_day_crossover(parent1, parent2):
     Parameters:
     - parent1 (list): The first parent individual.
     - parent2 (list): The second parent individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - offspring1 (list): The first offspring generated from the parents.
     - offspring2 (list): The second offspring generated from the parents.
     """
+    rng = random if rng is None else rng
 
     # Initialize empty lists to store the offspring
     offspring1 = []
@@ -35,7 +39,7 @@ def uniform_day_crossover(parent1, parent2):
                 for day in range(len(parent1[turn_])):
 
                     # With a 50% probability, swap the daily schedules between parents
-                    if random() < 0.5:
+                    if rng.random() < 0.5:
                         class_schedule1.append(parent1[turn_][day][:])
                         class_schedule2.append(parent2[turn_][day][:])
                     else:
@@ -55,19 +59,42 @@ def uniform_day_crossover(parent1, parent2):
     return offspring1, offspring2
 
 
-def uniform_block_crossover(parent1, parent2):
+def uniform_block_crossover(parent1, parent2, rng=None):
     """
+    Perform uniform crossover on two parent individuals at the block level, with the 'uniform_block_crossover' kernel
+    of the default backend (see 'kernels.py').
+
+    Parameters:
+    - parent1 (list): The first parent individual.
+    - parent2 (list): The second parent individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
+
+    Returns:
+    - offspring1 (list): The first offspring generated from the parents.
+    - offspring2 (list): The second offspring generated from the parents.
+    """
+    return get_kernel('uniform_block_crossover')(parent1, parent2, rng)
+
+
+@register_kernel('uniform_block_crossover')
+def uniform_block_crossover_python(parent1, parent2, rng=None):
+    """
+    The 'python' kernel of 'uniform_block_crossover', the reference implementation of the other backends.
     Perform uniform crossover on two parent individuals at the block level.
     Each block within a day is swapped between parents with a 50% probability.
 
     Parameters:
     - parent1 (list): The first parent individual.
     - parent2 (list): The second parent individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - offspring1 (list): The first offspring generated from the parents.
     - offspring2 (list): The second offspring generated from the parents.
     """
+    rng = random if rng is None else rng
 
     # Initialize empty lists to store the offspring
     offspring1 = []
@@ -97,7 +124,7 @@ def uniform_block_crossover(parent1, parent2):
                         for block_idx in range(len(parent1[turn_idx][day_idx])):
 
                             # With a 50% probability, swap the blocks between parents
-                            if random() < 0.5:
+                            if rng.random() < 0.5:
                                 day_schedule1.append(parent1[turn_idx][day_idx][block_idx][:])
                                 day_schedule2.append(parent2[turn_idx][day_idx][block_idx][:])
                             else:
@@ -124,7 +151,7 @@ def uniform_block_crossover(parent1, parent2):
     return offspring1, offspring2
 
 
-def single_point_day_crossover(parent1, parent2):
+def single_point_day_crossover(parent1, parent2, rng=None):
     """
     Perform single-point crossover on two parent individuals at the day level.
     A random crossover point is selected, and the days are swapped between parents at that point.
@@ -132,11 +159,14 @@ def single_point_day_crossover(parent1, parent2):
     Parameters:
     - parent1 (list): The first parent individual.
     - parent2 (list): The second parent individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - offspring1 (list): The first offspring generated from the parents.
     - offspring2 (list): The second offspring generated from the parents.
     """
+    rng = random if rng is None else rng
 
     # Initialize empty lists to store the offspring
     offspring1 = []
@@ -146,7 +176,7 @@ def single_point_day_crossover(parent1, parent2):
     for turn_index in range(len(parent1)):
 
         # Select a random crossover point for the current Practical Turn
-        xo_point = randint(1, len(parent1[turn_index]) - 1)
+        xo_point = rng.randint(1, len(parent1[turn_index]) - 1)
 
         # Initialize empty lists to store the daily schedules for each Practical Turn in the offspring
         class_schedule1 = []
@@ -169,19 +199,42 @@ def single_point_day_crossover(parent1, parent2):
     return offspring1, offspring2
 
 
-def single_point_block_crossover(parent1, parent2):
+def single_point_block_crossover(parent1, parent2, rng=None):
+    """
+    Perform single-point crossover on two parent individuals at the block level, with the
+    'single_point_block_crossover' kernel of the default backend (see 'kernels.py').
+
+    Parameters:
+    - parent1 (list): The first parent individual.
+    - parent2 (list): The second parent individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
+
+    Returns:
+    - offspring1 (list): The first offspring generated from the parents.
+    - offspring2 (list): The second offspring generated from the parents.
+    """
+    return get_kernel('single_point_block_crossover')(parent1, parent2, rng)
+
+
+@register_kernel('single_point_block_crossover')
+def single_point_block_crossover_python(parent1, parent2, rng=None):
     """
+    The 'python' kernel of 'single_point_block_crossover', the reference implementation of the other backends.
     Perform single-point crossover on two parent individuals at the block level.
     A random crossover point is selected for each day, and the blocks are swapped between parents at that point.
 
     Parameters:
     - parent1 (list): The first parent individual.
     - parent2 (list): The second parent individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - offspring1 (list): The first offspring generated from the parents.
     - offspring2 (list): The second offspring generated from the parents.
     """
+    rng = random if rng is None else rng
 
     # Initialize empty lists to store the offspring
     offspring1 = []
@@ -198,7 +251,7 @@ def single_point_block_crossover(parent1, parent2):
         for day_index in range(len(parent1[turn_index])):
 
             # Select a random crossover point for the current day
-            xo_point = randint(1, len(parent1[turn_index][day_index]) - 1)
+            xo_point = rng.randint(1, len(parent1[turn_index][day_index]) - 1)
 
             # Initialize empty lists to store the block schedules for each day in the offspring
             day_schedule1 = []
@@ -227,17 +280,17 @@ def single_point_block_crossover(parent1, parent2):
     return offspring1, offspring2
 
 
-def uniform_day_crossover_named(parent1, parent2):
-    return uniform_day_crossover(parent1, parent2)
+def uniform_day_crossover_named(parent1, parent2, rng=None):
+    return uniform_day_crossover(parent1, parent2, rng)
 
 
-def uniform_block_crossover_named(parent1, parent2):
-    return uniform_block_crossover(parent1, parent2)
+def uniform_block_crossover_named(parent1, parent2, rng=None):
+    return uniform_block_crossover(parent1, parent2, rng)
 
 
-def single_point_day_crossover_named(parent1, parent2):
-    return single_point_day_crossover(parent1, parent2)
+def single_point_day_crossover_named(parent1, parent2, rng=None):
+    return single_point_day_crossover(parent1, parent2, rng)
 
 
-def single_point_block_crossover_named(parent1, parent2):
-    return single_point_block_crossover(parent1, parent2)
+def single_point_block_crossover_named(parent1, parent2, rng=None):
+    return single_point_block_crossover(parent1, parent2, rng)
@@ -1,4 +1,5 @@
 # Import the necessary libraries
+import json
 import random
 
 
@@ -32,6 +33,73 @@ def generate_subjects():
     return class_subjects
 
 
+def generate_resources(class_subjects, num_teachers=10, rooms_per_slot=8, days_per_week=5, blocks_per_day=8,
+                       unavailable_slots_per_teacher=4):
+    """
+    Generates the teacher and room resources of the problem instance.
+
+    Every subject taught in a Practical Turn is assigned to one of the teachers, every (day, block) slot has the same
+    number of rooms, and every teacher is unavailable in a few random slots.
+
+    Parameters:
+    - class_subjects (dict): A dictionary where keys are class names and values are lists of subjects.
+    - num_teachers (int): Number of teachers.
+    - rooms_per_slot (int): Number of rooms available in every (day, block) slot.
+    - days_per_week (int): Number of days per week that classes are scheduled.
+    - blocks_per_day (int): Number of blocks (periods) in each day's schedule.
+    - unavailable_slots_per_teacher (int): Number of random (day, block) slots in which each teacher is unavailable.
+
+    Returns:
+    - dict: A dictionary with the 'teachers' of every subject, the 'rooms' available per slot and the
+    'teacher_unavailability' as a list of (day, block) slots for every teacher.
+    """
+
+    # Assign every subject taught in some Practical Turn to a random teacher
+    subjects = sorted({subject for subjects in class_subjects.values() for subject in subjects})
+    teachers = [f"Teacher_{i}" for i in range(1, num_teachers + 1)]
+    subject_teachers = {subject: random.choice(teachers) for subject in subjects}
+
+    # Choose the slots in which each teacher is unavailable
+    all_slots = [(day, block) for day in range(days_per_week) for block in range(blocks_per_day)]
+    teacher_unavailability = {teacher: sorted(random.sample(all_slots, unavailable_slots_per_teacher))
+                              for teacher in teachers}
+
+    return {
+        "teachers": subject_teachers,
+        "rooms": rooms_per_slot,
+        "teacher_unavailability": teacher_unavailability
+    }
+
+
+def save_resources_to_file(resources):
+    """
+    Saves the teacher and room resources of the problem instance to a JSON file named 'resources_data.json'.
+
+    Parameters:
+    - resources (dict): The resources, as returned by 'generate_resources'.
+    """
+    with open('resources_data.json', 'w') as file:
+        json.dump(resources, file, indent=2)
+
+
+def load_resources_from_file(file_path='resources_data.json'):
+    """
+    Loads the teacher and room resources of the problem instance from a JSON file.
+
+    Parameters:
+    - file_path (str): The path to the file written by 'save_resources_to_file'.
+
+    Returns:
+    - dict: The resources, with the unavailable slots of every teacher as (day, block) tuples.
+    """
+    with open(file_path, 'r') as file:
+        resources = json.load(file)
+
+    resources["teacher_unavailability"] = {teacher: [tuple(slot) for slot in slots]
+                                           for teacher, slots in resources["teacher_unavailability"].items()}
+    return resources
+
+
 def save_to_file(class_subjects):
     """
     Saves the Practical Turn subjects data to a text file.
@@ -51,13 +119,15 @@ def save_to_file(class_subjects):
 
 def main():
     """
-    Main function to generate subjects for classes and save them to a file.
+    Main function to generate subjects for classes and their resources, and save them to files.
 
-    This function serves as the entry point of the script, generating subjects for classes
-    and then saving this data to a file using the save_to_file function.
+    This function serves as the entry point of the script, generating subjects for classes and the teacher and room
+    resources, and then saving this data to files using the save_to_file and save_resources_to_file functions.
     """
-    class_subjects = generate_subjects()  # Generate a dictionary of class subjects
-    save_to_file(class_subjects)          # Save the generated subjects to a file
+    class_subjects = generate_subjects()             # Generate a dictionary of class subjects
+    save_to_file(class_subjects)                     # Save the generated subjects to a file
+    resources = generate_resources(class_subjects)   # Generate the teachers and rooms of the instance
+    save_resources_to_file(resources)                # Save the generated resources to a file
 
 
 # Call the main function to execute the script
@@ -0,0 +1,180 @@
+# Import the necessary libraries and scripts
+import numpy as np
+from charles import BLOCK_NAMES, encode_population
+from kernels import get_kernel, register_kernel
+
+# Number of bits needed by the code of every block value (see 'charles.BLOCK_NAMES')
+BITS_PER_BLOCK = int(np.ceil(np.log2(len(BLOCK_NAMES))))
+
+# Number of bits set in every byte, for numpy versions without 'np.bitwise_count'
+BYTE_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def popcount(words):
+    """
+    Count the bits set in every element of an unsigned integer array.
+
+    Parameters:
+    - words (np.ndarray): An array of unsigned integers.
+
+    Returns:
+    - np.ndarray: The number of bits set in every element, with the same shape.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return BYTE_POPCOUNT[words.view(np.uint8)].reshape(words.shape + (-1,)).sum(axis=-1)
+
+
+def pack_schedules(encoded_population):
+    """
+    Bit-pack compact schedules for fast Hamming distances. The code of every block is split into its bit planes, and
+    every plane is packed 64 blocks per word, so two blocks differ exactly when any of their planes differ: the
+    distance between two schedules is the number of bits set in the OR of the XORs of their planes.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact schedules, of shape (individuals, Practical Turns, days, blocks), or
+      already flattened to (individuals, blocks).
+
+    Returns:
+    - np.ndarray: A uint64 array of shape (individuals, bit planes, words).
+    """
+    blocks = np.asarray(encoded_population).reshape(len(encoded_population), -1).astype(np.uint8)
+    num_blocks = blocks.shape[1]
+
+    # Split every block code into its bit planes, and pad the blocks to a whole number of 64-bit words
+    planes = (blocks[:, None, :] >> np.arange(BITS_PER_BLOCK, dtype=np.uint8)[:, None]) & 1
+    padding = -num_blocks % 64
+    planes = np.pad(planes, ((0, 0), (0, 0), (0, padding)))
+
+    return np.ascontiguousarray(np.packbits(planes, axis=-1)).view(np.uint64)
+
+
+def pack_population(population):
+    """
+    Bit-pack a population of individuals (see 'pack_schedules').
+
+    Parameters:
+    - population (list): A list of individuals.
+
+    Returns:
+    - np.ndarray: A uint64 array of shape (individuals, bit planes, words).
+    """
+    return pack_schedules(encode_population(population))
+
+
+def differing_blocks(packed_rows, packed_row):
+    """
+    Mark the blocks in which every packed schedule differs from another one.
+
+    Parameters:
+    - packed_rows (np.ndarray): Packed schedules, of shape (..., bit planes, words).
+    - packed_row (np.ndarray): A packed schedule, of shape (bit planes, words), or broadcastable to 'packed_rows'.
+
+    Returns:
+    - np.ndarray: A uint64 array of shape (..., words), with one bit set per differing block.
+    """
+    return np.bitwise_or.reduce(packed_rows ^ packed_row, axis=-2)
+
+
+def hamming_one_to_many(packed_row, packed_rows):
+    """
+    Calculate the Hamming distance (number of differing blocks) from a schedule to many schedules.
+
+    Parameters:
+    - packed_row (np.ndarray): The packed schedule, of shape (bit planes, words).
+    - packed_rows (np.ndarray): The packed schedules, of shape (schedules, bit planes, words).
+
+    Returns:
+    - np.ndarray: The distance to every schedule.
+    """
+    return popcount(differing_blocks(packed_rows, packed_row)).sum(axis=-1, dtype=np.int64)
+
+
+def hamming_many_to_many(packed_rows1, packed_rows2=None, tile_size=128):
+    """
+    Calculate the Hamming distances between every pair of schedules of two sets, in tiles of 'tile_size' x 'tile_size'
+    pairs, so the memory used is bounded by the tile size and not by the number of pairs.
+
+    Parameters:
+    - packed_rows1 (np.ndarray): The first set of packed schedules, of shape (schedules, bit planes, words).
+    - packed_rows2 (np.ndarray): The second set of packed schedules. If None, the distances among the first set are
+      calculated, computing every pair only once.
+    - tile_size (int): Number of schedules of each set compared at once.
+
+    Returns:
+    - np.ndarray: The (schedules1, schedules2) matrix of distances.
+    """
+    symmetric = packed_rows2 is None
+    packed_rows2 = packed_rows1 if symmetric else packed_rows2
+    distances = np.zeros((len(packed_rows1), len(packed_rows2)), dtype=np.int64)
+
+    for start1 in range(0, len(packed_rows1), tile_size):
+        tile1 = packed_rows1[start1:start1 + tile_size, None]
+
+        # Among a single set, only the tiles on and above the diagonal are computed
+        for start2 in range(start1 if symmetric else 0, len(packed_rows2), tile_size):
+            tile2 = packed_rows2[None, start2:start2 + tile_size]
+            tile_distances = popcount(differing_blocks(tile1, tile2)).sum(axis=-1, dtype=np.int64)
+            distances[start1:start1 + tile_size, start2:start2 + tile_size] = tile_distances
+            if symmetric:
+                distances[start2:start2 + tile_size, start1:start1 + tile_size] = tile_distances.T
+
+    return distances
+
+
+def hamming_matrix(population):
+    """
+    Calculate the Hamming distances between every pair of individuals of a population, with the 'hamming_matrix'
+    kernel of the default backend (see 'kernels.py').
+
+    Parameters:
+    - population (list): A list of individuals.
+
+    Returns:
+    - np.ndarray: The (individuals, individuals) matrix of distances.
+    """
+    return get_kernel('hamming_matrix')(encode_population(population))
+
+
+@register_kernel('hamming_matrix')
+def hamming_matrix_python(encoded_population):
+    """
+    The 'python' kernel of 'hamming_matrix': the distances among the bit-packed schedules (see 'hamming_many_to_many').
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population, of shape (individuals, Practical Turns, days, blocks).
+
+    Returns:
+    - np.ndarray: The (individuals, individuals) matrix of distances.
+    """
+    return hamming_many_to_many(pack_schedules(encoded_population))
+
+
+def within_distance(packed_row, packed_rows, radius, words_per_step=2):
+    """
+    Check which schedules are closer than a radius to a schedule, stopping early: the distances are accumulated a few
+    words at a time, and schedules already at the radius or beyond are dropped from the remaining steps.
+
+    Parameters:
+    - packed_row (np.ndarray): The packed schedule, of shape (bit planes, words).
+    - packed_rows (np.ndarray): The packed schedules, of shape (schedules, bit planes, words).
+    - radius (int): The radius.
+    - words_per_step (int): Number of words (of 64 blocks) compared in each step.
+
+    Returns:
+    - np.ndarray: A boolean array, True for every schedule at a distance lower than the radius.
+    """
+    candidates = np.arange(len(packed_rows))
+    partial_distances = np.zeros(len(packed_rows), dtype=np.int64)
+
+    for start in range(0, packed_rows.shape[-1], words_per_step):
+        step = slice(start, start + words_per_step)
+        partial_distances[candidates] += popcount(
+            differing_blocks(packed_rows[candidates, :, step], packed_row[:, step])).sum(axis=-1, dtype=np.int64)
+
+        # Drop the schedules that are already too far
+        candidates = candidates[partial_distances[candidates] < radius]
+        if len(candidates) == 0:
+            break
+
+    return partial_distances < radius
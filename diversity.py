@@ -0,0 +1,83 @@
+# Import the necessary libraries and scripts
+import numpy as np
+from charles import BLOCK_NAMES, encode_population
+
+
+def cell_value_counts(encoded_population):
+    """
+    Count how many individuals of the population have each block value in each cell (Practical Turn, day, block).
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer, of shape (individuals, Practical Turns, days,
+      blocks), as returned by 'encode_population' or 'initialize_population_array'.
+
+    Returns:
+    - np.ndarray: An array of shape (Practical Turns, days, blocks, block values) with the counts of every value.
+    """
+    num_values = len(BLOCK_NAMES)
+    cells_shape = encoded_population.shape[1:]
+    num_cells = int(np.prod(cells_shape))
+
+    # Give every (cell, value) pair its own bin and count all of them in a single pass over the population
+    flat = encoded_population.reshape(len(encoded_population), num_cells).astype(np.intp)
+    bins = flat + np.arange(num_cells) * num_values
+    counts = np.bincount(bins.ravel(), minlength=num_cells * num_values)
+
+    return counts.reshape(*cells_shape, num_values)
+
+
+def population_diversity(encoded_population):
+    """
+    Calculate diversity measures of a population in linear time, from the frequencies of the values of every cell,
+    instead of comparing every pair of individuals.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer, of shape (individuals, Practical Turns, days,
+      blocks).
+
+    Returns:
+    - dict: A dictionary with:
+      - 'cell_entropy' (np.ndarray): The Shannon entropy (in bits) of the values of every (Practical Turn, day, block)
+        cell across the population. 0 means every individual has the same value in that cell.
+      - 'mean_entropy' (float): The average entropy over all cells.
+      - 'unique_individuals' (int): The number of distinct individuals in the population.
+      - 'consensus_distance' (float): The average number of blocks in which an individual differs from the
+        population consensus (the most frequent value of every cell).
+    """
+    pop_size = len(encoded_population)
+    counts = cell_value_counts(encoded_population)
+
+    # Entropy of the value frequencies of every cell, with 0 * log(0) taken as 0
+    frequencies = counts / pop_size
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cell_entropy = -np.sum(np.where(counts > 0, frequencies * np.log2(frequencies), 0.0), axis=-1)
+
+    # Count the distinct individuals by hashing their raw bytes
+    flat = encoded_population.reshape(pop_size, -1)
+    unique_individuals = len({row.tobytes() for row in flat})
+
+    # Every individual matches the consensus in a cell exactly when it has the cell's most frequent value, so the
+    # average distance to the consensus is the number of cells minus the average number of matches
+    num_cells = flat.shape[1]
+    consensus_distance = num_cells - counts.max(axis=-1).sum() / pop_size
+
+    return {
+        'cell_entropy': cell_entropy,
+        'mean_entropy': float(cell_entropy.mean()),
+        'unique_individuals': unique_individuals,
+        'consensus_distance': float(consensus_distance)
+    }
+
+
+def record_diversity(stats, population):
+    """
+    Append the diversity measures of a population to the 'diversity' list of a statistics dictionary. Only the scalar
+    measures are kept, to bound the memory used by long runs.
+
+    Parameters:
+    - stats (dict): The statistics dictionary of a Genetic Algorithm run. It is updated in place.
+    - population (list): The population of individuals.
+    """
+    diversity = population_diversity(encode_population(population))
+    del diversity['cell_entropy']
+    stats.setdefault('diversity', []).append(diversity)
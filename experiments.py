@@ -7,12 +7,29 @@ from crossovers import (uniform_day_crossover_named, uniform_block_crossover_nam
 
 from mutations import block_swap_mutation, block_inversion_mutation, block_scramble_mutation
 
-from optimization_problem import evolve_population
+from fitness import fitness_individual
+from optimization_problem import evolve_population, evolve_population_adaptive
+from random_streams import create_stream
+from utils import mean_confidence_interval
 import numpy as np
 
+# Define the selection algorithms, crossovers, and mutations compared in the experiments
+SELECTION_ALGORITHMS = [fitness_proportionate_selection, ranking_selection, tournament_selection]
+CROSSOVERS = [
+    (uniform_day_crossover_named, "uniform_day_crossover"),
+    (uniform_block_crossover_named, "uniform_block_crossover"),
+    (single_point_day_crossover_named, "single_point_day_crossover"),
+    (single_point_block_crossover_named, "single_point_block_crossover")
+]
+MUTATIONS = [
+    (block_swap_mutation, "block_swap_mutation"),
+    (block_inversion_mutation, "block_inversion_mutation"),
+    (block_scramble_mutation, "block_scramble_mutation")
+]
+
 
 def run_experiments(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day,
-                    generations, pc, pm, trials):
+                    generations, pc, pm, trials, seed=None):
     """
     Run a series of experiments with all possible combinations of selection algorithms, crossover operators,
     mutation operators, elitism settings, and fitness sharing settings using the predefined Genetic Algorithm to evolve
@@ -28,6 +45,8 @@ def run_experiments(pop_size, num_practical_turns, subjects_per_practical_turn,
     - pc (float): Crossover probability.
     - pm (float): Mutation probability.
     - trials (int): Number of trials to run the experiment.
+    - seed (int): The root seed of the random streams of the trials (see 'random_streams.create_stream'). Every trial
+      draws from its own stream, so the experiment can be reproduced. If None, fresh entropy is used.
 
     Returns:
     - dict: A dictionary containing the average best fitness values for each generation and each experiment combination.
@@ -47,21 +66,10 @@ def run_experiments(pop_size, num_practical_turns, subjects_per_practical_turn,
     # Initialize a counter of total experiments carried out
     total_experiments = 0
 
-    # Define the selection algorithms, crossovers, and mutations
-    selection_algorithms = [fitness_proportionate_selection, ranking_selection, tournament_selection]
-    crossovers = [
-        (uniform_day_crossover_named, "uniform_day_crossover"),
-        (uniform_block_crossover_named, "uniform_block_crossover"),
-        (single_point_day_crossover_named, "single_point_day_crossover"),
-        (single_point_block_crossover_named, "single_point_block_crossover")
-    ]
-    mutations = [block_swap_mutation, block_inversion_mutation, block_scramble_mutation]
-    mutation_names = ["block_swap_mutation", "block_inversion_mutation", "block_scramble_mutation"]
-
     # Iterate over all combinations
-    for selection_algorithm in selection_algorithms:
-        for crossover, crossover_name in crossovers:
-            for mutation, mutation_name in zip(mutations, mutation_names):
+    for selection_algorithm in SELECTION_ALGORITHMS:
+        for crossover, crossover_name in CROSSOVERS:
+            for mutation, mutation_name in MUTATIONS:
                 for elitism in [True]:
                     for use_fitness_sharing in [True, False]:
                         all_trials_best_fitnesses = []
@@ -76,10 +84,14 @@ def run_experiments(pop_size, num_practical_turns, subjects_per_practical_turn,
                                   f"{crossover_name}, {mutation_name}, elitism={elitism}, "
                                   f"fitness_sharing={use_fitness_sharing}")
 
+                            # Draw the trial from its own stream, keyed by the configuration (one result is
+                            # stored per configuration) and the trial numbers
+                            rng = create_stream(seed, len(results), trial)
+
                             # Initialize population
                             initial_population = initialize_population(pop_size, num_practical_turns,
                                                                        subjects_per_practical_turn,
-                                                                       days_per_week, blocks_per_day)
+                                                                       days_per_week, blocks_per_day, rng)
 
                             # Evolve the population with the given parameters
                             best_individual, best_fitness_per_generation = evolve_population(
@@ -91,18 +103,22 @@ def run_experiments(pop_size, num_practical_turns, subjects_per_practical_turn,
                                 pm,
                                 generations,
                                 elitism,
-                                use_fitness_sharing=use_fitness_sharing
+                                use_fitness_sharing=use_fitness_sharing,
+                                rng=rng
                             )
 
-                            all_trials_best_fitnesses.append(best_fitness_per_generation)
+                            # The trial may end before finishing any generation, when a Global Optimum is found
+                            # in its initial population, so its final fitness is taken from the returned individual
+                            final_best_fitness = fitness_individual(best_individual)
+                            all_trials_best_fitnesses.append(best_fitness_per_generation or [final_best_fitness])
 
                             # Track the best overall individual
-                            if best_fitness_per_generation[-1] < overall_best_fitness:
-                                overall_best_fitness = best_fitness_per_generation[-1]
+                            if final_best_fitness < overall_best_fitness:
+                                overall_best_fitness = final_best_fitness
                                 overall_best_individual = best_individual
 
                             # Append a found Global Optimum to the Global Optimum list
-                            if best_fitness_per_generation[-1] == 0:
+                            if final_best_fitness == 0:
                                 global_optima_found.append({
                                     "individual": best_individual,
                                     "selection_algorithm": selection_algorithm.__name__,
@@ -157,6 +173,221 @@ def run_experiments(pop_size, num_practical_turns, subjects_per_practical_turn,
     return results
 
 
+def run_adaptive_experiments(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day,
+                             generations, pc, pm, trials, seed=None):
+    """
+    Run the adaptive Genetic Algorithm, which chooses among all crossover and mutation operators online, once per
+    selection algorithm. It replaces the search over every crossover and mutation combination of 'run_experiments'
+    with a few adaptive runs, and reports which operators the runs learned to prefer.
+
+    Parameters:
+    - pop_size (int): Number of individuals in the population.
+    - num_practical_turns (int): Number of Practical Turns per individual.
+    - subjects_per_practical_turn (int): Number of subjects each Practical Turn is enrolled in.
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+    - generations (int): Number of generations to run the Genetic Algorithm.
+    - pc (float): Crossover probability.
+    - pm (float): Mutation probability.
+    - trials (int): Number of trials to run the experiment.
+    - seed (int): The root seed of the random streams of the trials (see 'random_streams.create_stream'). Every trial
+      draws from its own stream, so the experiment can be reproduced. If None, fresh entropy is used.
+
+    Returns:
+    - list: A list of dictionaries with the average best fitness values for each generation of every selection
+      algorithm, plus the average final application probability of every crossover and mutation (None if no trial
+      ran any generation).
+    """
+
+    results = []
+
+    crossovers = [crossover for crossover, _ in CROSSOVERS]
+    mutations = [mutation for mutation, _ in MUTATIONS]
+
+    for selection_index, selection_algorithm in enumerate(SELECTION_ALGORITHMS):
+        all_trials_best_fitnesses = []
+        final_crossover_probabilities = []
+        final_mutation_probabilities = []
+
+        for trial in range(trials):
+            print(f"Running adaptive trial {trial + 1} with {selection_algorithm.__name__}")
+
+            # Initialize population, drawing the trial from its own stream
+            rng = create_stream(seed, selection_index, trial)
+            initial_population = initialize_population(pop_size, num_practical_turns, subjects_per_practical_turn,
+                                                       days_per_week, blocks_per_day, rng)
+
+            # Evolve the population, letting the Genetic Algorithm choose the operators
+            stats = {}
+            best_individual, best_fitness_per_generation = evolve_population_adaptive(
+                initial_population, selection_algorithm, crossovers, pc, mutations, pm, generations, stats=stats,
+                rng=rng)
+
+            # A trial that found a Global Optimum in its initial population ends without any generation, so its best
+            # fitness is taken from the returned individual
+            all_trials_best_fitnesses.append(best_fitness_per_generation or [fitness_individual(best_individual)])
+            if stats['crossover_probabilities']:
+                final_crossover_probabilities.append(stats['crossover_probabilities'][-1])
+                final_mutation_probabilities.append(stats['mutation_probabilities'][-1])
+
+        # Pad all fitness sequences to the same length, if a trial ends earlier, due to the finding of a Global Optimum
+        max_length = max(len(seq) for seq in all_trials_best_fitnesses)
+        for seq in all_trials_best_fitnesses:
+            seq.extend([seq[-1]] * (max_length - len(seq)))
+
+        results.append({
+            "selection_algorithm": selection_algorithm.__name__,
+            "crossover": "adaptive",
+            "mutation": "adaptive",
+            "elitism": True,
+            "fitness_sharing": False,
+            "average_best_fitnesses": np.mean(all_trials_best_fitnesses, axis=0).tolist(),
+            # Without any generation in any trial, no operator probabilities were learned
+            "crossover_probabilities": dict(zip([name for _, name in CROSSOVERS],
+                                                np.mean(final_crossover_probabilities, axis=0).tolist()))
+            if final_crossover_probabilities else None,
+            "mutation_probabilities": dict(zip([name for _, name in MUTATIONS],
+                                               np.mean(final_mutation_probabilities, axis=0).tolist()))
+            if final_mutation_probabilities else None
+        })
+
+    return results
+
+
+def run_racing_experiments(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day,
+                           generations, pc, pm, initial_trials=3, trials_per_round=2, max_trials=30, confidence=0.95,
+                           seed=None):
+    """
+    Race all combinations of selection algorithms, crossover operators, mutation operators and fitness sharing
+    settings instead of running the same number of trials for every one of them.
+
+    Every combination starts with a few trials. After every round, the mean and t-based confidence interval of the
+    final best fitness of every remaining combination are computed, and combinations whose whole interval lies above
+    the interval of the best combination (which is a minimization problem) are dropped. The remaining contenders get
+    more trials, until only one is left or all of them reached 'max_trials'.
+
+    Parameters:
+    - pop_size (int): Number of individuals in the population.
+    - num_practical_turns (int): Number of Practical Turns per individual.
+    - subjects_per_practical_turn (int): Number of subjects each Practical Turn is enrolled in.
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+    - generations (int): Number of generations to run the Genetic Algorithm.
+    - pc (float): Crossover probability.
+    - pm (float): Mutation probability.
+    - initial_trials (int): Number of trials every combination runs before the first elimination (at least 2).
+    - trials_per_round (int): Number of trials added to every remaining combination in each round.
+    - max_trials (int): Maximum number of trials of a single combination.
+    - confidence (float): Confidence level of the intervals used to drop combinations.
+    - seed (int): The root seed of the random streams of the trials (see 'random_streams.create_stream'). Every trial
+      draws from its own stream, so the experiment can be reproduced. If None, fresh entropy is used.
+
+    Returns:
+    - list: A list of dictionaries, one per combination, with the average best fitness values for each generation,
+      the number of trials it ran, the mean final best fitness and whether it was eliminated from the race. The
+      combinations still in the race are listed first, best first.
+    """
+
+    if initial_trials < 2:
+        raise ValueError("At least 2 initial trials are needed to compute confidence intervals")
+
+    # Every combination of the grid enters the race
+    contenders = []
+    for selection_algorithm in SELECTION_ALGORITHMS:
+        for crossover, crossover_name in CROSSOVERS:
+            for mutation, mutation_name in MUTATIONS:
+                for use_fitness_sharing in [True, False]:
+                    contenders.append({
+                        "index": len(contenders),
+                        "selection_algorithm": selection_algorithm,
+                        "crossover": (crossover, crossover_name),
+                        "mutation": (mutation, mutation_name),
+                        "fitness_sharing": use_fitness_sharing,
+                        "best_fitness_sequences": [],
+                        "final_best_fitnesses": [],
+                        "eliminated": False
+                    })
+
+    total_runs = 0
+    trials_this_round = initial_trials
+    racing = contenders
+
+    while racing:
+
+        # Run the trials of this round for every combination still in the race
+        for contender in racing:
+            trials = min(trials_this_round, max_trials - len(contender["final_best_fitnesses"]))
+            for _ in range(trials):
+                total_runs += 1
+                print(f"Racing run {total_runs}: {contender['selection_algorithm'].__name__}, "
+                      f"{contender['crossover'][1]}, {contender['mutation'][1]}, "
+                      f"fitness_sharing={contender['fitness_sharing']}")
+
+                # Initialize population, drawing the run from its own stream, keyed by the combination and the trial
+                rng = create_stream(seed, contender["index"], len(contender["final_best_fitnesses"]))
+                initial_population = initialize_population(pop_size, num_practical_turns, subjects_per_practical_turn,
+                                                           days_per_week, blocks_per_day, rng)
+
+                # Evolve the population with the combination's parameters
+                best_individual, best_fitness_per_generation = evolve_population(
+                    initial_population, contender["selection_algorithm"], contender["crossover"][0], pc,
+                    contender["mutation"][0], pm, generations, True,
+                    use_fitness_sharing=contender["fitness_sharing"], rng=rng)
+
+                # The run may end early when a Global Optimum is found, even before its first generation, so its final
+                # fitness is taken from the returned individual
+                final_best_fitness = fitness_individual(best_individual)
+                contender["best_fitness_sequences"].append(best_fitness_per_generation or [final_best_fitness])
+                contender["final_best_fitnesses"].append(final_best_fitness)
+
+        # Compute the confidence interval of the final best fitness of every remaining combination
+        intervals = [mean_confidence_interval(contender["final_best_fitnesses"], confidence) for contender in racing]
+        best_interval = min(intervals, key=lambda interval: interval['mean'])
+        best_upper_bound = best_interval['mean'] + np.nan_to_num(best_interval['conf_interval'])
+
+        # Drop the combinations that are statistically dominated by the best one
+        for contender, interval in zip(racing, intervals):
+            if interval['mean'] - np.nan_to_num(interval['conf_interval']) > best_upper_bound:
+                contender["eliminated"] = True
+
+        racing = [contender for contender in racing if not contender["eliminated"]]
+        print(f"{len(racing)} combinations remain in the race after {total_runs} runs")
+
+        # Stop when a single combination remains or no remaining combination can run more trials
+        if len(racing) <= 1:
+            break
+        racing = [contender for contender in racing if len(contender["final_best_fitnesses"]) < max_trials]
+        trials_this_round = trials_per_round
+
+    results = []
+    for contender in contenders:
+
+        # Pad all fitness sequences to the same length, if a trial ends earlier, due to the finding of a Global Optimum
+        sequences = contender["best_fitness_sequences"]
+        max_length = max(len(seq) for seq in sequences)
+        for seq in sequences:
+            seq.extend([seq[-1]] * (max_length - len(seq)))
+
+        results.append({
+            "selection_algorithm": contender["selection_algorithm"].__name__,
+            "crossover": contender["crossover"][1],
+            "mutation": contender["mutation"][1],
+            "elitism": True,
+            "fitness_sharing": contender["fitness_sharing"],
+            "average_best_fitnesses": np.mean(sequences, axis=0).tolist(),
+            "trials": len(contender["final_best_fitnesses"]),
+            "mean_final_best_fitness": float(np.mean(contender["final_best_fitnesses"])),
+            "eliminated": contender["eliminated"]
+        })
+
+    # List the combinations still in the race first, best first
+    results.sort(key=lambda result: (result["eliminated"], result["mean_final_best_fitness"]))
+
+    print(f"Racing finished after {total_runs} runs")
+
+    return results
+
+
 if __name__ == "__main__":
     results = run_experiments(pop_size=100, num_practical_turns=10, subjects_per_practical_turn=4, days_per_week=5,
                               blocks_per_day=8, generations=500, pc=0.9, pm=0.2, trials=30)
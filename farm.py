@@ -0,0 +1,485 @@
+# Import the necessary libraries and scripts
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+import numpy as np
+from charles import initialize_population
+from experiments import CROSSOVERS, MUTATIONS, SELECTION_ALGORITHMS
+from fitness import fitness_individual
+from optimization_problem import evolve_population
+from random_streams import create_stream
+
+# Operators of the experiment grid, by the names used in the jobs
+SELECTION_ALGORITHMS_BY_NAME = {selection_algorithm.__name__: selection_algorithm
+                                for selection_algorithm in SELECTION_ALGORITHMS}
+CROSSOVERS_BY_NAME = {name: crossover for crossover, name in CROSSOVERS}
+MUTATIONS_BY_NAME = {name: mutation for mutation, name in MUTATIONS}
+
+
+def experiment_jobs(trials, base_seed=0):
+    """
+    Split the experiment grid of 'experiments.run_experiments' into one job per (configuration, trial), so every trial
+    can be run on any host and reproduced. Every trial draws from the same random stream as in 'run_experiments' with
+    the same seed, keyed by the root seed, the configuration index and the trial number, so farm runs can be checked
+    against serial runs. As in 'run_experiments', the trials of a configuration after one that finds a Global Optimum
+    are skipped by the coordinator (see 'record_optimum').
+
+    Parameters:
+    - trials (int): Number of trials of every configuration.
+    - base_seed (int): The root seed of the random streams of the trials (the 'seed' of 'run_experiments').
+
+    Returns:
+    - list: The jobs, each a dictionary with its 'id', 'config' (operator names, elitism and fitness sharing), its
+      'config_index' in the grid, its 'trial' number and the root 'seed'.
+    """
+    jobs = []
+    for selection_algorithm in SELECTION_ALGORITHMS:
+        for crossover, crossover_name in CROSSOVERS:
+            for mutation, mutation_name in MUTATIONS:
+                for elitism in [True]:
+                    for use_fitness_sharing in [True, False]:
+                        config = {'selection_algorithm': selection_algorithm.__name__, 'crossover': crossover_name,
+                                  'mutation': mutation_name, 'elitism': elitism,
+                                  'fitness_sharing': use_fitness_sharing}
+                        config_index = len(jobs) // trials
+                        for trial in range(trials):
+                            jobs.append({'id': len(jobs), 'config': config, 'config_index': config_index,
+                                         'trial': trial, 'seed': base_seed})
+    return jobs
+
+
+def run_job(job, problem, stop_event=None):
+    """
+    Run a single trial of the experiment grid.
+
+    Parameters:
+    - job (dict): The job (see 'experiment_jobs').
+    - problem (dict): The arguments shared by all trials: 'pop_size', 'num_practical_turns',
+      'subjects_per_practical_turn', 'days_per_week', 'blocks_per_day', 'generations', 'pc' and 'pm'.
+    - stop_event (threading.Event): If given, the trial stops before its next generation as soon as the event is set,
+      e.g. when the job is no longer needed.
+
+    Returns:
+    - dict: The result of the trial, with the 'job_id', the 'best_fitness_per_generation' and the 'best_individual'.
+    """
+    # Draw the whole trial from its random stream, the same as in 'experiments.run_experiments', so the trial is the
+    # same on every host and in serial runs, without touching the global random state of the worker
+    rng = create_stream(job['seed'], job['config_index'], job['trial'])
+
+    config = job['config']
+    initial_population = initialize_population(problem['pop_size'], problem['num_practical_turns'],
+                                               problem['subjects_per_practical_turn'], problem['days_per_week'],
+                                               problem['blocks_per_day'], rng)
+    best_individual, best_fitness_per_generation = evolve_population(
+        initial_population,
+        SELECTION_ALGORITHMS_BY_NAME[config['selection_algorithm']],
+        CROSSOVERS_BY_NAME[config['crossover']],
+        problem['pc'],
+        MUTATIONS_BY_NAME[config['mutation']],
+        problem['pm'],
+        problem['generations'],
+        config['elitism'],
+        use_fitness_sharing=config['fitness_sharing'],
+        rng=rng,
+        stop_event=stop_event
+    )
+
+    return {'job_id': job['id'], 'best_fitness_per_generation': best_fitness_per_generation,
+            'best_individual': best_individual}
+
+
+def create_coordinator(jobs, problem, results_path='farm_results.jsonl', lease_timeout=60):
+    """
+    Create the state of the experiment farm coordinator. Results already in the results store (e.g. from an
+    interrupted run) are loaded and their jobs are not handed out again.
+
+    The first line of the results store is a header with the problem and the jobs (with their seeds) it was created
+    for, so the results of a different experiment are never mistaken for finished trials.
+
+    Parameters:
+    - jobs (list): The jobs to be run (see 'experiment_jobs').
+    - problem (dict): The arguments shared by all trials (see 'run_job').
+    - results_path (str): The path of the results store, a file with a JSON header line followed by one JSON result
+      per line.
+    - lease_timeout (float): Seconds without a heartbeat after which a job is taken back from its worker and handed out
+      again.
+
+    Returns:
+    - dict: The state of the coordinator.
+    """
+    # Compare the header through JSON, as it is read back from the store
+    header = json.loads(json.dumps({'problem': problem, 'jobs': jobs}))
+
+    results = {}
+    if os.path.exists(results_path) and os.path.getsize(results_path) > 0:
+        with open(results_path, 'r') as file:
+            if json.loads(file.readline()).get('header') != header:
+                raise ValueError(f"The results store {results_path} belongs to a different experiment (problem, "
+                                 f"trials or seeds). Use another results path or remove it")
+            for line in file:
+                result = json.loads(line)
+                results[result['job_id']] = result
+    else:
+        with open(results_path, 'w') as file:
+            file.write(json.dumps({'header': header}) + '\n')
+
+    coordinator = {
+        'jobs': {job['id']: job for job in jobs},
+        'problem': problem,
+        'pending': deque(job['id'] for job in jobs if job['id'] not in results),
+        'leases': {},  # Maps every leased job to its worker and the time its lease expires
+        'results': results,
+        'optimum_trials': {},  # Maps every configuration index to its first trial that found a Global Optimum
+        'results_path': results_path,
+        'lease_timeout': lease_timeout,
+        'lock': threading.Lock(),
+        'finished': threading.Event()
+    }
+    for result in results.values():
+        record_optimum(coordinator, result)
+
+    return coordinator
+
+
+def record_optimum(coordinator, result):
+    """
+    Record the result of a trial that found a Global Optimum. As in 'experiments.run_experiments', the later trials of
+    its configuration are then no longer needed, so they are not handed out and their results are left out of the
+    merged results.
+
+    Parameters:
+    - coordinator (dict): The state of the coordinator.
+    - result (dict): The result of a trial (see 'run_job').
+    """
+    if fitness_individual(result['best_individual']) == 0:
+        job = coordinator['jobs'][result['job_id']]
+        optimum_trial = coordinator['optimum_trials'].get(job['config_index'], job['trial'])
+        coordinator['optimum_trials'][job['config_index']] = min(optimum_trial, job['trial'])
+
+
+def is_job_needed(coordinator, job_id):
+    """
+    Check whether a job is needed, i.e. no earlier trial of its configuration found a Global Optimum.
+
+    Parameters:
+    - coordinator (dict): The state of the coordinator.
+    - job_id (int): The id of the job.
+
+    Returns:
+    - bool: True if the job is needed, False otherwise.
+    """
+    job = coordinator['jobs'][job_id]
+    return job['trial'] <= coordinator['optimum_trials'].get(job['config_index'], job['trial'])
+
+
+def is_finished(coordinator):
+    """
+    Check whether every needed job has its result.
+
+    Parameters:
+    - coordinator (dict): The state of the coordinator.
+
+    Returns:
+    - bool: True if the experiment is finished, False otherwise.
+    """
+    return all(job_id in coordinator['results'] for job_id in coordinator['jobs'] if is_job_needed(coordinator, job_id))
+
+
+def expire_leases(coordinator):
+    """
+    Take back the jobs whose worker stopped sending heartbeats, so they are handed out again. Must be called with the
+    coordinator's lock held.
+
+    Parameters:
+    - coordinator (dict): The state of the coordinator.
+    """
+    now = time.monotonic()
+    for job_id, (worker, expires) in list(coordinator['leases'].items()):
+        if expires < now:
+            print(f"Lease of job {job_id} by {worker} expired. Re-issuing it.")
+            del coordinator['leases'][job_id]
+            coordinator['pending'].appendleft(job_id)
+
+
+def handle_message(coordinator, message):
+    """
+    Answer a message of a worker:
+    - 'lease': hand out the next pending job, or tell the worker to wait (jobs are leased to other workers) or to stop.
+    - 'heartbeat': extend the lease of the worker's job, or tell the worker to drop it if it is no longer needed.
+    - 'result': store the result of a job. Results of jobs re-issued and completed twice are stored once.
+
+    Parameters:
+    - coordinator (dict): The state of the coordinator.
+    - message (dict): The message, with its 'type', the 'worker' name and its content.
+
+    Returns:
+    - dict: The answer to the worker.
+    """
+    with coordinator['lock']:
+        expire_leases(coordinator)
+        lease_expires = time.monotonic() + coordinator['lease_timeout']
+
+        if message['type'] == 'lease':
+            while coordinator['pending']:
+                job_id = coordinator['pending'].popleft()
+                if job_id not in coordinator['results'] and is_job_needed(coordinator, job_id):
+                    coordinator['leases'][job_id] = (message['worker'], lease_expires)
+                    return {'job': coordinator['jobs'][job_id], 'problem': coordinator['problem']}
+            return {'job': None, 'wait': bool(coordinator['leases'])}
+
+        if message['type'] == 'heartbeat':
+            job_id = message['job_id']
+            if job_id in coordinator['results'] or not is_job_needed(coordinator, job_id):
+                # Another worker already completed the job, or an earlier trial of its configuration found a Global
+                # Optimum, so this one can stop it
+                coordinator['leases'].pop(job_id, None)
+                return {'ok': False}
+            coordinator['leases'][job_id] = (message['worker'], lease_expires)
+            return {'ok': True}
+
+        if message['type'] == 'result':
+            result = message['result']
+            job_id = result['job_id']
+            coordinator['leases'].pop(job_id, None)
+            if job_id not in coordinator['results']:
+                coordinator['results'][job_id] = result
+                record_optimum(coordinator, result)
+                with open(coordinator['results_path'], 'a') as file:
+                    file.write(json.dumps(result) + '\n')
+                print(f"Job {job_id} done by {message['worker']} ({len(coordinator['results'])} out of "
+                      f"{len(coordinator['jobs'])})")
+            if is_finished(coordinator):
+                coordinator['finished'].set()
+            return {'ok': True}
+
+    return {'error': f"Unknown message type: {message['type']}"}
+
+
+def make_coordinator_server(coordinator, host='127.0.0.1', port=8766):
+    """
+    Create the TCP server of the coordinator. Every connection carries one message of a worker and its answer, each a
+    line of JSON, so a worker that dies never leaves a connection behind.
+
+    Parameters:
+    - coordinator (dict): The state of the coordinator.
+    - host (str): The address to listen on. Use '0.0.0.0' to accept workers from other hosts.
+    - port (int): The port to listen on.
+
+    Returns:
+    - socketserver.ThreadingTCPServer: The server, not yet serving.
+    """
+
+    class MessageHandler(socketserver.StreamRequestHandler):
+
+        def handle(self):
+            message = json.loads(self.rfile.readline())
+            self.wfile.write((json.dumps(handle_message(coordinator, message)) + '\n').encode())
+
+    class CoordinatorServer(socketserver.ThreadingTCPServer):
+        # Allow restarting the coordinator right away on the same port
+        allow_reuse_address = True
+
+    return CoordinatorServer((host, port), MessageHandler)
+
+
+def merge_results(coordinator):
+    """
+    Merge the results of all trials into one result per configuration, in the format of 'experiments.run_experiments'.
+
+    Parameters:
+    - coordinator (dict): The state of the coordinator.
+
+    Returns:
+    - list: A list of dictionaries with the configuration and the 'average_best_fitnesses' of every configuration.
+    - list: The overall best individual and its best fitness.
+    """
+    trials_by_config = {}
+    overall_best = [None, float('inf')]
+
+    for job_id, job in sorted(coordinator['jobs'].items()):
+        if not is_job_needed(coordinator, job_id):
+            continue  # A trial after one that found a Global Optimum, left out as in 'run_experiments'
+        result = coordinator['results'][job_id]
+        config = tuple(job['config'].items())
+
+        # A trial may end before finishing any generation, so its final fitness is taken from its best individual
+        final_best_fitness = fitness_individual(result['best_individual'])
+        trials_by_config.setdefault(config, []).append(list(result['best_fitness_per_generation'])
+                                                       or [final_best_fitness])
+        if final_best_fitness < overall_best[1]:
+            overall_best = [result['best_individual'], final_best_fitness]
+
+    results = []
+    for config, all_trials_best_fitnesses in trials_by_config.items():
+
+        # Pad all fitness sequences to the same length, if a trial ends earlier, due to the finding of a Global Optimum
+        max_length = max(len(seq) for seq in all_trials_best_fitnesses)
+        for seq in all_trials_best_fitnesses:
+            seq.extend([seq[-1]] * (max_length - len(seq)))
+
+        results.append({**dict(config),
+                        'average_best_fitnesses': np.mean(all_trials_best_fitnesses, axis=0).tolist()})
+
+    return results, overall_best
+
+
+def run_distributed_experiments(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week,
+                                blocks_per_day, generations, pc, pm, trials, host='127.0.0.1', port=8766,
+                                results_path='farm_results.jsonl', lease_timeout=60, base_seed=0):
+    """
+    Run the experiment grid of 'experiments.run_experiments' on a farm of workers, possibly on several hosts (see
+    'run_worker'), as its coordinator. Returns once every needed trial is done (see 'record_optimum'), saving the
+    merged results to 'experiment_results.txt' as 'run_experiments' does.
+
+    Parameters:
+    - pop_size (int): Number of individuals in the population.
+    - num_practical_turns (int): Number of Practical Turns per individual.
+    - subjects_per_practical_turn (int): Number of subjects each Practical Turn is enrolled in.
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+    - generations (int): Number of generations to run the Genetic Algorithm.
+    - pc (float): Crossover probability.
+    - pm (float): Mutation probability.
+    - trials (int): Number of trials to run the experiment.
+    - host (str): The address to listen on. Use '0.0.0.0' to accept workers from other hosts.
+    - port (int): The port to listen on.
+    - results_path (str): The path of the results store. Trials already in it are not run again. A store written for
+      a different problem, number of trials or seed is refused.
+    - lease_timeout (float): Seconds without a heartbeat after which a job is re-issued to another worker.
+    - base_seed (int): The root seed of the random streams of the trials (see 'experiment_jobs').
+
+    Returns:
+    - list: A list of dictionaries with the configuration and the 'average_best_fitnesses' of every configuration.
+    """
+    problem = {'pop_size': pop_size, 'num_practical_turns': num_practical_turns,
+               'subjects_per_practical_turn': subjects_per_practical_turn, 'days_per_week': days_per_week,
+               'blocks_per_day': blocks_per_day, 'generations': generations, 'pc': pc, 'pm': pm}
+    coordinator = create_coordinator(experiment_jobs(trials, base_seed), problem, results_path, lease_timeout)
+    if is_finished(coordinator):
+        coordinator['finished'].set()
+
+    server = make_coordinator_server(coordinator, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Coordinator listening on {host}:{server.server_address[1]} with {len(coordinator['pending'])} jobs to run")
+
+    try:
+        coordinator['finished'].wait()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    results, (overall_best_individual, overall_best_fitness) = merge_results(coordinator)
+
+    # Save the results of the experiment to a text file
+    with open("experiment_results.txt", "w") as file:
+        for result in results:
+            file.write(f"{result}\n")
+        if overall_best_individual is not None:
+            file.write(f"Overall Best Individual: {overall_best_individual}\n")
+            file.write(f"Overall Best Fitness: {overall_best_fitness}\n")
+
+    return results
+
+
+def send_message(host, port, message, timeout=30):
+    """
+    Send a message to the coordinator and wait for its answer.
+
+    Parameters:
+    - host (str): The address of the coordinator.
+    - port (int): The port of the coordinator.
+    - message (dict): The message.
+    - timeout (float): Seconds to wait for the coordinator.
+
+    Returns:
+    - dict: The answer of the coordinator.
+    """
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.sendall((json.dumps(message) + '\n').encode())
+        return json.loads(connection.makefile('r').readline())
+
+
+def run_worker(host='127.0.0.1', port=8766, worker=None, heartbeat_interval=10, poll_interval=2):
+    """
+    Run trials handed out by the coordinator until there are none left or the coordinator stops answering, sending
+    heartbeats while each trial runs so the coordinator knows the worker is alive. A trial is dropped as soon as a
+    heartbeat tells that another worker already completed it. Start one worker per CPU on every host of the farm.
+
+    Parameters:
+    - host (str): The address of the coordinator.
+    - port (int): The port of the coordinator.
+    - worker (str): The name of the worker. If None, the host name and the process id are used.
+    - heartbeat_interval (float): Seconds between heartbeats. Must be well below the coordinator's lease timeout.
+    - poll_interval (float): Seconds to wait before asking again when all remaining jobs are leased to other workers.
+
+    Returns:
+    - int: The number of trials run by this worker.
+    """
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    trials_run = 0
+
+    while True:
+        try:
+            answer = send_message(host, port, {'type': 'lease', 'worker': worker})
+        except OSError:
+            return trials_run  # The coordinator is gone (every trial is done) or no longer answers
+        job = answer['job']
+        if job is None:
+            if not answer['wait']:
+                return trials_run
+            time.sleep(poll_interval)
+            continue
+
+        # Send heartbeats from a background thread while the trial runs, and stop the trial if it is no longer needed
+        trial_done = threading.Event()
+        job_dropped = threading.Event()
+
+        def send_heartbeats():
+            while not trial_done.wait(heartbeat_interval):
+                try:
+                    heartbeat_answer = send_message(host, port, {'type': 'heartbeat', 'worker': worker,
+                                                                 'job_id': job['id']})
+                except OSError as e:
+                    print(f"Heartbeat failed: {e}")  # Keep running the trial; the lease may still be valid
+                    continue
+                if not heartbeat_answer.get('ok'):
+                    job_dropped.set()  # Another worker already completed the job
+                    return
+
+        heartbeat_thread = threading.Thread(target=send_heartbeats, daemon=True)
+        heartbeat_thread.start()
+        try:
+            result = run_job(job, answer['problem'], stop_event=job_dropped)
+        finally:
+            trial_done.set()
+            heartbeat_thread.join()
+
+        if job_dropped.is_set():
+            print(f"Job {job['id']} was completed by another worker. Dropping it.")
+            continue
+
+        try:
+            send_message(host, port, {'type': 'result', 'worker': worker, 'result': result})
+        except OSError:
+            return trials_run  # The coordinator no longer answers; the lease of the job expires and it is re-issued
+        trials_run += 1
+
+
+if __name__ == "__main__":
+    # Run 'python farm.py worker <coordinator host>' on every host of the farm, and 'python farm.py' on the coordinator
+    if sys.argv[1:2] == ['worker']:
+        run_worker(host=sys.argv[2] if len(sys.argv) > 2 else '127.0.0.1')
+        sys.exit()
+
+    results = run_distributed_experiments(pop_size=100, num_practical_turns=10, subjects_per_practical_turn=4,
+                                          days_per_week=5, blocks_per_day=8, generations=500, pc=0.9, pm=0.2,
+                                          trials=30, host='0.0.0.0')
+
+    # Print the results
+    for result in results:
+        print(result)
@@ -1,9 +1,27 @@
-# Import the necessary scripts
+# Import the necessary libraries and scripts
+import numbers
 from charles import population
+from distances import hamming_matrix
+from kernels import get_kernel, register_kernel
 
 
 def fitness_individual(individual):
     """
+    Calculates the fitness score of an Individual with the 'fitness' kernel of the default backend (see 'kernels.py').
+
+    Parameters:
+    - individual (list): A list representing the schedule of an individual.
+
+    Returns:
+    - int: The total penalty points for the individual, where a lower penalty indicates a better fitness.
+    """
+    return get_kernel('fitness')(individual)
+
+
+@register_kernel('fitness')
+def fitness_individual_python(individual):
+    """
+  The 'python' kernel of 'fitness_individual', the reference implementation of the other backends.
   Calculates the fitness score of an Individual by assessing penalties based on the specified criteria.
 
   Parameters:
@@ -71,8 +89,83 @@ def fitness_individual(individual):
     return penalties
 
 
+def resource_penalty(individual, resources, teacher_clash_weight=3, room_overflow_weight=3,
+                     teacher_unavailable_weight=4):
+    """
+    Calculates the penalty of an Individual for teacher and room conflicts, using per-slot resource counters so that
+    the time is proportional to the size of the schedule.
+
+    Parameters:
+    - individual (list): A list representing the schedule of an individual.
+    - resources (dict): The resources of the instance (see 'data.generate_resources'): the 'teachers' of every
+      subject, the 'rooms' available per (day, block) slot (an integer, including numpy integers, or a list of lists
+      per day and block) and the 'teacher_unavailability' as a list of (day, block) slots for every teacher.
+    - teacher_clash_weight (int): Penalty for each extra distinct subject a teacher must teach in the same slot.
+    - room_overflow_weight (int): Penalty for each class in a slot beyond the available rooms.
+    - teacher_unavailable_weight (int): Penalty for each class in a slot where its teacher is unavailable.
+
+    Returns:
+    - int: The resource penalty points for the individual.
+    """
+
+    penalties = 0
+    subject_teachers = resources['teachers']
+    rooms = resources.get('rooms')
+    unavailable = {(teacher, day, block) for teacher, slots in resources.get('teacher_unavailability', {}).items()
+                   for day, block in slots}
+
+    classes_per_slot = {}     # Number of classes in every (day, block) slot
+    teacher_subjects = {}     # Distinct subjects of every teacher in every (day, block) slot
+
+    for practical_turn in individual:
+        for day_idx, day in enumerate(practical_turn):
+            for block_idx, subject in enumerate(day):
+                if subject == 'Break':
+                    continue
+
+                slot = (day_idx, block_idx)
+                classes_per_slot[slot] = classes_per_slot.get(slot, 0) + 1
+
+                teacher = subject_teachers.get(subject)
+                if teacher is None:
+                    continue
+                teacher_subjects.setdefault((teacher, day_idx, block_idx), set()).add(subject)
+
+                # Penalty for a class whose teacher is unavailable in the slot
+                if (teacher, day_idx, block_idx) in unavailable:
+                    penalties += teacher_unavailable_weight
+
+    # Penalty for every extra distinct subject of a teacher in the same slot
+    for subjects in teacher_subjects.values():
+        penalties += (len(subjects) - 1) * teacher_clash_weight
+
+    # Penalty for every class beyond the rooms available in the slot
+    if rooms is not None:
+        for (day_idx, block_idx), classes in classes_per_slot.items():
+            available = rooms if isinstance(rooms, numbers.Integral) else rooms[day_idx][block_idx]
+            penalties += max(0, classes - available) * room_overflow_weight
+
+    return penalties
+
+
 def evaluate_population(population):
     """
+    Evaluates the fitness of an entire population of individuals with the 'population_fitness' kernel of the default
+    backend (see 'kernels.py').
+
+    Parameters:
+    - population (list): A list of individuals, each an individual schedule to be evaluated.
+
+    Returns:
+    - list: A list of fitness scores for each individual in the population.
+    """
+    return get_kernel('population_fitness')(population)
+
+
+@register_kernel('population_fitness')
+def evaluate_population_python(population):
+    """
+  The 'python' kernel of 'evaluate_population'.
   Evaluates the fitness of an entire population of individuals
 
   Parameters:
@@ -86,7 +179,7 @@ def evaluate_population(population):
     for individual in population:
 
         # Calculate fitness for each individual and append to results
-        score = fitness_individual(individual)
+        score = fitness_individual_python(individual)
         fitness_scores.append(score)
 
     return fitness_scores
@@ -94,6 +187,23 @@ def evaluate_population(population):
 
 def hamming_distance_between_individuals(individual1, individual2):
     """
+    Calculate the distance between two individuals (weekly schedules for all Practical Turns), with the 'hamming'
+    kernel of the default backend (see 'kernels.py').
+
+    Parameters:
+    - individual1 (list): The first individual (schedule) to compare.
+    - individual2 (list): The second individual (schedule) to compare.
+
+    Returns:
+    - int: The total distance (number of differing blocks) between the two individuals.
+    """
+    return get_kernel('hamming')(individual1, individual2)
+
+
+@register_kernel('hamming')
+def hamming_distance_between_individuals_python(individual1, individual2):
+    """
+    The 'python' kernel of 'hamming_distance_between_individuals'.
     Calculate the distance between two individuals (weekly schedules for all Practical Turns).
     The distance is the count of differing blocks between the two individuals.
 
@@ -178,23 +288,8 @@ def hamming_distance_among_population(population):
                                          between individual i and individual j.
     """
 
-    hamming_distance = []  # Initialize the matrix to store the Hamming distances
-
-    # Iterate over each individual in the population
-    for individual_1 in population:
-
-        dist_individuals = []  # Initialize the list to store distances for the current individual
-
-        # Iterate over each individual in the population again to compute pairwise distances
-        for individual_2 in population:
-
-            # Compute the Hamming distance between individual_1 and individual_2
-            dist_individuals.append(hamming_distance_between_individuals(individual_1, individual_2))
-
-        # Append the distances for the current individual to the Hamming distance matrix
-        hamming_distance.append(dist_individuals)
-
-    return hamming_distance
+    # Compare all pairs of schedules at once (see 'distances.hamming_matrix')
+    return hamming_matrix(population).tolist()
 
 
 def invert_normalized_distance(distance):
@@ -231,7 +326,7 @@ def invert_normalized_distance(distance):
     return invert_normalized_distance
 
 
-def fitness_sharing(population):
+def fitness_sharing(population, evaluator=evaluate_population):
     """
     Apply fitness sharing to a population to adjust the fitness of individuals based on their similarity.
     In this minimization problem, rare individuals will have their fitness values improved (decreased),
@@ -239,24 +334,21 @@ def fitness_sharing(population):
 
     Parameters:
     - population (list): A list of individuals where each individual represents a weekly schedule.
+    - evaluator (function): The function computing the fitness scores of a list of individuals.
 
     Returns:
     - new_scores (list): A list of adjusted fitness scores for the population after applying fitness sharing.
     """
 
     # Evaluate the fitness of the population
-    fitness_scores = evaluate_population(population)
+    fitness_scores = evaluator(population)
 
     # Calculate the Hamming distances between each pair of individuals in the population
-    hamming_distances = hamming_distance_among_population(population)
-
-    # Invert and normalize the Hamming distances
-    invert_normalized_distances = invert_normalized_distance(hamming_distances)
+    hamming_distances = hamming_matrix(population)
 
-    # Calculate the sum of the inverted normalized distances for each individual
-    sums = []
-    for li in invert_normalized_distances:
-        sums.append(sum(li))
+    # Invert and normalize the Hamming distances, and sum them for each individual
+    length = get_length(population[0])
+    sums = (1 - hamming_distances / length).sum(axis=1).tolist()
 
     # Adjust the fitness scores based on the similarity sums
     # For this minimization problem, reduce fitness for rare individuals and increase for similar ones
@@ -0,0 +1,96 @@
+# Import the necessary libraries and scripts
+import heapq
+import itertools
+from charles import copy_individual
+from population_index import individual_key
+
+
+def create_hall_of_fame(capacity):
+    """
+    Create a hall of fame, a bounded archive of the best distinct individuals found during a run.
+
+    The archive is a heap with its worst individual at the top, so an individual better than the worst one replaces it
+    in O(log capacity) time, and a set of the keys of the archived individuals, so duplicates are rejected in O(1)
+    time on average.
+
+    Parameters:
+    - capacity (int): Maximum number of individuals in the hall of fame.
+
+    Returns:
+    - dict: The hall of fame.
+    """
+    return {
+        'capacity': capacity,
+        'heap': [],  # Entries (-fitness, insertion order, key, individual), so the worst individual is at the top
+        'keys': set(),
+        'insertions': itertools.count()
+    }
+
+
+def hall_of_fame_insert(hall_of_fame, individual, fitness):
+    """
+    Insert an individual into the hall of fame, if it is not already there and it is better than the worst archived
+    individual (or the hall of fame is not full). A copy is archived, so later in-place changes of the individual do not
+    affect it.
+
+    Parameters:
+    - hall_of_fame (dict): The hall of fame. It is updated in place.
+    - individual (list): The individual to be inserted.
+    - fitness (float): The fitness of the individual.
+
+    Returns:
+    - bool: Whether the individual was inserted.
+    """
+    heap = hall_of_fame['heap']
+    is_full = len(heap) >= hall_of_fame['capacity']
+
+    # Reject individuals that would be evicted right away before building their key
+    if is_full and fitness >= -heap[0][0]:
+        return False
+
+    key = individual_key(individual)
+    if key in hall_of_fame['keys']:
+        return False
+
+    entry = (-fitness, next(hall_of_fame['insertions']), key, copy_individual(individual))
+    if is_full:
+        # Replace the worst archived individual
+        evicted = heapq.heapreplace(heap, entry)
+        hall_of_fame['keys'].discard(evicted[2])
+    else:
+        heapq.heappush(heap, entry)
+    hall_of_fame['keys'].add(key)
+
+    return True
+
+
+def hall_of_fame_update(hall_of_fame, population, fitness_scores):
+    """
+    Insert every individual of a population into the hall of fame (see 'hall_of_fame_insert').
+
+    Parameters:
+    - hall_of_fame (dict): The hall of fame. It is updated in place.
+    - population (list): The population of individuals.
+    - fitness_scores (list): The fitness scores of the individuals in the population.
+
+    Returns:
+    - int: The number of individuals inserted.
+    """
+    return sum(hall_of_fame_insert(hall_of_fame, individual, fitness)
+               for individual, fitness in zip(population, fitness_scores))
+
+
+def hall_of_fame_best(hall_of_fame, n=None):
+    """
+    Get the best individuals of the hall of fame, best first.
+
+    Parameters:
+    - hall_of_fame (dict): The hall of fame.
+    - n (int): Number of individuals to get. If None, all archived individuals are returned.
+
+    Returns:
+    - list: Tuples (individual, fitness), sorted by fitness (lower is better), and by insertion order among ties.
+    """
+    n = len(hall_of_fame['heap']) if n is None else n
+    best = heapq.nsmallest(n, hall_of_fame['heap'], key=lambda entry: (-entry[0], entry[1]))
+    return [(individual, -negative_fitness) for negative_fitness, _, _, individual in best]
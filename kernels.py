@@ -0,0 +1,361 @@
+# Import the necessary libraries and scripts
+import functools
+import random
+import numpy as np
+from charles import BLOCK_NAMES, BREAK_CODE, decode_individual, encode_individual, encode_population
+from constraints import PENALTY_COMPONENTS, compile_constraints
+from random_streams import create_stream
+
+# Numba is optional: without it, only the 'python' backend is available
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Kernels of every available backend, by backend and kernel name. The 'python' kernels are the list-based functions of
+# 'fitness', 'distances' and 'crossovers', which register themselves when these modules are imported (see
+# 'register_kernel'); the Numba kernels compile the same loops over compact individuals
+BACKENDS = {'python': {}}
+
+# Names of the kernels every backend provides, with the public functions dispatching to them:
+# - 'fitness': 'fitness.fitness_individual'
+# - 'population_fitness': 'fitness.evaluate_population'
+# - 'hamming': 'fitness.hamming_distance_between_individuals'
+# - 'hamming_matrix': 'distances.hamming_matrix'
+# - 'uniform_block_crossover': 'crossovers.uniform_block_crossover'
+# - 'single_point_block_crossover': 'crossovers.single_point_block_crossover'
+KERNEL_NAMES = ['fitness', 'population_fitness', 'hamming', 'hamming_matrix', 'uniform_block_crossover',
+                'single_point_block_crossover']
+
+
+def register_kernel(name, backend='python'):
+    """
+    Decorator registering a function as the kernel of a backend.
+
+    Parameters:
+    - name (str): The name of the kernel (see 'KERNEL_NAMES').
+    - backend (str): The name of the backend.
+
+    Returns:
+    - function: The decorator, which returns the function unchanged.
+    """
+    def register(kernel):
+        BACKENDS.setdefault(backend, {})[name] = kernel
+        return kernel
+    return register
+
+
+def get_kernel(name, backend=None):
+    """
+    Get a kernel of a backend.
+
+    Parameters:
+    - name (str): The name of the kernel (see 'KERNEL_NAMES').
+    - backend (str): The name of the backend ('python' or 'numba'). If None, 'DEFAULT_BACKEND' is used.
+
+    Returns:
+    - function: The kernel.
+    """
+    backend = DEFAULT_BACKEND if backend is None else backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Kernel backend not available: {backend}. Available backends: {sorted(BACKENDS)}")
+    return BACKENDS[backend][name]
+
+
+@functools.lru_cache(maxsize=None)
+def fitness_arguments(blocks_per_day=8, days_per_week=5):
+    """
+    Get the arguments of the compiled fitness kernels that make them score individuals exactly as
+    'fitness.fitness_individual' does, from the default constraints (see 'constraints.DEFAULT_CONSTRAINTS').
+
+    Parameters:
+    - blocks_per_day (int): Number of blocks in each day.
+    - days_per_week (int): Number of days in a week.
+
+    Returns:
+    - tuple: The 'break_penalty', 'quotas', 'overlap_weight', 'missing_break_weight' and 'quota_weight' arguments.
+    """
+    compiled_constraints = compile_constraints(None, blocks_per_day, days_per_week)
+    weights = dict(zip(PENALTY_COMPONENTS, compiled_constraints['weights'].tolist()))
+    return (compiled_constraints['break_penalty'].astype(np.int64), compiled_constraints['quotas'].astype(np.int64),
+            weights['overlap'], weights['missing_break'], weights['quota_shortfall'])
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def fitness_kernel(encoded_individual, break_penalty, quotas, overlap_weight, missing_break_weight, quota_weight):
+        """
+        Compiled kernel of 'fitness.fitness_individual' on a compact individual.
+
+        Parameters:
+        - encoded_individual (np.ndarray): The compact individual, of shape (Practical Turns, days, blocks).
+        - break_penalty (np.ndarray): The penalty of a 'Break' in every block of the day.
+        - quotas (np.ndarray): The minimum weekly blocks of every block value.
+        - overlap_weight (int): The penalty of each overlap.
+        - missing_break_weight (int): The penalty of each day without a 'Break'.
+        - quota_weight (int): The penalty of each block missing to reach a subject's weekly quota.
+
+        Returns:
+        - int: The total penalty of the individual.
+        """
+        num_turns, num_days, num_blocks = encoded_individual.shape
+        num_values = quotas.shape[0]
+        slot_counts = np.zeros((num_days, num_blocks, num_values), dtype=np.int64)
+        penalties = 0
+
+        for turn in range(num_turns):
+            week_counts = np.zeros(num_values, dtype=np.int64)
+
+            for day in range(num_days):
+                break_found = False
+
+                for block in range(num_blocks):
+                    value = encoded_individual[turn, day, block]
+                    if value != BREAK_CODE:
+                        # Count the subject's weekly blocks and its overlaps with the previous Practical Turns
+                        week_counts[value] += 1
+                        if slot_counts[day, block, value] > 0:
+                            penalties += overlap_weight
+                        slot_counts[day, block, value] += 1
+                    else:
+                        break_found = True
+                        penalties += break_penalty[block]
+
+                if not break_found:
+                    penalties += missing_break_weight
+
+            # Penalize the weekly shortfall of every subject of the Practical Turn
+            for value in range(num_values):
+                if week_counts[value] > 0 and week_counts[value] < quotas[value]:
+                    penalties += (quotas[value] - week_counts[value]) * quota_weight
+
+        return penalties
+
+    @numba.njit(cache=True)
+    def population_fitness_kernel(encoded_population, break_penalty, quotas, overlap_weight, missing_break_weight,
+                                  quota_weight):
+        """
+        Compiled kernel evaluating a whole compact population with 'fitness_kernel'.
+
+        Parameters:
+        - encoded_population (np.ndarray): The compact population, of shape (individuals, Practical Turns, days,
+          blocks).
+        - break_penalty, quotas, overlap_weight, missing_break_weight, quota_weight: See 'fitness_kernel'.
+
+        Returns:
+        - np.ndarray: The total penalty of every individual.
+        """
+        fitness_scores = np.zeros(encoded_population.shape[0], dtype=np.int64)
+        for index in range(encoded_population.shape[0]):
+            fitness_scores[index] = fitness_kernel(encoded_population[index], break_penalty, quotas, overlap_weight,
+                                                   missing_break_weight, quota_weight)
+        return fitness_scores
+
+    @numba.njit(cache=True)
+    def hamming_kernel(encoded_individual1, encoded_individual2):
+        """
+        Compiled kernel of 'fitness.hamming_distance_between_individuals' on compact individuals.
+
+        Parameters:
+        - encoded_individual1 (np.ndarray): The first compact individual.
+        - encoded_individual2 (np.ndarray): The second compact individual, of the same shape.
+
+        Returns:
+        - int: The number of differing blocks between the two individuals.
+        """
+        blocks1 = encoded_individual1.ravel()
+        blocks2 = encoded_individual2.ravel()
+        distance = 0
+        for index in range(blocks1.shape[0]):
+            if blocks1[index] != blocks2[index]:
+                distance += 1
+        return distance
+
+    @numba.njit(cache=True)
+    def hamming_matrix_kernel(encoded_population):
+        """
+        Compiled kernel of 'distances.hamming_matrix' on a compact population.
+
+        Parameters:
+        - encoded_population (np.ndarray): The compact population, of shape (individuals, Practical Turns, days,
+          blocks).
+
+        Returns:
+        - np.ndarray: The (individuals, individuals) matrix of Hamming distances.
+        """
+        pop_size = encoded_population.shape[0]
+        distances = np.zeros((pop_size, pop_size), dtype=np.int64)
+        for i in range(pop_size):
+            for j in range(i + 1, pop_size):
+                distances[i, j] = hamming_kernel(encoded_population[i], encoded_population[j])
+                distances[j, i] = distances[i, j]
+        return distances
+
+    @numba.njit(cache=True)
+    def uniform_block_crossover_kernel(encoded_parent1, encoded_parent2, swap_mask):
+        """
+        Compiled kernel of 'crossovers.uniform_block_crossover' on compact individuals. The random choices are made by
+        the caller, in the same order as the 'python' kernel, so both produce the same offspring.
+
+        Parameters:
+        - encoded_parent1 (np.ndarray): The first compact parent.
+        - encoded_parent2 (np.ndarray): The second compact parent, of the same shape.
+        - swap_mask (np.ndarray): A boolean array of the same shape, True where the block of the first offspring comes
+          from the second parent.
+
+        Returns:
+        - np.ndarray: The first compact offspring.
+        - np.ndarray: The second compact offspring.
+        """
+        blocks1 = encoded_parent1.ravel()
+        blocks2 = encoded_parent2.ravel()
+        swaps = swap_mask.ravel()
+        offspring1 = np.empty_like(blocks1)
+        offspring2 = np.empty_like(blocks2)
+        for index in range(blocks1.shape[0]):
+            if swaps[index]:
+                offspring1[index] = blocks2[index]
+                offspring2[index] = blocks1[index]
+            else:
+                offspring1[index] = blocks1[index]
+                offspring2[index] = blocks2[index]
+        return offspring1.reshape(encoded_parent1.shape), offspring2.reshape(encoded_parent2.shape)
+
+    @numba.njit(cache=True)
+    def single_point_block_crossover_kernel(encoded_parent1, encoded_parent2, crossover_points):
+        """
+        Compiled kernel of 'crossovers.single_point_block_crossover' on compact individuals. The random crossover
+        points are chosen by the caller, in the same order as the 'python' kernel, so both produce the same offspring.
+
+        Parameters:
+        - encoded_parent1 (np.ndarray): The first compact parent, of shape (Practical Turns, days, blocks).
+        - encoded_parent2 (np.ndarray): The second compact parent, of the same shape.
+        - crossover_points (np.ndarray): The crossover point of every day of every Practical Turn, of shape
+          (Practical Turns, days).
+
+        Returns:
+        - np.ndarray: The first compact offspring.
+        - np.ndarray: The second compact offspring.
+        """
+        num_turns, num_days, num_blocks = encoded_parent1.shape
+        offspring1 = encoded_parent1.copy()
+        offspring2 = encoded_parent2.copy()
+        for turn in range(num_turns):
+            for day in range(num_days):
+                for block in range(crossover_points[turn, day], num_blocks):
+                    offspring1[turn, day, block] = encoded_parent2[turn, day, block]
+                    offspring2[turn, day, block] = encoded_parent1[turn, day, block]
+        return offspring1, offspring2
+
+    # The Numba kernels take and return the same lists as the 'python' kernels, encoding them for the compiled loops
+    @register_kernel('fitness', 'numba')
+    def fitness_individual_numba(individual):
+        encoded_individual = encode_individual(individual)
+        return int(fitness_kernel(encoded_individual, *fitness_arguments(*encoded_individual.shape[:0:-1])))
+
+    @register_kernel('population_fitness', 'numba')
+    def evaluate_population_numba(population):
+        if not population:
+            return []
+        encoded_population = encode_population(population)
+        return population_fitness_kernel(encoded_population,
+                                         *fitness_arguments(*encoded_population.shape[:1:-1])).tolist()
+
+    @register_kernel('hamming', 'numba')
+    def hamming_distance_between_individuals_numba(individual1, individual2):
+        return int(hamming_kernel(encode_individual(individual1), encode_individual(individual2)))
+
+    register_kernel('hamming_matrix', 'numba')(hamming_matrix_kernel)
+
+    @register_kernel('uniform_block_crossover', 'numba')
+    def uniform_block_crossover_numba(parent1, parent2, rng=None):
+        rng = random if rng is None else rng
+        encoded_parent1, encoded_parent2 = encode_individual(parent1), encode_individual(parent2)
+
+        # Draw the random choices in the same order as the 'python' kernel, so both consume the same random numbers
+        swap_mask = np.array([rng.random() >= 0.5 for _ in range(encoded_parent1.size)]).reshape(encoded_parent1.shape)
+
+        offspring1, offspring2 = uniform_block_crossover_kernel(encoded_parent1, encoded_parent2, swap_mask)
+        return decode_individual(offspring1), decode_individual(offspring2)
+
+    @register_kernel('single_point_block_crossover', 'numba')
+    def single_point_block_crossover_numba(parent1, parent2, rng=None):
+        rng = random if rng is None else rng
+        encoded_parent1, encoded_parent2 = encode_individual(parent1), encode_individual(parent2)
+        num_turns, num_days, num_blocks = encoded_parent1.shape
+
+        # Draw the crossover points in the same order as the 'python' kernel
+        crossover_points = np.array([rng.randint(1, num_blocks - 1) for _ in range(num_turns * num_days)]
+                                    ).reshape(num_turns, num_days)
+
+        offspring1, offspring2 = single_point_block_crossover_kernel(encoded_parent1, encoded_parent2,
+                                                                     crossover_points)
+        return decode_individual(offspring1), decode_individual(offspring2)
+
+# The Numba backend is used when available, unless another one is requested
+DEFAULT_BACKEND = 'numba' if 'numba' in BACKENDS else 'python'
+
+
+def check_kernel_conformance(backends=None, trials=50, seed=0):
+    """
+    Check that the kernels of every backend give exactly the same results as the 'python' kernels, the list-based
+    reference functions ('fitness.fitness_individual', 'fitness.hamming_distance_between_individuals', the block-level
+    crossovers, ...), on random populations and on the edge cases of the default constraints (days full of subjects or
+    of 'Break' blocks).
+
+    Parameters:
+    - backends (list): The names of the backends to check. If None, every available backend is checked.
+    - trials (int): Number of random populations to check.
+    - seed (int): The seed of the random populations.
+
+    Returns:
+    - dict: For every backend, the list of mismatches found (empty if the backend conforms).
+    """
+    # Import here, since importing the modules of the 'python' kernels registers them
+    import crossovers
+    import distances
+    import fitness
+    from charles import initialize_population
+
+    backends = sorted(BACKENDS) if backends is None else backends
+    mismatches = {backend: [] for backend in backends}
+    rng = np.random.default_rng(seed)
+
+    for trial in range(trials):
+        population = initialize_population(6, 10, 4, 5, 8, rng=create_stream(seed, trial))
+
+        # Edge cases: an individual without any 'Break' and one with only 'Break' blocks
+        population.append(decode_individual(rng.integers(1, len(BLOCK_NAMES), size=(10, 5, 8)).astype(np.int8)))
+        population.append(decode_individual(np.zeros((10, 5, 8), dtype=np.int8)))
+        encoded_population = encode_population(population)
+
+        expected_fitness = [get_kernel('fitness', 'python')(individual) for individual in population]
+        expected_distances = [[get_kernel('hamming', 'python')(individual1, individual2) for individual2 in population]
+                              for individual1 in population]
+
+        for backend in backends:
+            if [get_kernel('fitness', backend)(individual) for individual in population] != expected_fitness:
+                mismatches[backend].append(f"fitness (trial {trial})")
+            if get_kernel('population_fitness', backend)(population) != expected_fitness:
+                mismatches[backend].append(f"population_fitness (trial {trial})")
+            if [[get_kernel('hamming', backend)(individual1, individual2) for individual2 in population]
+                    for individual1 in population] != expected_distances:
+                mismatches[backend].append(f"hamming (trial {trial})")
+            if get_kernel('hamming_matrix', backend)(encoded_population).tolist() != expected_distances:
+                mismatches[backend].append(f"hamming_matrix (trial {trial})")
+
+            # Replay the same random stream for the 'python' crossovers and the ones of the backend
+            for index, name in enumerate(['uniform_block_crossover', 'single_point_block_crossover']):
+                parents = population[0], population[1]
+                expected_offspring = get_kernel(name, 'python')(*parents, rng=create_stream(seed, trial, index))
+                if get_kernel(name, backend)(*parents, rng=create_stream(seed, trial, index)) != expected_offspring:
+                    mismatches[backend].append(f"{name} (trial {trial})")
+
+    return mismatches
+
+
+if __name__ == "__main__":
+    # Run the conformance checks of every available backend
+    for backend, backend_mismatches in check_kernel_conformance().items():
+        print(f"{backend}: {'conforms' if not backend_mismatches else backend_mismatches}")
@@ -0,0 +1,96 @@
+# Import the necessary libraries
+import numpy as np
+
+
+def dominance_matrix(objectives, tile_size=256):
+    """
+    Calculate which individuals dominate which, for a minimization problem: individual i dominates individual j when it
+    is no worse than j in every objective and better in at least one.
+
+    Parameters:
+    - objectives (np.ndarray): An array of shape (individuals, objectives) with the objective values.
+    - tile_size (int): Number of individuals compared against the whole population at a time, which bounds the memory
+      of the temporary arrays.
+
+    Returns:
+    - np.ndarray: A boolean matrix where element [i, j] is True if individual i dominates individual j.
+    """
+    objectives = np.asarray(objectives)
+    num_individuals = len(objectives)
+    dominates = np.empty((num_individuals, num_individuals), dtype=bool)
+
+    for start in range(0, num_individuals, tile_size):
+        tile = objectives[start:start + tile_size, None, :]
+        no_worse = (tile <= objectives[None, :, :]).all(axis=2)
+        better = (tile < objectives[None, :, :]).any(axis=2)
+        dominates[start:start + tile_size] = no_worse & better
+
+    return dominates
+
+
+def fast_non_dominated_sort(objectives):
+    """
+    Sort a population into non-dominated fronts (NSGA-II). Front 0 is the Pareto front of the population, front 1 is
+    the Pareto front of the rest, and so on.
+
+    Parameters:
+    - objectives (np.ndarray): An array of shape (individuals, objectives) with the objective values.
+
+    Returns:
+    - np.ndarray: The front (rank) of every individual.
+    """
+    dominates = dominance_matrix(objectives)
+
+    # Count how many individuals dominate every individual
+    domination_counts = dominates.sum(axis=0)
+    ranks = np.full(len(dominates), -1)
+
+    # Peel the fronts off one after another: the individuals no longer dominated by anyone form the next front
+    rank = 0
+    current_front = np.flatnonzero(domination_counts == 0)
+    while current_front.size:
+        ranks[current_front] = rank
+        domination_counts = domination_counts - dominates[current_front].sum(axis=0)
+        domination_counts[current_front] = -1
+        current_front = np.flatnonzero(domination_counts == 0)
+        rank += 1
+
+    return ranks
+
+
+def crowding_distance(objectives, ranks):
+    """
+    Calculate the crowding distance of every individual within its front (NSGA-II). Individuals at the extremes of
+    their front in any objective get an infinite distance, so they are always preferred.
+
+    Parameters:
+    - objectives (np.ndarray): An array of shape (individuals, objectives) with the objective values.
+    - ranks (np.ndarray): The front of every individual, as returned by 'fast_non_dominated_sort'.
+
+    Returns:
+    - np.ndarray: The crowding distance of every individual.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    num_individuals, num_objectives = objectives.shape
+    distances = np.zeros(num_individuals)
+
+    for objective in range(num_objectives):
+        values = objectives[:, objective]
+        value_range = values.max() - values.min()
+
+        # Sort by front and then by the objective, so the neighbours of every individual in its front are adjacent
+        order = np.lexsort((values, ranks))
+        sorted_values = values[order]
+        sorted_ranks = ranks[order]
+
+        # Individuals at the start or end of their front are boundary individuals
+        is_first = np.r_[True, sorted_ranks[1:] != sorted_ranks[:-1]]
+        is_last = np.r_[sorted_ranks[1:] != sorted_ranks[:-1], True]
+
+        gaps = np.zeros(num_individuals)
+        if value_range > 0:
+            gaps[1:-1] = (sorted_values[2:] - sorted_values[:-2]) / value_range
+        gaps[is_first | is_last] = np.inf
+        distances[order] += gaps
+
+    return distances
@@ -1,18 +1,22 @@
-# Import the necessary libraries
-from random import sample
+# Import the necessary libraries and scripts
+import random
+from occupancy import build_occupancy_index, swap_blocks, swap_is_conflict_free
 
 
-def block_swap_mutation(individual):
+def block_swap_mutation(individual, rng=None):
     """
     Perform block swap mutation on an individual.
     This mutation operator selects two random blocks within each day for each Practical Turn and swaps them.
 
     Parameters:
     - individual (list): The individual to be mutated.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - individual (list): The mutated individual.
     """
+    rng = random if rng is None else rng
 
     # Iterates over all Practical Turns
     for turn_index in range(len(individual)):
@@ -21,7 +25,7 @@ def block_swap_mutation(individual):
         for day_index in range(len(individual[0])):
 
             # Chooses randomly 2 blocks from the total number of blocks
-            block_indexes = sample(range(0, len(individual[0][0])), 2)
+            block_indexes = rng.sample(range(0, len(individual[0][0])), 2)
 
             # Swaps the two selected blocks in the day's schedule
             individual[turn_index][day_index][block_indexes[0]], individual[turn_index][day_index][block_indexes[1]] = (
@@ -30,7 +34,7 @@ def block_swap_mutation(individual):
     return individual
 
 
-def block_inversion_mutation(individual):
+def block_inversion_mutation(individual, rng=None):
     """
     Perform block inversion mutation on an individual.
     This mutation operator selects a random range of blocks within each day of each Practical Turn and inverts the order
@@ -38,10 +42,13 @@ def block_inversion_mutation(individual):
 
     Parameters:
     - individual (list): The individual to be mutated.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - individual (list): The mutated individual.
     """
+    rng = random if rng is None else rng
 
     # Iterates over all Practical Turns
     for class_index in range(len(individual)):
@@ -50,9 +57,9 @@ def block_inversion_mutation(individual):
         for day_index in range(len(individual[0])):
 
             # Chooses randomly 2 blocks from the total number of blocks and ensures they are not consecutive
-            block_indexes = sample(range(0, len(individual[0][0])), 2)
+            block_indexes = rng.sample(range(0, len(individual[0][0])), 2)
             while abs(block_indexes[0] - block_indexes[1]) == 1:
-                block_indexes = sample(range(0, len(individual[0][0])), 2)
+                block_indexes = rng.sample(range(0, len(individual[0][0])), 2)
             block_indexes.sort()
 
             # Inverts the order of the blocks within the selected range
@@ -62,17 +69,20 @@ def block_inversion_mutation(individual):
     return individual
 
 
-def block_scramble_mutation(individual):
+def block_scramble_mutation(individual, rng=None):
     """
     Applies block scramble mutation to an individual. This mutation randomly scrambles the order of blocks
     within each day for all Practical Turns.
 
     Parameters:
     - individual (list): The individual to be mutated.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - list: The mutated individual.
     """
+    rng = random if rng is None else rng
 
     # Iterates over all Practical Turns
     for turn_index in range(len(individual)):
@@ -84,9 +94,49 @@ def block_scramble_mutation(individual):
             blocks = individual[turn_index][day_index]
 
             # Scrambles the order of the blocks
-            scrambled_blocks = sample(blocks, len(blocks))
+            scrambled_blocks = rng.sample(blocks, len(blocks))
 
             # Replaces the original blocks with the scrambled blocks
             individual[turn_index][day_index] = scrambled_blocks
 
     return individual
+
+
+def conflict_free_swap_mutation(individual, rng=None):
+    """
+    Perform a conflict-aware block swap mutation on an individual.
+    Like the block swap mutation, it swaps two blocks within each day for each Practical Turn, but it only chooses
+    swaps that do not make either block overlap with the same subject in another Practical Turn. The overlaps are
+    checked in O(1) time with the occupancy index of the individual. Days without such a swap are left unchanged.
+
+    Parameters:
+    - individual (list): The individual to be mutated.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
+
+    Returns:
+    - individual (list): The mutated individual.
+    """
+    rng = random if rng is None else rng
+
+    # Build the occupancy index of the individual once, and keep it in sync with every swap
+    occupancy_index = build_occupancy_index(individual)
+    num_blocks = len(individual[0][0])
+    block_pairs = [(block1, block2) for block1 in range(num_blocks) for block2 in range(block1 + 1, num_blocks)]
+
+    # Iterates over all Practical Turns
+    for turn_index in range(len(individual)):
+
+        # Iterates over all days
+        for day_index in range(len(individual[0])):
+            day_schedule = individual[turn_index][day_index]
+
+            # Tries the pairs of blocks in random order and swaps the first one that changes the day without overlaps
+            for block1, block2 in rng.sample(block_pairs, len(block_pairs)):
+                subject1, subject2 = day_schedule[block1], day_schedule[block2]
+                if subject1 != subject2 and swap_is_conflict_free(occupancy_index, day_index, block1, subject1,
+                                                                  block2, subject2):
+                    swap_blocks(individual, occupancy_index, turn_index, day_index, block1, block2)
+                    break
+
+    return individual
@@ -0,0 +1,54 @@
+# Import the necessary libraries and scripts
+import numpy as np
+from charles import encode_individual
+from distances import hamming_one_to_many, pack_population, pack_schedules
+
+
+def build_neighbour_index(population):
+    """
+    Build a nearest-neighbour index of a population in Hamming space: the bit-packed schedules of all individuals (see
+    'distances.pack_schedules'), one row per individual, so the distance from a schedule to any set of individuals is
+    a single vectorized popcount.
+
+    Parameters:
+    - population (list): The population of individuals.
+
+    Returns:
+    - np.ndarray: A uint64 array of shape (individuals, bit planes, words) with the packed schedule of every individual.
+    """
+    return pack_population(population)
+
+
+def update_neighbour_index(neighbour_index, position, individual):
+    """
+    Replace the schedule of an individual of the index, after it was replaced in the population.
+
+    Parameters:
+    - neighbour_index (np.ndarray): The index (see 'build_neighbour_index'). It is updated in place.
+    - position (int): The position of the replaced individual in the population.
+    - individual (list): The new individual.
+    """
+    neighbour_index[position] = pack_schedules(encode_individual(individual)[None])[0]
+
+
+def nearest_neighbour(neighbour_index, individual, candidates=None):
+    """
+    Find the individual of the index closest to a schedule, by Hamming distance (the number of differing blocks).
+
+    Parameters:
+    - neighbour_index (np.ndarray): The index (see 'build_neighbour_index').
+    - individual (list or np.ndarray): The schedule, as an individual or as a packed schedule.
+    - candidates (list): The positions of the individuals to search among. If None, the whole index is searched.
+
+    Returns:
+    - int: The position of the nearest individual in the population (the first one among ties).
+    - int: Its Hamming distance to the schedule.
+    """
+    if not isinstance(individual, np.ndarray):
+        individual = pack_schedules(encode_individual(individual)[None])[0]
+    rows = neighbour_index if candidates is None else neighbour_index[candidates]
+
+    distances = hamming_one_to_many(individual, rows)
+    nearest = int(np.argmin(distances))
+    position = nearest if candidates is None else candidates[nearest]
+    return int(position), int(distances[nearest])
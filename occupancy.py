@@ -0,0 +1,134 @@
+# Import the necessary libraries and scripts
+import numpy as np
+from charles import BLOCK_CODES, BLOCK_NAMES, BREAK_CODE, encode_individual
+
+
+def build_occupancy_index(individual):
+    """
+    Build the occupancy index of an individual: for every (day, block) slot, how many Practical Turns have each subject
+    in that slot. Two Practical Turns with the same subject in the same slot are an overlap.
+
+    Parameters:
+    - individual (list): The individual (schedule) to be indexed.
+
+    Returns:
+    - np.ndarray: An array of shape (days, blocks, block values) with the count of every block value (see
+      'charles.BLOCK_NAMES') in every slot, across all Practical Turns.
+    """
+    encoded = encode_individual(individual).astype(np.intp)
+    num_days, num_blocks = encoded.shape[1], encoded.shape[2]
+    num_values = len(BLOCK_NAMES)
+
+    # Give every (day, block, value) triple its own bin and count all of them in a single pass
+    slots = (np.arange(num_days)[:, None] * num_blocks + np.arange(num_blocks)) * num_values
+    counts = np.bincount((encoded + slots).ravel(), minlength=num_days * num_blocks * num_values)
+
+    return counts.reshape(num_days, num_blocks, num_values)
+
+
+def subject_count(occupancy_index, day, block, subject):
+    """
+    Count how many Practical Turns have a subject in a (day, block) slot, in O(1) time.
+
+    Parameters:
+    - occupancy_index (np.ndarray): The occupancy index of the individual.
+    - day (int): The day of the slot.
+    - block (int): The block of the slot.
+    - subject (str): The subject to count. 'Break' blocks never conflict, so they always count as 0.
+
+    Returns:
+    - int: The number of Practical Turns with the subject in the slot.
+    """
+    code = BLOCK_CODES[subject]
+    if code == BREAK_CODE:
+        return 0
+    return int(occupancy_index[day, block, code])
+
+
+def has_conflict(occupancy_index, day, block, subject):
+    """
+    Check, in O(1) time, whether a subject that is already scheduled in a (day, block) slot overlaps with the same
+    subject in another Practical Turn.
+
+    Parameters:
+    - occupancy_index (np.ndarray): The occupancy index of the individual.
+    - day (int): The day of the slot.
+    - block (int): The block of the slot.
+    - subject (str): The subject scheduled in the slot.
+
+    Returns:
+    - bool: True if at least two Practical Turns have the subject in the slot.
+    """
+    return subject_count(occupancy_index, day, block, subject) > 1
+
+
+def update_occupancy_index(occupancy_index, day, block, old_subject, new_subject):
+    """
+    Update the occupancy index, in O(1) time, after a Practical Turn's block changed from one value to another.
+
+    Parameters:
+    - occupancy_index (np.ndarray): The occupancy index of the individual. It is updated in place.
+    - day (int): The day of the changed block.
+    - block (int): The changed block.
+    - old_subject (str): The previous value of the block.
+    - new_subject (str): The new value of the block.
+    """
+    occupancy_index[day, block, BLOCK_CODES[old_subject]] -= 1
+    occupancy_index[day, block, BLOCK_CODES[new_subject]] += 1
+
+
+def swap_is_conflict_free(occupancy_index, day, block1, subject1, block2, subject2):
+    """
+    Check, in O(1) time, whether swapping two blocks of the same day of a Practical Turn creates no overlap, i.e.
+    whether no other Practical Turn has 'subject1' in 'block2' or 'subject2' in 'block1'.
+
+    Parameters:
+    - occupancy_index (np.ndarray): The occupancy index of the individual.
+    - day (int): The day of the blocks.
+    - block1 (int): The first block, currently holding 'subject1'.
+    - subject1 (str): The value of the first block.
+    - block2 (int): The second block, currently holding 'subject2'.
+    - subject2 (str): The value of the second block.
+
+    Returns:
+    - bool: True if neither subject would overlap with another Practical Turn after the swap.
+    """
+    return (subject_count(occupancy_index, day, block2, subject1) == 0
+            and subject_count(occupancy_index, day, block1, subject2) == 0)
+
+
+def swap_blocks(individual, occupancy_index, turn, day, block1, block2):
+    """
+    Swap two blocks of the same day of a Practical Turn, keeping the occupancy index in sync.
+
+    Parameters:
+    - individual (list): The individual. It is changed in place.
+    - occupancy_index (np.ndarray): The occupancy index of the individual. It is updated in place.
+    - turn (int): The Practical Turn of the blocks.
+    - day (int): The day of the blocks.
+    - block1 (int): The first block.
+    - block2 (int): The second block.
+    """
+    schedule = individual[turn][day]
+    subject1, subject2 = schedule[block1], schedule[block2]
+
+    update_occupancy_index(occupancy_index, day, block1, subject1, subject2)
+    update_occupancy_index(occupancy_index, day, block2, subject2, subject1)
+    schedule[block1], schedule[block2] = subject2, subject1
+
+
+def overlap_penalty(occupancy_index, weight=3):
+    """
+    Calculate the overlap penalty of an individual from its occupancy index, which is the same one
+    'fitness_individual' assigns: 'weight' points for every Practical Turn beyond the first with the same subject in
+    the same slot.
+
+    Parameters:
+    - occupancy_index (np.ndarray): The occupancy index of the individual.
+    - weight (int): The penalty of each overlap.
+
+    Returns:
+    - int: The overlap penalty.
+    """
+    subject_counts = occupancy_index[:, :, BREAK_CODE + 1:]
+    return int(weight * np.maximum(subject_counts - 1, 0).sum())
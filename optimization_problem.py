@@ -1,15 +1,30 @@
 # Import the necessary libraries and scripts
+import heapq
+import os
 import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from charles import copy_individual
+from constraints import make_objectives_evaluator
+from diversity import record_diversity
 from fitness import evaluate_population, fitness_sharing as apply_fitness_sharing
+from hall_of_fame import hall_of_fame_best, hall_of_fame_update
+from multi_objective import crowding_distance, fast_non_dominated_sort
+from neighbour_index import build_neighbour_index, nearest_neighbour, update_neighbour_index
+from population_index import individual_key, insert_unique
+from random_streams import bind_stream
+from trajectory import record_generation
 
 
 def evolve_population(population, selection_algorithm, crossover, pc, mutation, pm, generations,
-                      elitism=True, use_fitness_sharing=False):
+                      elitism=True, use_fitness_sharing=False, stats=None, eliminate_duplicates=False, immigrant=None,
+                      repair=None, evaluator=evaluate_population, recorder=None, elite_size=1, hall_of_fame=None,
+                      rng=None, stop_at_optimum=None, stop_event=None):
     """
     Using Genetic Algorithms and given a population, a selection algorithm, a crossover (and its probability of
-    happening), a mutation (and its probability of happening) and using elitism consisting of only 1 individual, evolve
-    the population and return the best individual. In other words, return the best weekly schedule for all Practical
-    Turns.
+    happening), a mutation (and its probability of happening) and using elitism consisting of the 'elite_size' best
+    individuals, evolve the population and return the best individual. In other words, return the best weekly schedule
+    for all Practical Turns.
 
     Parameters:
     - population (list): The population of individuals.
@@ -21,25 +36,75 @@ def evolve_population(population, selection_algorithm, crossover, pc, mutation,
     - generations (int): The number of generations to run the Genetic Algorithm
     - elitism (bool): A boolean True/False indicating whether to apply elitism in the Genetic Algorithm
     - use_fitness_sharing (bool): A boolean True/False indicating whether to apply fitness sharing in the GA
+    - stats (dict): If given, the diversity measures of the population (see 'diversity.population_diversity') are
+      appended to its 'diversity' list every generation, alongside the best fitness. When duplicates are eliminated,
+      the fraction of offspring that were duplicates is also appended to its 'duplicate_rate' list.
+    - eliminate_duplicates (bool): A boolean True/False indicating whether to replace offspring identical to an
+      individual already in the new population, using a population hash index
+    - immigrant (function): A function without arguments returning a new random individual, used to replace duplicates.
+      If None, duplicates are replaced with re-mutated copies of themselves.
+    - repair (function): A repair operator (see 'repair.py') applied to every offspring after crossover and mutation.
+      If None, no repair is applied.
+    - evaluator (function): The function computing the fitness scores of a list of individuals, e.g. a compiled
+      constraint evaluator (see 'constraints.make_population_evaluator').
+    - recorder (dict): If given, a trajectory recorder (see 'trajectory.open_trajectory_recorder') to which the initial
+      population and every new generation are appended, with their fitness scores and the provenance of every
+      individual.
+    - elite_size (int): Number of elite individuals kept in every generation when elitism is applied.
+    - hall_of_fame (dict): If given, a hall of fame (see 'hall_of_fame.create_hall_of_fame') updated with every
+      evaluated individual. The elite individuals beyond the best one of the population are then reinjected from it,
+      instead of being taken from the current population.
+    - rng (random.Random): The random stream that the Genetic Algorithm and its operators draw from (see
+      'random_streams.py'), so the run can be reproduced. If None, the global 'random' module is used.
+    - stop_at_optimum (bool): Whether to return as soon as a Global Optimum is selected as a parent. If None, the run
+      stops early only without a hall of fame, so a hall of fame can gather many distinct Global Optima in one run.
+    - stop_event (threading.Event): If given, the run stops before the next generation as soon as the event is set.
 
     Returns:
     - best_individual (list): The best individual found.
     - best_fitness_per_generation (list): Best fitness values for each generation.
     """
 
+    if stop_at_optimum is None:
+        stop_at_optimum = hall_of_fame is None
+
     best_individual = None
     best_fitness = float('inf')  # Since this is a minimization optimization problem
     best_fitness_per_generation = []
 
+    # Draw every random choice, of the Genetic Algorithm and of its operators, from the given stream
+    selection_algorithm, crossover, mutation = bind_stream(rng, selection_algorithm, crossover, mutation)
+    rng = random if rng is None else rng
+
     for generation in range(generations):
+        if stop_event is not None and stop_event.is_set():
+            break
+
         new_population = []
 
+        # Initialize the hash index of the new population and the count of duplicated offspring
+        population_index = set()
+        duplicates = 0
+
         # Evaluate the fitness of the current population
-        fitness_scores = evaluate_population(population)
+        fitness_scores = evaluator(population)
+
+        # Record the initial population
+        if recorder is not None and generation == 0:
+            record_generation(recorder, 0, population, fitness_scores)
+
+        # Archive the best distinct individuals of the initial population
+        if hall_of_fame is not None and generation == 0:
+            hall_of_fame_update(hall_of_fame, population, fitness_scores)
 
         # Apply fitness sharing if enabled
         if use_fitness_sharing:
-            fitness_scores = apply_fitness_sharing(population)
+            fitness_scores = apply_fitness_sharing(population, evaluator)
+
+        # Track where every individual of the new population comes from, if recording the trajectory
+        if recorder is not None:
+            parent_indexes = {id(individual): index for index, individual in enumerate(population)}
+            provenance = []
 
         # Apply elitism by keeping the best individual
         if elitism:
@@ -47,49 +112,787 @@ def evolve_population(population, selection_algorithm, crossover, pc, mutation,
             best_individual = population[best_index]
             best_fitness = fitness_scores[best_index]
             new_population.append(best_individual)
+            if eliminate_duplicates:
+                population_index.add(individual_key(best_individual))
+            if recorder is not None:
+                provenance.append((best_index, -1, 0, 0))
+
+            # Keep the next best individuals, from the hall of fame if given, or else from the current population
+            elites = []
+            if elite_size > 1 and hall_of_fame is not None:
+                best_key = individual_key(best_individual)
+                elites = [(elite, -1) for elite, _ in hall_of_fame_best(hall_of_fame, elite_size)
+                          if individual_key(elite) != best_key][:elite_size - 1]
+            elif elite_size > 1:
+                elite_indexes = heapq.nsmallest(elite_size, range(len(population)), key=fitness_scores.__getitem__)
+                elites = [(population[index], index) for index in elite_indexes if index != best_index][:elite_size - 1]
+
+            for elite, elite_index in elites:
+                new_population.append(elite)
+                if eliminate_duplicates:
+                    population_index.add(individual_key(elite))
+                if recorder is not None:
+                    provenance.append((elite_index, -1, 0, 0))
+
+        num_elites = len(new_population)
 
         while len(new_population) < len(population):
             # Selection
             parent1 = selection_algorithm(population, fitness_scores)
-            if parent1 in population and fitness_scores[population.index(parent1)] == 0:
+            if stop_at_optimum and parent1 in population and fitness_scores[population.index(parent1)] == 0:
                 # If a Global Optimum was selected, immediately return it
                 return parent1, best_fitness_per_generation
 
             parent2 = selection_algorithm(population, fitness_scores)
-            if parent2 in population and fitness_scores[population.index(parent2)] == 0:
+            if stop_at_optimum and parent2 in population and fitness_scores[population.index(parent2)] == 0:
                 # If a Global Optimum was selected, immediately return it
                 return parent2, best_fitness_per_generation
 
             # Crossover
-            if random.random() < pc:  # Crossover probability
+            crossed = rng.random() < pc  # Crossover probability
+            if crossed:
                 offspring1, offspring2 = crossover(parent1, parent2)
             else:
-                # If crossover does not happen, perform the replication of the parents into the offspring
-                offspring1, offspring2 = parent1, parent2
+                # If crossover does not happen, perform the replication of the parents into the offspring. Copies are
+                # needed since mutations work in place and must not change the parents, which may also be the elite
+                offspring1, offspring2 = copy_individual(parent1), copy_individual(parent2)
 
             # Mutation
-            if random.random() < pm:  # Mutation probability for offspring1
+            mutated1 = rng.random() < pm  # Mutation probability for offspring1
+            if mutated1:
                 offspring1 = mutation(offspring1)
-            if random.random() < pm:  # Mutation probability for offspring2
+            mutated2 = rng.random() < pm  # Mutation probability for offspring2
+            if mutated2:
                 offspring2 = mutation(offspring2)
 
+            # Repair
+            if repair is not None:
+                offspring1, offspring2 = repair(offspring1), repair(offspring2)
+
+            # Replace offspring that duplicate an individual already in the new population
+            if eliminate_duplicates:
+                offspring1, is_duplicate1 = insert_unique(population_index, offspring1, mutation, immigrant)
+                offspring2, is_duplicate2 = insert_unique(population_index, offspring2, mutation, immigrant)
+                duplicates += is_duplicate1 + is_duplicate2
+
             new_population.extend([offspring1, offspring2])
 
+            # Record the parents of the offspring and the operators applied to them
+            if recorder is not None:
+                parent1_index, parent2_index = parent_indexes.get(id(parent1), -1), parent_indexes.get(id(parent2), -1)
+                provenance.append((parent1_index, parent2_index, int(crossed), int(mutated1)))
+                provenance.append((parent2_index, parent1_index, int(crossed), int(mutated2)))
+
+        # Record the fraction of the offspring of this generation that were duplicates
+        if eliminate_duplicates and stats is not None:
+            num_offspring = len(new_population) - num_elites
+            stats.setdefault('duplicate_rate', []).append(duplicates / num_offspring)
+
         # Ensure new population size matches the original population size
         population = new_population[:len(population)]
 
         # Find the best individual in the current population
-        fitness_scores = evaluate_population(population)
+        fitness_scores = evaluator(population)
         current_best_index = fitness_scores.index(min(fitness_scores))
         current_best_fitness = fitness_scores[current_best_index]
 
+        # Archive the best distinct individuals of the new generation
+        if hall_of_fame is not None:
+            hall_of_fame_update(hall_of_fame, population, fitness_scores)
+
         if current_best_fitness < best_fitness:
             best_individual = population[current_best_index]
             best_fitness = current_best_fitness
 
         best_fitness_per_generation.append(best_fitness)
 
+        # Record the diversity of the population, if requested
+        if stats is not None:
+            record_diversity(stats, population)
+
+        # Record the new generation in the trajectory, if requested
+        if recorder is not None:
+            record_generation(recorder, generation + 1, population, fitness_scores, provenance[:len(population)])
+
+        # Print progress
+        print(f"Generation {generation + 1}: Best Fitness = {current_best_fitness}")
+
+    return best_individual, best_fitness_per_generation
+
+
+def breed_offspring(population, fitness_scores, selection_algorithm, crossover, pc, mutation, pm, repair=None,
+                    rng=None):
+    """
+    Breed two offspring from the population by applying selection, crossover and mutation once.
+
+    Parameters:
+    - population (list): The population of individuals to select the parents from.
+    - fitness_scores (list): The fitness scores of the individuals in the population.
+    - selection_algorithm (function): The selection algorithm to be used.
+    - crossover (function): The crossover operator to be used.
+    - pc (float): Crossover rate
+    - mutation (function): The mutation operator to be used.
+    - pm (float): Mutation rate
+    - repair (function): A repair operator applied to both offspring after mutation. If None, no repair is applied.
+    - rng (random.Random): The random stream that the breeding and the operators draw from (see 'random_streams.py').
+      If None, the global 'random' module is used.
+
+    Returns:
+    - offspring1 (list): The first offspring.
+    - offspring2 (list): The second offspring.
+    """
+    selection_algorithm, crossover, mutation = bind_stream(rng, selection_algorithm, crossover, mutation)
+    rng = random if rng is None else rng
+
+    # Selection
+    parent1 = selection_algorithm(population, fitness_scores)
+    parent2 = selection_algorithm(population, fitness_scores)
+
+    # Crossover
+    if rng.random() < pc:  # Crossover probability
+        offspring1, offspring2 = crossover(parent1, parent2)
+    else:
+        # If crossover does not happen, replicate the parents into the offspring. Copies are needed since mutations
+        # work in place and the parents must remain unchanged in the population
+        offspring1, offspring2 = copy_individual(parent1), copy_individual(parent2)
+
+    # Mutation
+    if rng.random() < pm:  # Mutation probability for offspring1
+        offspring1 = mutation(offspring1)
+    if rng.random() < pm:  # Mutation probability for offspring2
+        offspring2 = mutation(offspring2)
+
+    # Repair
+    if repair is not None:
+        offspring1, offspring2 = repair(offspring1), repair(offspring2)
+
+    return offspring1, offspring2
+
+
+def evolve_population_with_replacement(population, selection_algorithm, crossover, pc, mutation, pm, generations,
+                                       replacement='steady_state', offspring_size=None, stats=None, repair=None,
+                                       evaluator=evaluate_population, rng=None):
+    """
+    Evolve the population with an incremental replacement scheme instead of the generational one of
+    'evolve_population', and return the best individual.
+
+    The population lives in a preallocated buffer together with a fitness list kept in sync with it, so only the
+    offspring created in each generation need to be evaluated. The supported replacement schemes are:
+    - 'steady_state': each generation creates 'offspring_size' offspring (2 by default) which replace the worst
+      individuals of the population.
+    - 'mu_plus_lambda': each generation creates 'offspring_size' offspring (as many as the population by default) and
+      the best individuals among parents and offspring survive.
+    - 'mu_comma_lambda': each generation creates 'offspring_size' offspring (twice the population by default, and
+      never less than the population) and the best offspring survive, while all parents are discarded.
+
+    Parameters:
+    - population (list): The population of individuals.
+    - selection_algorithm (function): The selection algorithm to be used in the Genetic Algorithm.
+    - crossover (function): The crossover operator to be used in the Genetic Algorithm.
+    - pc (float): Crossover rate
+    - mutation (function): The mutation operator to be used in the Genetic Algorithm.
+    - pm (float): Mutation rate
+    - generations (int): The number of generations to run the Genetic Algorithm
+    - replacement (str): The replacement scheme, one of 'steady_state', 'mu_plus_lambda' or 'mu_comma_lambda'.
+    - offspring_size (int): The number of offspring created in each generation (lambda). If None, the default of the
+      chosen replacement scheme is used.
+    - stats (dict): If given, the diversity measures of the population are appended to its 'diversity' list every
+      generation.
+    - repair (function): A repair operator applied to every offspring after crossover and mutation. If None, no repair
+      is applied.
+    - evaluator (function): The function computing the fitness scores of a list of individuals, e.g. a compiled
+      constraint evaluator (see 'constraints.make_population_evaluator').
+    - rng (random.Random): The random stream that the Genetic Algorithm and its operators draw from (see
+      'random_streams.py'), so the run can be reproduced. If None, the global 'random' module is used.
+
+    Returns:
+    - best_individual (list): The best individual found.
+    - best_fitness_per_generation (list): Best fitness values for each generation.
+    """
+
+    mu = len(population)
+
+    # Set the default number of offspring per generation for the chosen replacement scheme
+    if replacement == 'steady_state':
+        offspring_size = 2 if offspring_size is None else offspring_size
+        if not 0 < offspring_size < mu:
+            raise ValueError("Steady-state replacement needs between 1 and population size - 1 offspring")
+    elif replacement == 'mu_plus_lambda':
+        offspring_size = mu if offspring_size is None else offspring_size
+    elif replacement == 'mu_comma_lambda':
+        offspring_size = 2 * mu if offspring_size is None else offspring_size
+        if offspring_size < mu:
+            raise ValueError("(mu, lambda) replacement needs at least as many offspring as the population size")
+    else:
+        raise ValueError(f"Unknown replacement scheme: {replacement}")
+
+    # Preallocate the population buffer. The steady-state scheme replaces individuals directly in the population,
+    # while the (mu + lambda) and (mu, lambda) schemes keep the parents in the first mu slots and write the offspring
+    # in the following lambda slots
+    buffer_size = mu if replacement == 'steady_state' else mu + offspring_size
+    population_buffer = list(population) + [None] * (buffer_size - mu)
+
+    # Evaluate the initial population once. From now on only the offspring are evaluated
+    fitness_buffer = evaluator(population) + [float('inf')] * (buffer_size - mu)
+
+    best_index = min(range(mu), key=fitness_buffer.__getitem__)
+    best_individual = population_buffer[best_index]
+    best_fitness = fitness_buffer[best_index]
+    best_fitness_per_generation = []
+
+    for generation in range(generations):
+
+        # If a Global Optimum is already in the population, immediately return it
+        if best_fitness == 0:
+            return best_individual, best_fitness_per_generation
+
+        # Keep references to the current parents, since the buffer slots may be overwritten while breeding
+        parents = population_buffer[:mu]
+        parents_fitness = fitness_buffer[:mu]
+
+        # Breed the offspring of this generation
+        offspring = []
+        while len(offspring) < offspring_size:
+            offspring.extend(breed_offspring(parents, parents_fitness, selection_algorithm, crossover, pc, mutation,
+                                             pm, repair, rng))
+        offspring = offspring[:offspring_size]
+
+        # Evaluate only the new offspring
+        offspring_fitness = evaluator(offspring)
+
+        if replacement == 'steady_state':
+            # Replace the worst individuals of the population with the offspring, in place
+            worst_indexes = heapq.nlargest(offspring_size, range(mu), key=fitness_buffer.__getitem__)
+            for index, child, child_fitness in zip(worst_indexes, offspring, offspring_fitness):
+                population_buffer[index] = child
+                fitness_buffer[index] = child_fitness
+
+        else:
+            # Write the offspring into their slots of the buffer
+            population_buffer[mu:] = offspring
+            fitness_buffer[mu:] = offspring_fitness
+
+            # Choose the survivors among parents and offspring, or among the offspring only, and move them, in place,
+            # into the first mu slots of the buffer
+            candidates = range(buffer_size) if replacement == 'mu_plus_lambda' else range(mu, buffer_size)
+            survivors = heapq.nsmallest(mu, candidates, key=fitness_buffer.__getitem__)
+            population_buffer[:mu] = [population_buffer[index] for index in survivors]
+            fitness_buffer[:mu] = [fitness_buffer[index] for index in survivors]
+
+        # Find the best individual in the current population
+        current_best_index = min(range(mu), key=fitness_buffer.__getitem__)
+        current_best_fitness = fitness_buffer[current_best_index]
+
+        if current_best_fitness < best_fitness:
+            best_individual = population_buffer[current_best_index]
+            best_fitness = current_best_fitness
+
+        best_fitness_per_generation.append(best_fitness)
+
+        # Record the diversity of the population, if requested
+        if stats is not None:
+            record_diversity(stats, population_buffer[:mu])
+
         # Print progress
         print(f"Generation {generation + 1}: Best Fitness = {current_best_fitness}")
 
     return best_individual, best_fitness_per_generation
+
+
+def evolve_population_rtr(population, selection_algorithm, crossover, pc, mutation, pm, generations, window_size=None,
+                          stats=None, repair=None, evaluator=evaluate_population, rng=None):
+    """
+    Evolve the population with restricted tournament replacement, a crowding scheme that preserves niches, and return
+    the best individual. Every offspring competes only with the individual most similar to it (by Hamming distance)
+    among a random window of the population, and replaces it if it is better. Unlike fitness sharing, which compares
+    all pairs of individuals, each generation costs O(population size x window size) distance computations, done with
+    a nearest-neighbour index of the compact schedules (see 'neighbour_index.py').
+
+    Parameters:
+    - population (list): The population of individuals.
+    - selection_algorithm (function): The selection algorithm to be used in the Genetic Algorithm.
+    - crossover (function): The crossover operator to be used in the Genetic Algorithm.
+    - pc (float): Crossover rate
+    - mutation (function): The mutation operator to be used in the Genetic Algorithm.
+    - pm (float): Mutation rate
+    - generations (int): The number of generations to run the Genetic Algorithm
+    - window_size (int): Number of random individuals each offspring is compared with. If None, 20 (or the population
+      size, if smaller).
+    - stats (dict): If given, the diversity measures of the population are appended to its 'diversity' list every
+      generation.
+    - repair (function): A repair operator applied to every offspring after crossover and mutation. If None, no repair
+      is applied.
+    - evaluator (function): The function computing the fitness scores of a list of individuals, e.g. a compiled
+      constraint evaluator (see 'constraints.make_population_evaluator').
+    - rng (random.Random): The random stream that the Genetic Algorithm and its operators draw from (see
+      'random_streams.py'), so the run can be reproduced. If None, the global 'random' module is used.
+
+    Returns:
+    - best_individual (list): The best individual found.
+    - best_fitness_per_generation (list): Best fitness values for each generation.
+    """
+
+    population = list(population)
+    window_size = min(len(population), 20 if window_size is None else window_size)
+
+    # Draw every random choice, of the Genetic Algorithm and of its operators, from the given stream
+    rng = random if rng is None else rng
+
+    # Evaluate the initial population once and index its schedules. From now on only the offspring are evaluated
+    fitness_scores = evaluator(population)
+    neighbour_index = build_neighbour_index(population)
+
+    best_index = fitness_scores.index(min(fitness_scores))
+    best_individual = population[best_index]
+    best_fitness = fitness_scores[best_index]
+    best_fitness_per_generation = []
+
+    for generation in range(generations):
+
+        # If a Global Optimum is already in the population, immediately return it
+        if best_fitness == 0:
+            return best_individual, best_fitness_per_generation
+
+        # Breed as many offspring as the population size from the current population, and evaluate them at once
+        parents, parents_fitness = list(population), list(fitness_scores)
+        offspring = []
+        while len(offspring) < len(population):
+            offspring.extend(breed_offspring(parents, parents_fitness, selection_algorithm, crossover, pc, mutation,
+                                             pm, repair, rng))
+        offspring = offspring[:len(population)]
+        offspring_fitness = evaluator(offspring)
+
+        # Every offspring replaces its nearest neighbour among a random window of the population, if it is better
+        for child, child_fitness in zip(offspring, offspring_fitness):
+            window = rng.sample(range(len(population)), window_size)
+            nearest_index, _ = nearest_neighbour(neighbour_index, child, window)
+
+            if child_fitness < fitness_scores[nearest_index]:
+                population[nearest_index] = child
+                fitness_scores[nearest_index] = child_fitness
+                update_neighbour_index(neighbour_index, nearest_index, child)
+
+                if child_fitness < best_fitness:
+                    best_individual = child
+                    best_fitness = child_fitness
+
+        best_fitness_per_generation.append(best_fitness)
+
+        # Record the diversity of the population, if requested
+        if stats is not None:
+            record_diversity(stats, population)
+
+        # Print progress
+        print(f"Generation {generation + 1}: Best Fitness = {min(fitness_scores)}")
+
+    return best_individual, best_fitness_per_generation
+
+
+def evolve_population_async(population, selection_algorithm, crossover, pc, mutation, pm, generations, workers=None,
+                            max_pending=None, executor=None, repair=None, evaluator=evaluate_population, rng=None):
+    """
+    Evolve the population with an asynchronous steady-state pipeline and return the best individual.
+
+    Breeding happens in the calling process while the offspring are streamed, in pairs, to a pool of evaluator
+    processes as soon as they are produced. Every evaluated pair enters the population right away by replacing its
+    worst individuals, so there is no generation barrier and the workers never wait for the slowest evaluation of a
+    generation. Parents are always selected from the population as it is at the time of breeding.
+
+    To keep the results comparable with 'evolve_population', the run evaluates 'generations' times the population size
+    offspring, and a "generation" is reported every time as many offspring as the population size have been inserted.
+
+    Since the evaluations run in other processes, scripts using this function must protect their entry point with
+    'if __name__ == "__main__":'.
+
+    Parameters:
+    - population (list): The population of individuals.
+    - selection_algorithm (function): The selection algorithm to be used in the Genetic Algorithm.
+    - crossover (function): The crossover operator to be used in the Genetic Algorithm.
+    - pc (float): Crossover rate
+    - mutation (function): The mutation operator to be used in the Genetic Algorithm.
+    - pm (float): Mutation rate
+    - generations (int): The number of generations to run the Genetic Algorithm
+    - workers (int): Number of evaluator processes. If None, the number of CPUs is used. When an executor is given, it
+      must be its number of workers, unless 'max_pending' is given.
+    - max_pending (int): Maximum number of offspring pairs being evaluated at the same time. If None, twice the number
+      of workers is used.
+    - executor (concurrent.futures.Executor): An already running pool to evaluate the offspring with. If None, a new
+      process pool is created for this run and shut down at the end.
+    - repair (function): A repair operator applied to every offspring after crossover and mutation. If None, no repair
+      is applied.
+    - evaluator (function): The function computing the fitness scores of a list of individuals, e.g. a compiled
+      constraint evaluator (see 'constraints.make_population_evaluator'). It must be picklable, to be sent to the
+      evaluator processes.
+    - rng (random.Random): The random stream that the Genetic Algorithm and its operators draw from (see
+      'random_streams.py'), so the run can be reproduced. If None, the global 'random' module is used.
+
+    Returns:
+    - best_individual (list): The best individual found.
+    - best_fitness_per_generation (list): Best fitness values for each generation.
+    """
+
+    mu = len(population)
+
+    # The size of a given pool can not be asked to it, so it must be given to bound the pending evaluations
+    if executor is not None and workers is None and max_pending is None:
+        raise ValueError("The number of workers of the given executor is needed, or 'max_pending'")
+
+    # Keep the population in place, with its fitness list kept in sync
+    population = list(population)
+    fitness_scores = evaluator(population)
+
+    best_index = fitness_scores.index(min(fitness_scores))
+    best_individual = population[best_index]
+    best_fitness = fitness_scores[best_index]
+    best_fitness_per_generation = []
+
+    # If a Global Optimum is already in the population, immediately return it
+    if best_fitness == 0:
+        return best_individual, best_fitness_per_generation
+
+    # Create the evaluator pool, unless one was given
+    own_executor = executor is None
+    if own_executor:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    total_evaluations = generations * mu
+    submitted = 0
+    inserted = 0
+    pending = {}  # Maps every running evaluation to the offspring it evaluates
+
+    try:
+        while inserted < total_evaluations:
+
+            # Keep the evaluator pool busy by streaming newly bred offspring pairs to it
+            while len(pending) < max_pending and submitted < total_evaluations:
+                offspring = breed_offspring(population, fitness_scores, selection_algorithm, crossover, pc, mutation,
+                                            pm, repair, rng)
+                pending[executor.submit(evaluator, offspring)] = offspring
+                submitted += len(offspring)
+
+            # Wait for any evaluation to finish and insert its offspring into the population
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                offspring = pending.pop(future)
+                for child, child_fitness in zip(offspring, future.result()):
+
+                    # Replace the worst individual of the population with the offspring
+                    worst_index = fitness_scores.index(max(fitness_scores))
+                    population[worst_index] = child
+                    fitness_scores[worst_index] = child_fitness
+
+                    if child_fitness < best_fitness:
+                        best_individual = child
+                        best_fitness = child_fitness
+
+                    # Record the best fitness every time a population's worth of offspring was inserted
+                    inserted += 1
+                    if inserted % mu == 0:
+                        best_fitness_per_generation.append(best_fitness)
+
+                        # Print progress
+                        print(f"Generation {inserted // mu}: Best Fitness = {best_fitness}")
+
+                # If a Global Optimum was found, immediately return it
+                if best_fitness == 0:
+                    return best_individual, best_fitness_per_generation
+
+    finally:
+        # Cancel the evaluations that are no longer needed and release the pool if it was created here
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return best_individual, best_fitness_per_generation
+
+
+def update_operator_probabilities(qualities, rewards, adaptation_rate, min_probability):
+    """
+    Update the quality estimates of a portfolio of operators with the rewards they earned in the last generation and
+    compute their new application probabilities (probability matching credit assignment).
+
+    Parameters:
+    - qualities (list): The current quality estimate of every operator. It is updated in place.
+    - rewards (list): For every operator, the list of rewards it earned in the last generation (may be empty).
+    - adaptation_rate (float): How fast the quality estimates follow the most recent rewards, between 0 and 1.
+    - min_probability (float): Minimum application probability of every operator, so that none is ever discarded.
+      The minimum probabilities of all operators must add up to at most 1.
+
+    Returns:
+    - list: The new application probability of every operator.
+    """
+    if min_probability * len(qualities) > 1:
+        raise ValueError(f"The minimum probability {min_probability} is too high for {len(qualities)} operators: "
+                         f"it must be at most {1 / len(qualities)}")
+
+    # Move the quality of every applied operator towards its average reward in the last generation
+    for index, operator_rewards in enumerate(rewards):
+        if operator_rewards:
+            average_reward = sum(operator_rewards) / len(operator_rewards)
+            qualities[index] += adaptation_rate * (average_reward - qualities[index])
+
+    # Share the probability that is not reserved by the minimum probabilities proportionally to the qualities
+    total_quality = sum(qualities)
+    free_probability = 1 - min_probability * len(qualities)
+    if total_quality == 0:
+        return [1 / len(qualities)] * len(qualities)
+
+    return [min_probability + free_probability * quality / total_quality for quality in qualities]
+
+
+def evolve_population_adaptive(population, selection_algorithm, crossovers, pc, mutations, pm, generations,
+                               elitism=True, adaptation_rate=0.3, min_probability=0.05, stats=None,
+                               evaluator=evaluate_population, rng=None):
+    """
+    Evolve the population with self-adaptive operator selection and return the best individual.
+
+    Instead of a single crossover and mutation, the Genetic Algorithm receives a portfolio of crossovers and mutations.
+    Every time an operator is applied, it is credited with the relative fitness improvement of the offspring over its
+    best parent, and after every generation the application probabilities of the operators are shifted towards the
+    ones that earned the most credit (probability matching).
+
+    Parameters:
+    - population (list): The population of individuals.
+    - selection_algorithm (function): The selection algorithm to be used in the Genetic Algorithm.
+    - crossovers (list): The crossover operators to choose from.
+    - pc (float): Crossover rate
+    - mutations (list): The mutation operators to choose from.
+    - pm (float): Mutation rate
+    - generations (int): The number of generations to run the Genetic Algorithm
+    - elitism (bool): A boolean True/False indicating whether to apply elitism in the Genetic Algorithm
+    - adaptation_rate (float): How fast the operator qualities follow the most recent rewards, between 0 and 1.
+    - min_probability (float): Minimum application probability of every operator, at most 1 / the number of operators
+      of the larger portfolio.
+    - stats (dict): If given, the application probabilities of the crossovers and mutations (in the order of the
+      portfolios) are appended to its 'crossover_probabilities' and 'mutation_probabilities' lists every generation,
+      and the diversity measures of the population to its 'diversity' list.
+    - evaluator (function): The function computing the fitness scores of a list of individuals, e.g. a compiled
+      constraint evaluator (see 'constraints.make_population_evaluator').
+    - rng (random.Random): The random stream that the Genetic Algorithm and its operators draw from (see
+      'random_streams.py'), so the run can be reproduced. If None, the global 'random' module is used.
+
+    Returns:
+    - best_individual (list): The best individual found.
+    - best_fitness_per_generation (list): Best fitness values for each generation.
+    """
+
+    # Check that the minimum probabilities of every portfolio leave a valid probability distribution
+    for operators in (crossovers, mutations):
+        if min_probability * len(operators) > 1:
+            raise ValueError(f"The minimum probability {min_probability} is too high for {len(operators)} operators: "
+                             f"it must be at most {1 / len(operators)}")
+
+    best_individual = None
+    best_fitness = float('inf')  # Since this is a minimization optimization problem
+    best_fitness_per_generation = []
+
+    # Start with uniform application probabilities and equal quality estimates for every operator
+    crossover_qualities = [1.0] * len(crossovers)
+    mutation_qualities = [1.0] * len(mutations)
+    crossover_probabilities = [1 / len(crossovers)] * len(crossovers)
+    mutation_probabilities = [1 / len(mutations)] * len(mutations)
+
+    # Draw every random choice, of the Genetic Algorithm and of its operators, from the given stream
+    selection_algorithm, = bind_stream(rng, selection_algorithm)
+    crossovers, mutations = bind_stream(rng, *crossovers), bind_stream(rng, *mutations)
+    rng = random if rng is None else rng
+
+    if stats is not None:
+        stats.setdefault('crossover_probabilities', [])
+        stats.setdefault('mutation_probabilities', [])
+
+    # Evaluate the fitness of the initial population
+    fitness_scores = evaluator(population)
+
+    for generation in range(generations):
+        new_population = []
+
+        # For every offspring, keep the fitness of its best parent and the operators that created it
+        parent_fitnesses = []
+        applied_crossovers = []
+        applied_mutations = []
+
+        # Look up the fitness of the selected parents by identity
+        fitness_by_id = {id(individual): fitness for individual, fitness in zip(population, fitness_scores)}
+
+        # Apply elitism by keeping the best individual
+        if elitism:
+            best_index = fitness_scores.index(min(fitness_scores))
+            best_individual = population[best_index]
+            best_fitness = fitness_scores[best_index]
+            new_population.append(best_individual)
+            parent_fitnesses.append(best_fitness)
+            applied_crossovers.append(None)
+            applied_mutations.append(None)
+
+        while len(new_population) < len(population):
+            # Selection
+            parent1 = selection_algorithm(population, fitness_scores)
+            parent2 = selection_algorithm(population, fitness_scores)
+            parents_best_fitness = min(fitness_by_id[id(parent1)], fitness_by_id[id(parent2)])
+
+            # If a Global Optimum was selected, immediately return it
+            if parents_best_fitness == 0:
+                return (parent1 if fitness_by_id[id(parent1)] == 0 else parent2), best_fitness_per_generation
+
+            # Crossover, with an operator chosen according to the current application probabilities
+            crossover_index = None
+            if rng.random() < pc:  # Crossover probability
+                crossover_index = rng.choices(range(len(crossovers)), weights=crossover_probabilities)[0]
+                offspring1, offspring2 = crossovers[crossover_index](parent1, parent2)
+            else:
+                # If crossover does not happen, perform the replication of the parents into the offspring
+                offspring1, offspring2 = copy_individual(parent1), copy_individual(parent2)
+
+            # Mutation, with an operator chosen according to the current application probabilities
+            for offspring in (offspring1, offspring2):
+                mutation_index = None
+                if rng.random() < pm:  # Mutation probability
+                    mutation_index = rng.choices(range(len(mutations)), weights=mutation_probabilities)[0]
+                    offspring = mutations[mutation_index](offspring)
+
+                new_population.append(offspring)
+                parent_fitnesses.append(parents_best_fitness)
+                applied_crossovers.append(crossover_index)
+                applied_mutations.append(mutation_index)
+
+        # Ensure new population size matches the original population size
+        population = new_population[:len(population)]
+        fitness_scores = evaluator(population)
+
+        # Credit every applied operator with the relative improvement of the offspring over its best parent
+        crossover_rewards = [[] for _ in crossovers]
+        mutation_rewards = [[] for _ in mutations]
+        for index, fitness in enumerate(fitness_scores):
+            if applied_crossovers[index] is None and applied_mutations[index] is None:
+                continue
+            reward = max(0.0, (parent_fitnesses[index] - fitness) / parent_fitnesses[index])
+            if applied_crossovers[index] is not None:
+                crossover_rewards[applied_crossovers[index]].append(reward)
+            if applied_mutations[index] is not None:
+                mutation_rewards[applied_mutations[index]].append(reward)
+
+        # Shift the application probabilities towards the operators that earned the most credit
+        crossover_probabilities = update_operator_probabilities(crossover_qualities, crossover_rewards,
+                                                                adaptation_rate, min_probability)
+        mutation_probabilities = update_operator_probabilities(mutation_qualities, mutation_rewards,
+                                                               adaptation_rate, min_probability)
+
+        if stats is not None:
+            stats['crossover_probabilities'].append(crossover_probabilities)
+            stats['mutation_probabilities'].append(mutation_probabilities)
+
+        # Find the best individual in the current population
+        current_best_index = fitness_scores.index(min(fitness_scores))
+        current_best_fitness = fitness_scores[current_best_index]
+
+        if current_best_fitness < best_fitness:
+            best_individual = population[current_best_index]
+            best_fitness = current_best_fitness
+
+        best_fitness_per_generation.append(best_fitness)
+
+        # Record the diversity of the population, if requested
+        if stats is not None:
+            record_diversity(stats, population)
+
+        # Print progress
+        print(f"Generation {generation + 1}: Best Fitness = {current_best_fitness}")
+
+    return best_individual, best_fitness_per_generation
+
+
+def evolve_population_nsga2(population, selection_algorithm, crossover, pc, mutation, pm, generations,
+                            objectives_evaluator=None, repair=None, stats=None, rng=None):
+    """
+    Evolve the population in multi-objective mode (NSGA-II) and return the Pareto front of the final population.
+
+    Instead of collapsing the penalties into one weighted score, every individual is evaluated on a vector of penalty
+    components. Parents and offspring are sorted into non-dominated fronts, and the survivors are chosen by front and,
+    within the last front, by crowding distance, so the final Pareto front spreads over the possible trade-offs.
+
+    The selection algorithm receives, as fitness scores, (front, -crowding distance) pairs, where lower is better. It
+    must therefore only compare fitness scores, as 'tournament_selection' and 'ranking_selection' do.
+
+    Parameters:
+    - population (list): The population of individuals.
+    - selection_algorithm (function): The selection algorithm to be used in the Genetic Algorithm.
+    - crossover (function): The crossover operator to be used in the Genetic Algorithm.
+    - pc (float): Crossover rate
+    - mutation (function): The mutation operator to be used in the Genetic Algorithm.
+    - pm (float): Mutation rate
+    - generations (int): The number of generations to run the Genetic Algorithm
+    - objectives_evaluator (function): A function returning the array of objectives of a list of individuals (see
+      'constraints.make_objectives_evaluator'). If None, the overlap, break placement, missing break and quota
+      shortfall penalties of the default constraints are used.
+    - repair (function): A repair operator applied to every offspring after crossover and mutation. If None, no repair
+      is applied.
+    - stats (dict): If given, the size of the Pareto front is appended to its 'pareto_front_size' list every
+      generation.
+    - rng (random.Random): The random stream that the Genetic Algorithm and its operators draw from (see
+      'random_streams.py'), so the run can be reproduced. If None, the global 'random' module is used.
+
+    Returns:
+    - pareto_front (list): The distinct individuals of the Pareto front of the final population.
+    - pareto_objectives (np.ndarray): The objectives of the individuals of the Pareto front.
+    """
+
+    if objectives_evaluator is None:
+        objectives_evaluator = make_objectives_evaluator()
+
+    mu = len(population)
+    population = list(population)
+
+    # Evaluate and sort the initial population
+    objectives = np.asarray(objectives_evaluator(population))
+    ranks = fast_non_dominated_sort(objectives)
+    crowding = crowding_distance(objectives, ranks)
+
+    for generation in range(generations):
+
+        # The selection algorithm compares individuals by front first, and then prefers the less crowded ones
+        selection_keys = list(zip(ranks.tolist(), (-crowding).tolist()))
+
+        # Breed as many offspring as the population size
+        offspring = []
+        while len(offspring) < mu:
+            offspring.extend(breed_offspring(population, selection_keys, selection_algorithm, crossover, pc, mutation,
+                                             pm, repair, rng))
+        offspring = offspring[:mu]
+
+        # Sort parents and offspring together into fronts, and keep the best mu by front and crowding distance
+        combined = population + offspring
+        combined_objectives = np.vstack([objectives, objectives_evaluator(offspring)])
+        combined_ranks = fast_non_dominated_sort(combined_objectives)
+        combined_crowding = crowding_distance(combined_objectives, combined_ranks)
+        survivors = np.lexsort((-combined_crowding, combined_ranks))[:mu]
+
+        population = [combined[index] for index in survivors]
+        objectives = combined_objectives[survivors]
+        ranks = combined_ranks[survivors]
+        crowding = combined_crowding[survivors]
+
+        front_size = int((ranks == 0).sum())
+        if stats is not None:
+            stats.setdefault('pareto_front_size', []).append(front_size)
+
+        # Print progress
+        print(f"Generation {generation + 1}: Pareto Front Size = {front_size}, "
+              f"Best Total Penalty = {objectives.sum(axis=1).min()}")
+
+    # Return the distinct individuals of the Pareto front
+    pareto_front = []
+    pareto_objectives = []
+    seen = set()
+    for index in np.flatnonzero(ranks == 0):
+        key = individual_key(population[index])
+        if key not in seen:
+            seen.add(key)
+            pareto_front.append(population[index])
+            pareto_objectives.append(objectives[index])
+
+    return pareto_front, np.array(pareto_objectives)
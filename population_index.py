@@ -0,0 +1,53 @@
+# Import the necessary scripts
+from charles import copy_individual
+
+
+def individual_key(individual):
+    """
+    Build a hashable key of an individual, so that identical schedules always have the same key.
+
+    Parameters:
+    - individual (list): The individual (schedule) to build the key of.
+
+    Returns:
+    - tuple: The blocks of the individual, flattened over Practical Turns, days and blocks.
+    """
+    return tuple(block for turn in individual for day in turn for block in day)
+
+
+def insert_unique(population_index, individual, mutation, immigrant=None, max_attempts=5):
+    """
+    Insert an individual into a population hash index, replacing it first if an identical individual is already in
+    the index. Checking and inserting take O(1) time on average, besides building the key.
+
+    A duplicate is replaced with a fresh random immigrant, if an immigrant function is given, or otherwise with a
+    re-mutated copy of itself. If no distinct replacement is found after 'max_attempts' tries, the last one is kept.
+
+    Parameters:
+    - population_index (set): The keys of the individuals already in the population. It is updated in place.
+    - individual (list): The individual to be inserted.
+    - mutation (function): The mutation operator used to re-mutate duplicates.
+    - immigrant (function): A function without arguments that returns a new random individual. If None, duplicates are
+      replaced with re-mutated copies.
+    - max_attempts (int): Maximum number of replacements tried for a duplicate.
+
+    Returns:
+    - individual (list): The inserted individual, which is either the given one or its replacement.
+    - is_duplicate (bool): Whether the given individual was a duplicate.
+    """
+    key = individual_key(individual)
+    is_duplicate = key in population_index
+
+    attempts = 0
+    while key in population_index and attempts < max_attempts:
+        # Replace the duplicate with a random immigrant or with a re-mutated copy of itself
+        if immigrant is not None:
+            individual = immigrant()
+        else:
+            individual = mutation(copy_individual(individual))
+        key = individual_key(individual)
+        attempts += 1
+
+    population_index.add(key)
+
+    return individual, is_duplicate
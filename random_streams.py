@@ -0,0 +1,74 @@
+# Import the necessary libraries
+import functools
+import random
+import numpy as np
+
+
+def create_stream(seed=None, *key):
+    """
+    Create a random stream, a 'random.Random' generator that the Genetic Algorithm operators draw from instead of the
+    global 'random' module (see their 'rng' parameter).
+
+    The streams are derived with numpy's SeedSequence, so the stream of every key of a seed is statistically
+    independent of the streams of all the other keys: each trial, island or worker can get its own stream, e.g.
+    'create_stream(seed, trial)', and the results do not depend on the order in which the streams are used, nor on the
+    process they are used in.
+
+    Parameters:
+    - seed (int): The root seed. If None, fresh entropy from the operating system is used.
+    - key (int): The position of the stream under the root seed, e.g. the trial number, or the island and worker
+      numbers. The same seed and key always give the same stream.
+
+    Returns:
+    - random.Random: The random stream.
+    """
+    seed_sequence = np.random.SeedSequence(seed, spawn_key=key)
+    return random.Random(int.from_bytes(seed_sequence.generate_state(4).tobytes(), 'little'))
+
+
+def spawn_streams(seed, num_streams):
+    """
+    Create independent random streams, e.g. one per trial or island (see 'create_stream').
+
+    Parameters:
+    - seed (int): The root seed. If None, fresh entropy from the operating system is used.
+    - num_streams (int): Number of streams.
+
+    Returns:
+    - list: The random streams, stream i being 'create_stream(seed, i)'.
+    """
+    seed = np.random.SeedSequence(seed).entropy
+    return [create_stream(seed, index) for index in range(num_streams)]
+
+
+def batch_generator(rng=None):
+    """
+    Derive a numpy generator from a random stream, for vectorized batch draws (e.g. in
+    'charles.initialize_population_array'). The generator is seeded with bits drawn from the stream, so it is as
+    reproducible as the stream itself.
+
+    Parameters:
+    - rng (random.Random): The random stream. If None, the global 'random' module is drawn from.
+
+    Returns:
+    - np.random.Generator: The numpy generator.
+    """
+    rng = random if rng is None else rng
+    return np.random.default_rng(rng.getrandbits(128))
+
+
+def bind_stream(rng, *operators):
+    """
+    Bind a random stream to operators accepting an 'rng' parameter, so the code calling them does not need to pass it.
+
+    Parameters:
+    - rng (random.Random): The random stream. If None, the operators are returned unchanged and keep drawing from the
+      global 'random' module.
+    - operators (function): The operators (selection algorithms, crossovers, mutations).
+
+    Returns:
+    - list: The operators, in the same order.
+    """
+    if rng is None:
+        return list(operators)
+    return [functools.partial(operator, rng=rng) for operator in operators]
@@ -0,0 +1,143 @@
+# Import the necessary libraries and scripts
+import numpy as np
+from charles import BLOCK_NAMES, BREAK_CODE, decode_individual, encode_individual
+from occupancy import build_occupancy_index, has_conflict, swap_blocks, swap_is_conflict_free
+
+
+def overlap_repair(individual):
+    """
+    Resolve overlaps of an individual directly, instead of waiting for the stochastic search to find them.
+    Every subject that overlaps with the same subject of another Practical Turn is swapped, within its day, with
+    another subject of its Practical Turn whenever neither of them overlaps after the swap. Only subject blocks are
+    swapped, so the weekly number of blocks of every subject and the position of the 'Break' blocks are unchanged, and
+    the penalty of the individual never increases.
+
+    Parameters:
+    - individual (list): The individual to be repaired. It is changed in place.
+
+    Returns:
+    - individual (list): The repaired individual.
+    """
+
+    # Build the occupancy index of the individual once, and keep it in sync with every swap
+    occupancy_index = build_occupancy_index(individual)
+
+    # Iterates over all blocks of all days of all Practical Turns
+    for turn_index, practical_turn in enumerate(individual):
+        for day_index, day_schedule in enumerate(practical_turn):
+            for block_index, subject in enumerate(day_schedule):
+
+                # Skip blocks without an overlap
+                if not has_conflict(occupancy_index, day_index, block_index, subject):
+                    continue
+
+                # Look for another subject block of the day to swap with, so that neither of them overlaps
+                for other_index, other_subject in enumerate(day_schedule):
+                    if (other_subject != 'Break' and other_subject != subject
+                            and swap_is_conflict_free(occupancy_index, day_index, block_index, subject, other_index,
+                                                      other_subject)):
+                        swap_blocks(individual, occupancy_index, turn_index, day_index, block_index, other_index)
+                        break
+
+    return individual
+
+
+def repair_population_array(encoded_population, preferred_break_blocks=(3, 4), min_blocks_per_subject=8):
+    """
+    Greedily remove the penalties that come from the structure of the schedules, for a whole compact population at
+    once, in time linear in the size of the population:
+    - Days without a 'Break' get one in the first preferred break block.
+    - 'Break' blocks outside the preferred break blocks are moved into them, as long as they hold subjects.
+    - Subjects of a Practical Turn with fewer than 'min_blocks_per_subject' blocks per week get more blocks, taken
+      from the extra 'Break' blocks that could not be moved into the preferred ones and from the blocks of subjects
+      with more weekly blocks than needed.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer, of shape (individuals, Practical Turns, days,
+      blocks). It is repaired in place.
+    - preferred_break_blocks (tuple): The blocks (0-based) where 'Break' blocks are not penalized.
+    - min_blocks_per_subject (int): Minimum number of blocks each subject of a Practical Turn must have in a week.
+
+    Returns:
+    - np.ndarray: The repaired population buffer.
+    """
+    pop_size, num_turns, num_days, num_blocks = encoded_population.shape
+    num_values = len(BLOCK_NAMES)
+    preferred_break_blocks = list(preferred_break_blocks)
+
+    # Order the blocks of a day with the preferred break blocks first
+    other_blocks = [block for block in range(num_blocks) if block not in preferred_break_blocks]
+    block_order = np.array(preferred_break_blocks + other_blocks)
+
+    # Days without any 'Break' get one in the first preferred break block
+    days = encoded_population.reshape(-1, num_blocks)
+    is_break = days == BREAK_CODE
+    days[~is_break.any(axis=1), preferred_break_blocks[0]] = BREAK_CODE
+    is_break = days == BREAK_CODE
+
+    # Move the 'Break' blocks of every day, in their order, into the blocks of the day taken in 'block_order', so the
+    # preferred blocks receive them first. Sorting is stable, so the subjects keep their relative order
+    breaks_first = np.argsort(~is_break, axis=1, kind='stable')
+    repaired_days = np.empty_like(days)
+    repaired_days[:, block_order] = np.take_along_axis(days, breaks_first, axis=1)
+    days[:] = repaired_days
+
+    # Work with one row per block position of the week and one column per Practical Turn of the population, so every
+    # step below is a vector operation over the whole population
+    turns = encoded_population.reshape(pop_size * num_turns, num_days * num_blocks)
+    num_rows, turn_length = turns.shape
+    columns = np.arange(num_rows)
+    blocks_by_position = turns.T.astype(np.intp)
+
+    # Rank every block among the previous blocks of its Practical Turn with the same value, and count the weekly blocks
+    # of every value
+    counts = np.zeros((num_rows, num_values), dtype=np.intp)
+    ranks = np.empty_like(blocks_by_position)
+    for position, values in enumerate(blocks_by_position):
+        ranks[position] = counts[columns, values]
+        counts[columns, values] += 1
+
+    # Blocks that can be given to a subject with a shortfall: the 'Break' blocks outside the preferred blocks, which
+    # can only remain when the day has more breaks than preferred blocks, so the day keeps a 'Break', and the blocks of
+    # a subject beyond its first 'min_blocks_per_subject' ones
+    is_extra_break = np.zeros((num_days, num_blocks), dtype=bool)
+    is_extra_break[:, other_blocks] = True
+    is_source = np.where(blocks_by_position == BREAK_CODE, is_extra_break.reshape(-1, 1),
+                         ranks >= min_blocks_per_subject)
+
+    # Weekly shortfall of every subject present in the Practical Turn
+    deficit = np.where(counts > 0, np.clip(min_blocks_per_subject - counts, 0, None), 0)
+    deficit[:, BREAK_CODE] = 0
+
+    # The missing blocks of every Practical Turn, listed subject after subject, are given in order to its source blocks.
+    # The subject of the j-th missing block is found by searching j in the cumulative shortfalls of the Practical Turn,
+    # offset per Practical Turn so that a single search covers the whole population
+    source_rank = np.cumsum(is_source, axis=0) - 1
+    cumulative_deficit = np.cumsum(deficit.T, axis=0).T
+    offset = int(cumulative_deficit[:, -1].max(initial=0)) + 1
+    is_repaired = is_source & (source_rank < cumulative_deficit[:, -1])
+    positions, repaired_columns = np.nonzero(is_repaired)
+    subjects = np.searchsorted((cumulative_deficit + (columns * offset)[:, None]).ravel(),
+                               source_rank[positions, repaired_columns] + repaired_columns * offset, side='right')
+    turns[repaired_columns, positions] = subjects - repaired_columns * num_values
+
+    return encoded_population
+
+
+def break_and_quota_repair(individual, preferred_break_blocks=(3, 4), min_blocks_per_subject=8):
+    """
+    Repair the break placement and the weekly subject quotas of a single individual, as 'repair_population_array'
+    does for a whole population. It has the same signature as the mutation operators, so it can be used as the repair
+    stage of the Genetic Algorithm.
+
+    Parameters:
+    - individual (list): The individual to be repaired.
+    - preferred_break_blocks (tuple): The blocks (0-based) where 'Break' blocks are not penalized.
+    - min_blocks_per_subject (int): Minimum number of blocks each subject of a Practical Turn must have in a week.
+
+    Returns:
+    - list: The repaired individual.
+    """
+    encoded_population = encode_individual(individual)[None]
+    repair_population_array(encoded_population, preferred_break_blocks, min_blocks_per_subject)
+    return decode_individual(encoded_population[0])
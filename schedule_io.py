@@ -0,0 +1,220 @@
+# Import the necessary libraries and scripts
+import ast
+import csv
+import itertools
+import json
+import os
+import numpy as np
+from charles import BLOCK_CODES, BLOCK_NAMES, encode_population
+
+# Names of the week days, in the order of the days of a schedule
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def schedule_columns(days_per_week, blocks_per_day):
+    """
+    Build the names of the block columns of an exported schedule, as in 'best_individual.xlsx': from 'Monday_Block1'
+    to the last block of the last day.
+
+    Parameters:
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+
+    Returns:
+    - list: The column names.
+    """
+    return [f"{day}_Block{block + 1}" for day in DAY_NAMES[:days_per_week] for block in range(blocks_per_day)]
+
+
+def iter_schedule_rows(schedules, chunk_size=1000):
+    """
+    Stream the rows of one or many schedules, one row per Practical Turn, encoding and decoding them in chunks so the
+    memory used does not depend on the number of schedules.
+
+    Parameters:
+    - schedules (iterable): The individuals (schedules) to export. It may be a generator.
+    - chunk_size (int): Number of schedules converted at once.
+
+    Yields:
+    - tuple: The schedule number, the Practical Turn number (both starting at 1) and the list of blocks of the Practical
+      Turn, day after day.
+    """
+    block_names = np.array(BLOCK_NAMES, dtype=object)
+    schedules = iter(schedules)
+    first_schedule = 0
+
+    while True:
+        chunk = list(itertools.islice(schedules, chunk_size))
+        if not chunk:
+            return
+
+        # Flatten the days of every Practical Turn of the chunk with a single lookup
+        encoded_chunk = encode_population(chunk)
+        rows = block_names[encoded_chunk.reshape(len(chunk), encoded_chunk.shape[1], -1)].tolist()
+
+        for schedule_index, turns in enumerate(rows):
+            for turn_index, blocks in enumerate(turns):
+                yield first_schedule + schedule_index + 1, turn_index + 1, blocks
+        first_schedule += len(chunk)
+
+
+def export_schedules(schedules, file_path, chunk_size=1000):
+    """
+    Export one or many schedules to a CSV, JSON Lines or XLSX file, chosen by the file extension. Every Practical Turn
+    of every schedule is a row with the schedule and Practical Turn numbers and its blocks (one column per block of
+    the week in CSV and XLSX, and a list of days in JSON Lines). The schedules are written as they are read, in chunks,
+    so thousands of schedules can be exported with flat memory use.
+
+    Parameters:
+    - schedules (iterable): The individuals (schedules) to export, e.g. the best individuals of the experiments or the
+      individuals of a hall of fame. It may be a generator.
+    - file_path (str): The path of the file, ending in '.csv', '.jsonl' or '.xlsx'.
+    - chunk_size (int): Number of schedules converted at once.
+
+    Returns:
+    - int: The number of schedules exported.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in ('.csv', '.jsonl', '.xlsx'):
+        raise ValueError(f"Unsupported file format: {extension}. Use '.csv', '.jsonl' or '.xlsx'")
+
+    # Peek at the first schedule to know the size of the week
+    schedules = iter(schedules)
+    first = next(schedules, None)
+    if first is None:
+        return 0
+    days_per_week, blocks_per_day = len(first[0]), len(first[0][0])
+    header = ['schedule', 'turn'] + schedule_columns(days_per_week, blocks_per_day)
+    rows = iter_schedule_rows(itertools.chain([first], schedules), chunk_size)
+    num_schedules = 0
+
+    if extension == '.csv':
+        with open(file_path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for schedule, turn, blocks in rows:
+                writer.writerow([schedule, turn] + blocks)
+                num_schedules = schedule
+
+    elif extension == '.jsonl':
+        with open(file_path, 'w') as file:
+            for schedule, turn, blocks in rows:
+                days = [blocks[day * blocks_per_day:(day + 1) * blocks_per_day] for day in range(days_per_week)]
+                file.write(json.dumps({'schedule': schedule, 'turn': turn, 'days': days}) + '\n')
+                num_schedules = schedule
+
+    else:
+        # Import here, since openpyxl is only needed for Excel files. The write-only mode streams the rows to the file
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Schedules')
+        sheet.append(header)
+        for schedule, turn, blocks in rows:
+            sheet.append([schedule, turn] + blocks)
+            num_schedules = schedule
+        workbook.save(file_path)
+
+    print(f"{num_schedules} schedules exported to {file_path}")
+    return num_schedules
+
+
+def iter_table_rows(file_path):
+    """
+    Stream the rows of an exported CSV or XLSX file, one Practical Turn at a time. Files with a single schedule and a
+    'Turn k' label in the first column, like 'best_individual.xlsx', are also supported.
+
+    Parameters:
+    - file_path (str): The path of the file.
+
+    Yields:
+    - tuple: The schedule number and the days of the next Practical Turn, each a list of block names.
+    """
+    if file_path.lower().endswith('.csv'):
+        file = open(file_path, 'r', newline='')
+        rows = csv.reader(file)
+    else:
+        # Import here, since openpyxl is only needed for Excel files. The read-only mode streams the rows of the file
+        from openpyxl import load_workbook
+        file = load_workbook(file_path, read_only=True)
+        rows = file.worksheets[0].iter_rows(values_only=True)
+
+    try:
+        # Find the size of the week from the block columns, named '<Day>_Block<k>'
+        header = list(next(rows))
+        has_schedule_column = header[0] == 'schedule'
+        block_columns = header[2:] if has_schedule_column else header[1:]
+        blocks_per_day = len(block_columns) // len({column.split('_')[0] for column in block_columns})
+
+        for row in rows:
+            schedule, blocks = (int(row[0]), list(row[2:])) if has_schedule_column else (1, list(row[1:]))
+            yield schedule, [blocks[start:start + blocks_per_day] for start in range(0, len(blocks), blocks_per_day)]
+    finally:
+        file.close()
+
+
+def iter_import_schedules(file_path):
+    """
+    Stream the schedules of a file written by 'export_schedules' back into the representation used by the Genetic
+    Algorithm, one schedule at a time, so files with many schedules can be imported with flat memory use.
+
+    Parameters:
+    - file_path (str): The path of the file, ending in '.csv', '.jsonl' or '.xlsx'.
+
+    Yields:
+    - list: The next individual, as a list of Practical Turns, each a list of days, each a list of block names.
+    """
+    if file_path.lower().endswith('.jsonl'):
+        with open(file_path, 'r') as file:
+            turns = ((turn['schedule'], turn['days']) for turn in map(json.loads, file))
+            for _, schedule_turns in itertools.groupby(turns, key=lambda turn: turn[0]):
+                yield [days for _, days in schedule_turns]
+    else:
+        for _, schedule_turns in itertools.groupby(iter_table_rows(file_path), key=lambda turn: turn[0]):
+            yield [days for _, days in schedule_turns]
+
+
+def import_schedules(file_path):
+    """
+    Import all schedules of a file written by 'export_schedules' (see 'iter_import_schedules'), checking that every
+    block is a known block name.
+
+    Parameters:
+    - file_path (str): The path of the file, ending in '.csv', '.jsonl' or '.xlsx'.
+
+    Returns:
+    - list: The individuals of the file.
+    """
+    schedules = []
+    for individual in iter_import_schedules(file_path):
+        for turn in individual:
+            for day in turn:
+                for block in day:
+                    if block not in BLOCK_CODES:
+                        raise ValueError(f"Unknown block in {file_path}: {block}")
+        schedules.append(individual)
+    return schedules
+
+
+def iter_text_schedules(file_path):
+    """
+    Stream the schedules written as Python literals in the text outputs of the experiments ('experiment_results.txt'
+    and 'set_of_global_optima.txt'), e.g. to export them with 'export_schedules'.
+
+    Parameters:
+    - file_path (str): The path of the text file.
+
+    Yields:
+    - list: The next individual in the file.
+    """
+    with open(file_path, 'r') as file:
+        for line in file:
+            for prefix in ('Overall Best Individual: ', 'Individual: '):
+                if line.startswith(prefix):
+                    yield ast.literal_eval(line[len(prefix):].strip())
+                    break
+
+
+if __name__ == "__main__":
+    # Export the global optima found by the experiments to every supported format
+    for extension in ['csv', 'jsonl', 'xlsx']:
+        export_schedules(iter_text_schedules('set_of_global_optima.txt'), f"global_optima.{extension}")
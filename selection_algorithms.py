@@ -2,7 +2,7 @@
 import random
 
 
-def fitness_proportionate_selection(population, fitness_scores):
+def fitness_proportionate_selection(population, fitness_scores, rng=None):
     """
     Selects an individual from the population based on fitness proportionate selection
     for this minimization problem.
@@ -10,10 +10,13 @@ def fitness_proportionate_selection(population, fitness_scores):
     Parameters:
     - population (list): The population of individuals.
     - fitness_scores (list): The corresponding fitness scores for each individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - Individual: A randomly selected individual based on fitness proportionality.
     """
+    rng = random if rng is None else rng
 
     # Check for global optimum individual. If found, immediately return it
     for individual, fitness in zip(population, fitness_scores):
@@ -27,20 +30,23 @@ def fitness_proportionate_selection(population, fitness_scores):
     selection_probs = [(1.0 / f) / total_fitness for f in fitness_scores]
 
     # Select the chosen individual
-    return random.choices(population, weights=selection_probs, k=1)[0]
+    return rng.choices(population, weights=selection_probs, k=1)[0]
 
 
-def ranking_selection(population, fitness_scores):
+def ranking_selection(population, fitness_scores, rng=None):
     """
     Selects an individual using ranking selection for this minimization problem.
 
     Parameters:
     - population (list): The population of individuals.
     - fitness_scores (list): The corresponding fitness scores for each individual.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - Individual: A randomly selected individual based on ranking.
     """
+    rng = random if rng is None else rng
 
     # Check for global optimum individual. If found, immediately return it
     for individual, fitness in zip(population, fitness_scores):
@@ -58,14 +64,14 @@ def ranking_selection(population, fitness_scores):
 
     # Calculate the probability of selecting every individual, given that this is a minimization optimization problem
     selection_probs = [weight / total_weight for weight in rank_position]
-    selected_individuals = random.choices([individual for individual, score in ranked_individuals],
-                                          weights=selection_probs, k=1)
+    selected_individuals = rng.choices([individual for individual, score in ranked_individuals],
+                                       weights=selection_probs, k=1)
 
     # Select the chosen individual
     return selected_individuals[0]
 
 
-def tournament_selection(population, fitness_scores, tournament_size=3):
+def tournament_selection(population, fitness_scores, tournament_size=3, rng=None):
     """
     Selects an individual using tournament selection for this minimization problem.
 
@@ -73,12 +79,16 @@ def tournament_selection(population, fitness_scores, tournament_size=3):
     - population (list): The population of individuals.
     - fitness_scores (list): The corresponding fitness scores for each individual.
     - tournament_size (int): The number of individuals in each tournament.
+    - rng (random.Random): The random stream to draw from (see 'random_streams.py'). If None, the global 'random'
+      module is used.
 
     Returns:
     - Individual: The best individual (with the lowest fitness) from the randomly selected tournament group.
     """
+    rng = random if rng is None else rng
+
     # Randomly select the individuals that will be competing in the tournament (with repetition)
-    tournament = random.choices(list(zip(population, fitness_scores)), k=tournament_size)
+    tournament = rng.choices(list(zip(population, fitness_scores)), k=tournament_size)
 
     # Select the individual with the lowest fitness (the best individual) within the tournament
     winner = min(tournament, key=lambda x: x[1])
@@ -0,0 +1,323 @@
+# Import the necessary libraries and scripts
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from constraints import make_population_evaluator
+from experiments import CROSSOVERS, MUTATIONS, SELECTION_ALGORITHMS
+from fitness import evaluate_population
+from random_streams import create_stream
+from solver import iter_solve
+
+# Operators that solve requests can name, by name
+SELECTION_ALGORITHMS_BY_NAME = {selection_algorithm.__name__: selection_algorithm
+                                for selection_algorithm in SELECTION_ALGORITHMS}
+CROSSOVERS_BY_NAME = {name: crossover for crossover, name in CROSSOVERS}
+MUTATIONS_BY_NAME = {name: mutation for mutation, name in MUTATIONS}
+
+
+def create_service(workers=None, max_concurrent_jobs=2):
+    """
+    Create the state of a long-lived solver service: a pool of evaluator processes started (and warmed up) once and
+    shared by every job, the registered instances and the jobs.
+
+    Jobs are started in the order they are submitted, at most 'max_concurrent_jobs' at a time, and every running job
+    may only keep its equal share of the evaluator processes busy, so a long job can not starve the others.
+
+    Parameters:
+    - workers (int): Number of evaluator processes. If None, one per CPU.
+    - max_concurrent_jobs (int): Maximum number of jobs running at the same time.
+
+    Returns:
+    - dict: The state of the service.
+    """
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    # Start every evaluator process now, so the first job does not pay for it
+    list(executor.map(evaluate_population, [[] for _ in range(workers)]))
+
+    return {
+        'executor': executor,
+        'workers': workers,
+        'job_runner': ThreadPoolExecutor(max_workers=max_concurrent_jobs),
+        'workers_per_job': max(1, workers // max_concurrent_jobs),
+        'instances': {},
+        'jobs': {},
+        'job_ids': itertools.count(1),
+        'lock': threading.Lock()
+    }
+
+
+def register_instance(service, name, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day,
+                      constraints=None):
+    """
+    Register an instance of the scheduling problem, compiling its constraints once for all the jobs solving it.
+
+    Parameters:
+    - service (dict): The state of the service.
+    - name (str): The name the instance is requested by.
+    - num_practical_turns (int): Number of Practical Turns.
+    - subjects_per_practical_turn (int): Number of subjects each Practical Turn is enrolled in.
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+    - constraints (dict): The constraint specification (see 'constraints.DEFAULT_CONSTRAINTS'). If None, the default
+      fitness function is used.
+    """
+    evaluator = evaluate_population if constraints is None else \
+        make_population_evaluator(constraints, blocks_per_day, days_per_week)
+
+    service['instances'][name] = {
+        'num_practical_turns': num_practical_turns,
+        'subjects_per_practical_turn': subjects_per_practical_turn,
+        'days_per_week': days_per_week,
+        'blocks_per_day': blocks_per_day,
+        'evaluator': evaluator
+    }
+
+
+def run_job(service, job):
+    """
+    Solve a job with the anytime solver, keeping its progress up to date. Runs in one of the job runner threads.
+
+    Parameters:
+    - service (dict): The state of the service.
+    - job (dict): The job to be solved.
+    """
+    if job['stop_event'].is_set():
+        return
+
+    instance = service['instances'][job['instance']]
+    job['status'] = 'running'
+    job['started'] = time.time()
+
+    try:
+        for result in iter_solve(instance['num_practical_turns'], instance['subjects_per_practical_turn'],
+                                 instance['days_per_week'], instance['blocks_per_day'], job['deadline'],
+                                 selection_algorithm=SELECTION_ALGORITHMS_BY_NAME[job['selection_algorithm']],
+                                 crossover=CROSSOVERS_BY_NAME[job['crossover']], pc=job['pc'],
+                                 mutation=MUTATIONS_BY_NAME[job['mutation']], pm=job['pm'], pop_size=job['pop_size'],
+                                 workers=service['workers_per_job'], evaluator=instance['evaluator'],
+                                 executor=service['executor'], stop_event=job['stop_event'],
+                                 rng=create_stream(job['seed'])):
+            with service['lock']:
+                job['best'] = result
+                job['improvements'].append({'fitness': result['fitness'], 'elapsed': result['elapsed']})
+
+        job['status'] = 'cancelled' if job['stop_event'].is_set() else 'done'
+    except Exception as e:
+        job['status'] = 'failed'
+        job['error'] = repr(e)
+
+
+def submit_job(service, instance, deadline, selection_algorithm='ranking_selection',
+               crossover='uniform_block_crossover', pc=0.9, mutation='block_swap_mutation', pm=0.2, pop_size=None,
+               seed=None):
+    """
+    Queue a solve request. The deadline counts from the moment the job starts running.
+
+    Parameters:
+    - service (dict): The state of the service.
+    - instance (str): The name of a registered instance.
+    - deadline (float): The time budget of the job, in seconds.
+    - selection_algorithm (str): The name of the selection algorithm (see 'experiments.SELECTION_ALGORITHMS').
+    - crossover (str): The name of the crossover operator (see 'experiments.CROSSOVERS').
+    - pc (float): Crossover rate
+    - mutation (str): The name of the mutation operator (see 'experiments.MUTATIONS').
+    - pm (float): Mutation rate
+    - pop_size (int): Number of individuals in the population. If None, it is chosen for the deadline.
+    - seed (int): The seed of the random stream of the job (see 'random_streams.create_stream'). Every job draws from
+      its own stream, so concurrent jobs do not contend for the global random state. If None, fresh entropy is used.
+
+    Returns:
+    - int: The id of the job.
+    """
+    # Reject unknown instances and operators now, instead of failing the job later
+    if instance not in service['instances']:
+        raise ValueError(f"Unknown instance: {instance}")
+    for name, operators in [(selection_algorithm, SELECTION_ALGORITHMS_BY_NAME), (crossover, CROSSOVERS_BY_NAME),
+                            (mutation, MUTATIONS_BY_NAME)]:
+        if name not in operators:
+            raise ValueError(f"Unknown operator: {name}")
+
+    with service['lock']:
+        job_id = next(service['job_ids'])
+        job = {
+            'id': job_id, 'instance': instance, 'deadline': deadline, 'selection_algorithm': selection_algorithm,
+            'crossover': crossover, 'pc': pc, 'mutation': mutation, 'pm': pm, 'pop_size': pop_size, 'seed': seed,
+            'status': 'queued', 'submitted': time.time(), 'started': None, 'best': None, 'improvements': [],
+            'error': None, 'stop_event': threading.Event()
+        }
+        service['jobs'][job_id] = job
+
+    service['job_runner'].submit(run_job, service, job)
+    return job_id
+
+
+def job_progress(service, job_id):
+    """
+    Report the progress of a job.
+
+    Parameters:
+    - service (dict): The state of the service.
+    - job_id (int): The id of the job.
+
+    Returns:
+    - dict: The 'status' of the job ('queued', 'running', 'done', 'cancelled' or 'failed'), its request, the fitness of
+      every improvement so far, and the best individual found.
+    """
+    job = service['jobs'][job_id]
+    with service['lock']:
+        progress = {key: value for key, value in job.items() if key not in ('stop_event', 'best')}
+        progress['improvements'] = list(job['improvements'])
+        best = job['best']
+
+    progress['best_fitness'] = None if best is None else best['fitness']
+    progress['evaluations'] = 0 if best is None else best['evaluations']
+    progress['best_individual'] = None if best is None else best['individual']
+    return progress
+
+
+def cancel_job(service, job_id):
+    """
+    Cancel a job. A queued job never starts, and a running job stops and keeps the best individual found so far.
+
+    Parameters:
+    - service (dict): The state of the service.
+    - job_id (int): The id of the job.
+    """
+    job = service['jobs'][job_id]
+    job['stop_event'].set()
+    if job['status'] == 'queued':
+        job['status'] = 'cancelled'
+
+
+def shutdown_service(service):
+    """
+    Cancel every job and stop the job runner threads and the evaluator processes.
+
+    Parameters:
+    - service (dict): The state of the service.
+    """
+    for job_id in list(service['jobs']):
+        cancel_job(service, job_id)
+    service['job_runner'].shutdown(wait=True)
+    service['executor'].shutdown(wait=True)
+
+
+def make_request_handler(service):
+    """
+    Create the HTTP request handler of the service, with a small JSON API:
+    - GET /instances: the names of the registered instances.
+    - POST /instances: register an instance (the arguments of 'register_instance', without 'service').
+    - POST /jobs: submit a solve request (the arguments of 'submit_job', without 'service'), returning its 'id'.
+    - GET /jobs: the progress of every job, without the best individuals.
+    - GET /jobs/<id>: the progress of a job.
+    - DELETE /jobs/<id>: cancel a job.
+
+    Parameters:
+    - service (dict): The state of the service.
+
+    Returns:
+    - type: The request handler class, to be given to the HTTP server.
+    """
+
+    class RequestHandler(BaseHTTPRequestHandler):
+
+        def send_json(self, status, body):
+            content = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def read_json(self):
+            length = int(self.headers.get('Content-Length', 0))
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def find_job(self):
+            # Parse the job id of '/jobs/<id>' paths, answering with an error if there is no such job
+            try:
+                job_id = int(self.path.rstrip('/').split('/')[2])
+            except (IndexError, ValueError):
+                job_id = None
+            if job_id not in service['jobs']:
+                self.send_json(404, {'error': f"Unknown job: {self.path}"})
+                return None
+            return job_id
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/instances':
+                self.send_json(200, sorted(service['instances']))
+            elif self.path.rstrip('/') == '/jobs':
+                self.send_json(200, [{key: value for key, value in job_progress(service, job_id).items()
+                                      if key != 'best_individual'} for job_id in list(service['jobs'])])
+            elif self.path.startswith('/jobs/'):
+                job_id = self.find_job()
+                if job_id is not None:
+                    self.send_json(200, job_progress(service, job_id))
+            else:
+                self.send_json(404, {'error': f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            try:
+                request = self.read_json()
+                if self.path.rstrip('/') == '/instances':
+                    register_instance(service, **request)
+                    self.send_json(201, {'name': request['name']})
+                elif self.path.rstrip('/') == '/jobs':
+                    self.send_json(202, {'id': submit_job(service, **request)})
+                else:
+                    self.send_json(404, {'error': f"Unknown path: {self.path}"})
+            except (TypeError, ValueError, KeyError) as e:
+                self.send_json(400, {'error': str(e)})
+
+        def do_DELETE(self):
+            if self.path.startswith('/jobs/'):
+                job_id = self.find_job()
+                if job_id is not None:
+                    cancel_job(service, job_id)
+                    self.send_json(200, {'id': job_id, 'status': service['jobs'][job_id]['status']})
+            else:
+                self.send_json(404, {'error': f"Unknown path: {self.path}"})
+
+        def log_message(self, format, *args):
+            pass  # Keep the console for the progress of the jobs
+
+    return RequestHandler
+
+
+def serve(host='127.0.0.1', port=8765, workers=None, max_concurrent_jobs=2, instances=None):
+    """
+    Run the solver service until interrupted, accepting solve requests over local HTTP.
+
+    Parameters:
+    - host (str): The address to listen on. The default only accepts local connections.
+    - port (int): The port to listen on.
+    - workers (int): Number of evaluator processes. If None, one per CPU.
+    - max_concurrent_jobs (int): Maximum number of jobs running at the same time.
+    - instances (dict): Instances to register at start, by name, each a dictionary with the arguments of
+      'register_instance'.
+    """
+    service = create_service(workers, max_concurrent_jobs)
+    for name, instance in (instances or {}).items():
+        register_instance(service, name, **instance)
+
+    server = ThreadingHTTPServer((host, port), make_request_handler(service))
+    print(f"Solver service listening on http://{host}:{port} with {service['workers']} evaluator processes")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        shutdown_service(service)
+
+
+if __name__ == "__main__":
+    serve(instances={'default': {'num_practical_turns': 10, 'subjects_per_practical_turn': 4, 'days_per_week': 5,
+                                 'blocks_per_day': 8}})
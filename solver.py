@@ -0,0 +1,219 @@
+# Import the necessary libraries and scripts
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from charles import initialize_population
+from crossovers import uniform_block_crossover
+from fitness import evaluate_population
+from mutations import block_swap_mutation
+from optimization_problem import breed_offspring
+from selection_algorithms import ranking_selection
+
+
+def choose_solver_settings(deadline, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day,
+                           evaluator=evaluate_population, min_generations=50, rng=None):
+    """
+    Choose the population size, the number of evaluator processes and the evaluation batch size for a time budget,
+    by timing the evaluation of a small sample of random individuals.
+
+    The population is sized so that roughly 'min_generations' generations worth of evaluations fit in the deadline.
+    Evaluator processes are only used when the deadline is long enough to pay for starting them, and each task sent to
+    them evaluates enough individuals to outweigh the cost of sending it.
+
+    Parameters:
+    - deadline (float): The time budget, in seconds.
+    - num_practical_turns (int): Number of Practical Turns.
+    - subjects_per_practical_turn (int): Number of subjects each Practical Turn is enrolled in.
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+    - evaluator (function): The function computing the fitness scores of a list of individuals.
+    - min_generations (int): Number of generations the population size is chosen for.
+    - rng (random.Random): The random stream the timing sample is drawn from (see 'random_streams.py'). If None, the
+      global 'random' module is used.
+
+    Returns:
+    - dict: The chosen 'pop_size', 'workers' and 'batch_size'.
+    """
+
+    # Time the evaluation of a small sample of random individuals
+    sample = initialize_population(20, num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day,
+                                   rng)
+    start = time.perf_counter()
+    evaluator(sample)
+    seconds_per_evaluation = max((time.perf_counter() - start) / len(sample), 1e-7)
+
+    # Use evaluator processes only when the deadline leaves plenty of time after starting them
+    cpu_count = os.cpu_count() or 1
+    workers = min(cpu_count, 8) if deadline >= 2 and cpu_count > 1 else 1
+
+    # Send at least ~5 ms of work per task to the evaluator processes, and breed at least one pair at a time
+    batch_size = max(2, int(0.005 / seconds_per_evaluation)) if workers > 1 else 2
+
+    # Size the population so that about 'min_generations' generations fit in the time budget
+    affordable_evaluations = deadline * workers / seconds_per_evaluation
+    pop_size = int(min(max(affordable_evaluations / min_generations, 20), 500))
+
+    return {'pop_size': pop_size, 'workers': workers, 'batch_size': batch_size}
+
+
+def iter_solve(num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day, deadline,
+               selection_algorithm=ranking_selection, crossover=uniform_block_crossover, pc=0.9,
+               mutation=block_swap_mutation, pm=0.2, pop_size=None, workers=None, batch_size=None,
+               evaluator=evaluate_population, repair=None, initial_population=None, initial_fitness_scores=None,
+               executor=None, stop_event=None, rng=None):
+    """
+    Anytime solver: evolve schedules with a steady-state Genetic Algorithm until a wall-clock deadline and yield every
+    improved best schedule as soon as it is found.
+
+    The solver stops at the deadline, when a Global Optimum is found, when 'stop_event' is set, or when the caller
+    closes the generator (e.g. by breaking out of the loop), releasing the evaluator processes it started. The
+    population size, the number of evaluator processes and the batch size not given are chosen automatically for the
+    deadline (see 'choose_solver_settings').
+
+    Parameters:
+    - num_practical_turns (int): Number of Practical Turns.
+    - subjects_per_practical_turn (int): Number of subjects each Practical Turn is enrolled in.
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+    - deadline (float): The time budget, in seconds.
+    - selection_algorithm (function): The selection algorithm to be used in the Genetic Algorithm.
+    - crossover (function): The crossover operator to be used in the Genetic Algorithm.
+    - pc (float): Crossover rate
+    - mutation (function): The mutation operator to be used in the Genetic Algorithm.
+    - pm (float): Mutation rate
+    - pop_size (int): Number of individuals in the population. If None, it is chosen for the deadline.
+    - workers (int): Number of evaluator processes (1 evaluates in the calling process). If None, it is chosen for the
+      deadline.
+    - batch_size (int): Number of offspring bred and evaluated together. If None, it is chosen for the deadline.
+    - evaluator (function): The function computing the fitness scores of a list of individuals. It must be picklable
+      when evaluator processes are used.
+    - repair (function): A repair operator applied to every offspring after crossover and mutation.
+    - initial_population (list): The population to start from, e.g. to continue a previous run. If None, a random
+      population is created.
+    - initial_fitness_scores (list): The fitness scores of the initial population, if already known. If None, the
+      initial population is evaluated.
+    - executor (concurrent.futures.Executor): An already running pool to evaluate the offspring with. If given, it is
+      used regardless of 'workers' and it is not shut down by the solver.
+    - stop_event (threading.Event): If given, the solver stops as soon as the event is set.
+    - rng (random.Random): The random stream that the choice of the settings, the initialization and the breeding draw
+      from (see 'random_streams.py'). If None, the global 'random' module is used.
+
+    Yields:
+    - dict: Every improvement, with the best 'individual' so far, its 'fitness', the 'elapsed' seconds and the number
+      of 'evaluations' carried out.
+    """
+
+    start = time.monotonic()
+    deadline_time = start + deadline
+
+    # Choose the settings that were not given for the time budget
+    if pop_size is None or workers is None or batch_size is None:
+        settings = choose_solver_settings(deadline, num_practical_turns, subjects_per_practical_turn, days_per_week,
+                                          blocks_per_day, evaluator, rng=rng)
+        pop_size = settings['pop_size'] if pop_size is None else pop_size
+        workers = settings['workers'] if workers is None else workers
+        batch_size = settings['batch_size'] if batch_size is None else batch_size
+
+    # Initialize and evaluate the population
+    if initial_population is None:
+        population = initialize_population(pop_size, num_practical_turns, subjects_per_practical_turn, days_per_week,
+                                           blocks_per_day, rng)
+    else:
+        population = list(initial_population)
+    fitness_scores = evaluator(population) if initial_fitness_scores is None else list(initial_fitness_scores)
+    evaluations = len(population)
+
+    best_index = fitness_scores.index(min(fitness_scores))
+    best_individual = population[best_index]
+    best_fitness = fitness_scores[best_index]
+    yield {'individual': best_individual, 'fitness': best_fitness, 'elapsed': time.monotonic() - start,
+           'evaluations': evaluations}
+
+    def breed_batch():
+        # Breed a batch of offspring from the current population
+        offspring = []
+        while len(offspring) < batch_size:
+            offspring.extend(breed_offspring(population, fitness_scores, selection_algorithm, crossover, pc, mutation,
+                                             pm, repair, rng))
+        return offspring
+
+    # Start the evaluator processes, unless evaluating in the calling process or a pool was given
+    own_executor = executor is None and workers > 1
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    pending = {}  # Maps every running evaluation to the offspring it evaluates
+
+    try:
+        while best_fitness > 0 and time.monotonic() < deadline_time and not (stop_event and stop_event.is_set()):
+
+            # Breed and evaluate the next offspring, in the calling process or in the evaluator processes
+            evaluated = []
+            if executor is None:
+                offspring = breed_batch()
+                evaluated.append((offspring, evaluator(offspring)))
+            else:
+                while len(pending) < 2 * max(workers, 1):
+                    offspring = breed_batch()
+                    pending[executor.submit(evaluator, offspring)] = offspring
+                done, _ = wait(pending, timeout=max(deadline_time - time.monotonic(), 0),
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    evaluated.append((pending.pop(future), future.result()))
+
+            # Insert the evaluated offspring into the population, replacing its worst individuals
+            improved = False
+            for offspring, offspring_fitness in evaluated:
+                for child, child_fitness in zip(offspring, offspring_fitness):
+                    worst_index = fitness_scores.index(max(fitness_scores))
+                    population[worst_index] = child
+                    fitness_scores[worst_index] = child_fitness
+                    evaluations += 1
+
+                    if child_fitness < best_fitness:
+                        best_individual = child
+                        best_fitness = child_fitness
+                        improved = True
+
+            # Stream the improvement to the caller
+            if improved:
+                yield {'individual': best_individual, 'fitness': best_fitness, 'elapsed': time.monotonic() - start,
+                       'evaluations': evaluations}
+
+    finally:
+        # Cancel the evaluations that are no longer needed and release the evaluator processes started here
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def solve(num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day, deadline,
+          on_improvement=None, **solver_options):
+    """
+    Solve the scheduling problem within a wall-clock deadline and return the best schedule found.
+
+    Parameters:
+    - num_practical_turns (int): Number of Practical Turns.
+    - subjects_per_practical_turn (int): Number of subjects each Practical Turn is enrolled in.
+    - days_per_week (int): Number of days in a week.
+    - blocks_per_day (int): Number of blocks in each day.
+    - deadline (float): The time budget, in seconds.
+    - on_improvement (function): If given, it is called with every improvement (see 'iter_solve').
+    - solver_options: Any other option of 'iter_solve'.
+
+    Returns:
+    - dict: The last improvement, with the best 'individual', its 'fitness', the 'elapsed' seconds and the number of
+      'evaluations' carried out when it was found.
+    """
+    best = None
+    for best in iter_solve(num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day, deadline,
+                           **solver_options):
+        if on_improvement is not None:
+            on_improvement(best)
+    return best
+
+
+if __name__ == "__main__":
+    # Find the best schedule possible in 30 seconds, printing every improvement
+    solve(num_practical_turns=10, subjects_per_practical_turn=4, days_per_week=5, blocks_per_day=8, deadline=30,
+          on_improvement=lambda result: print(f"{result['elapsed']:.2f}s: Best Fitness = {result['fitness']}"))
@@ -0,0 +1,29 @@
+# Import the necessary libraries and scripts
+import numpy as np
+import pytest
+from charles import BREAK_CODE, initialize_population_array
+from random_streams import create_stream
+
+
+def test_population_array_respects_the_schedule_structure():
+    encoded_population = initialize_population_array(50, 6, 4, 5, 8, rng=create_stream(0), chunk_size=7)
+    assert encoded_population.shape == (50, 6, 5, 8) and encoded_population.dtype == np.int8
+
+    # Every day has between 1 and all of its blocks as 'Break', and every Practical Turn uses at most its subjects
+    breaks_per_day = (encoded_population == BREAK_CODE).sum(axis=-1)
+    assert breaks_per_day.min() >= 1 and breaks_per_day.max() <= 8
+    for turn in encoded_population.reshape(-1, 5 * 8):
+        assert len(set(turn[turn != BREAK_CODE].tolist())) <= 4
+
+
+def test_population_array_is_reproducible():
+    population1 = initialize_population_array(20, 3, 4, 5, 8, rng=np.random.default_rng(1), chunk_size=3)
+    population2 = initialize_population_array(20, 3, 4, 5, 8, rng=np.random.default_rng(1), chunk_size=3)
+    assert np.array_equal(population1, population2)
+
+
+def test_population_array_writes_into_the_given_buffer():
+    buffer = np.zeros((10, 2, 5, 8), dtype=np.int8)
+    assert initialize_population_array(10, 2, 4, 5, 8, out=buffer, rng=create_stream(0)) is buffer
+    with pytest.raises(ValueError):
+        initialize_population_array(10, 2, 4, 5, 7, out=buffer)
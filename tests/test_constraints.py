@@ -0,0 +1,70 @@
+# Import the necessary libraries and scripts
+import random
+import numpy as np
+import pytest
+from charles import encode_population, initialize_population
+from constraints import (PENALTY_COMPONENTS, compile_constraints, make_objectives_evaluator, make_population_evaluator,
+                         penalty_components)
+from data import generate_resources, generate_subjects
+from fitness import evaluate_population, fitness_individual, resource_penalty
+from random_streams import create_stream
+
+# A single Practical Turn where every day has 3 blocks of 'Subject_1', a preferred 'Break' and 4 blocks of 'Subject_2'
+DAY = ['Subject_1'] * 3 + ['Break'] + ['Subject_2'] * 4
+INDIVIDUAL = [[list(DAY) for _ in range(5)]]
+
+
+def test_default_compiled_evaluator_matches_the_fitness_function():
+    population = initialize_population(30, 6, 4, 5, 8, create_stream(0))
+    assert make_population_evaluator()(population) == evaluate_population(population)
+
+
+@pytest.mark.parametrize('constraints, expected', [
+    ({}, 0),
+    ({'max_consecutive_blocks': 2}, 5 * (1 + 2)),
+    ({'max_consecutive_blocks': 2, 'weights': {'consecutive_blocks': 2}}, 2 * 5 * (1 + 2)),
+    ({'subject_quotas': {'Subject_1': 20}}, 5 * 5),
+    ({'subject_quotas': {'Subject_1': 20}, 'weights': {'quota_shortfall': 1}}, 5),
+    ({'preferred_break_blocks': (0,)}, 2 * 5),
+])
+def test_compiled_evaluator_follows_the_specification(constraints, expected):
+    assert make_population_evaluator(constraints)([INDIVIDUAL]) == [expected]
+
+
+def test_penalty_components_add_up_to_the_fitness():
+    population = initialize_population(20, 6, 4, 5, 8, create_stream(0))
+    compiled_constraints = compile_constraints({'max_consecutive_blocks': 2})
+    components = penalty_components(encode_population(population), compiled_constraints)
+    assert components.shape == (20, len(PENALTY_COMPONENTS))
+    assert components.sum(axis=1).tolist() == make_population_evaluator({'max_consecutive_blocks': 2})(population)
+
+    # The objectives evaluator returns the chosen components, in the given order
+    objectives = make_objectives_evaluator({'max_consecutive_blocks': 2}, ('quota_shortfall', 'overlap'))(population)
+    assert objectives.tolist() == components[:, [3, 0]].tolist()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_compiled_evaluator_accepts_generated_resources(seed):
+    # Generated resources list every teacher as unavailable somewhere, including teachers without subjects
+    random.seed(seed)
+    resources = generate_resources(generate_subjects())
+    evaluator = make_population_evaluator({'resources': resources})
+
+    population = initialize_population(5, 10, 4, 5, 8)
+    expected = [fitness_individual(individual) + resource_penalty(individual, resources) for individual in population]
+    assert evaluator(population) == expected
+
+
+@pytest.mark.parametrize('rooms', [np.int64(1), 1, [[1] * 8 for _ in range(5)]])
+def test_resource_penalty_counts_every_conflict(rooms):
+    # 'Subject_1' and 'Subject_3' share a teacher, and the teacher of 'Subject_2' is unavailable in one slot
+    individual = INDIVIDUAL + [[['Subject_3'] * 3 + ['Break'] + ['Subject_4'] * 4 for _ in range(5)]]
+    resources = {'teachers': {'Subject_1': 'Teacher_1', 'Subject_2': 'Teacher_2', 'Subject_3': 'Teacher_1',
+                              'Subject_4': 'Teacher_3'},
+                 'rooms': rooms, 'teacher_unavailability': {'Teacher_2': [(0, 4)]}}
+
+    # 15 teacher clashes, 35 classes beyond the single room and 1 class with an unavailable teacher
+    expected = 15 * 3 + 35 * 3 + 1 * 4
+    assert resource_penalty(individual, resources) == expected
+    assert make_population_evaluator({'resources': resources})([individual]) == [fitness_individual(individual)
+                                                                                 + expected]
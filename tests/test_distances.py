@@ -0,0 +1,54 @@
+# Import the necessary libraries and scripts
+import numpy as np
+import pytest
+from charles import BLOCK_NAMES, encode_population, initialize_population
+from distances import (BYTE_POPCOUNT, hamming_many_to_many, hamming_matrix, hamming_one_to_many, pack_population,
+                       pack_schedules, popcount, within_distance)
+from random_streams import create_stream
+
+
+def near_schedules(seed, num_schedules=40, shape=(3, 5, 7)):
+    # Random compact schedules of 105 blocks (not a whole number of 64-block words), half of them close to the first
+    rng = np.random.default_rng(seed)
+    encoded = rng.integers(0, len(BLOCK_NAMES), size=(num_schedules,) + shape).astype(np.int8)
+    for index in range(num_schedules // 2):
+        encoded[index] = encoded[0]
+        changed = rng.choice(encoded[0].size, size=index, replace=False)
+        encoded[index].reshape(-1)[changed] = rng.integers(0, len(BLOCK_NAMES), size=index)
+    return encoded
+
+
+def brute_force_distances(encoded1, encoded2):
+    return (encoded1.reshape(len(encoded1), 1, -1) != encoded2.reshape(1, len(encoded2), -1)).sum(axis=2)
+
+
+def test_popcount_matches_the_byte_table():
+    words = np.random.default_rng(0).integers(0, 2 ** 63, size=100, dtype=np.uint64)
+    expected = BYTE_POPCOUNT[words.view(np.uint8)].reshape(100, 8).sum(axis=1)
+    assert popcount(words).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_packed_distances_match_brute_force(seed):
+    encoded1, encoded2 = near_schedules(seed), near_schedules(seed + 10, num_schedules=15)
+    packed1, packed2 = pack_schedules(encoded1), pack_schedules(encoded2)
+    expected = brute_force_distances(encoded1, encoded2)
+
+    assert np.array_equal(hamming_many_to_many(packed1, packed2, tile_size=8), expected)
+    assert np.array_equal(hamming_many_to_many(packed1, tile_size=8), brute_force_distances(encoded1, encoded1))
+    assert np.array_equal(hamming_one_to_many(packed2[3], packed1), expected[:, 3])
+
+
+@pytest.mark.parametrize('radius', [0, 1, 5, 20, 106])
+def test_within_distance_matches_the_distances(radius):
+    encoded = near_schedules(0)
+    packed = pack_schedules(encoded)
+    distances = brute_force_distances(encoded[:1], encoded)[0]
+    assert np.array_equal(within_distance(packed[0], packed, radius, words_per_step=1), distances < radius)
+
+
+def test_hamming_matrix_of_a_population():
+    population = initialize_population(12, 3, 4, 5, 8, create_stream(0))
+    encoded_population = encode_population(population)
+    assert np.array_equal(pack_population(population), pack_schedules(encoded_population))
+    assert np.array_equal(hamming_matrix(population), brute_force_distances(encoded_population, encoded_population))
@@ -0,0 +1,36 @@
+# Import the necessary libraries and scripts
+from collections import Counter
+import numpy as np
+import pytest
+from charles import encode_population, initialize_population
+from diversity import population_diversity, record_diversity
+from random_streams import create_stream
+
+
+def test_population_diversity_matches_the_per_cell_definitions():
+    population = initialize_population(12, 3, 4, 5, 8, create_stream(0))
+    population += population[:3]  # Duplicated individuals
+    encoded_population = encode_population(population)
+    diversity = population_diversity(encoded_population)
+
+    # Compute the entropy and the consensus of every cell directly from its values
+    cells = encoded_population.reshape(len(population), -1).T
+    expected_entropy = []
+    consensus = []
+    for cell in cells:
+        frequencies = np.array(list(Counter(cell.tolist()).values())) / len(population)
+        expected_entropy.append(-np.sum(frequencies * np.log2(frequencies)))
+        consensus.append(Counter(cell.tolist()).most_common(1)[0][0])
+
+    assert np.allclose(diversity['cell_entropy'].ravel(), expected_entropy)
+    assert diversity['mean_entropy'] == pytest.approx(np.mean(expected_entropy))
+    assert diversity['unique_individuals'] == 12
+    assert diversity['consensus_distance'] == pytest.approx(
+        np.mean([np.sum(individual != np.array(consensus)) for individual in cells.T]))
+
+
+def test_identical_population_has_no_diversity():
+    population = initialize_population(1, 3, 4, 5, 8, create_stream(0)) * 5
+    stats = {}
+    record_diversity(stats, population)
+    assert stats['diversity'] == [{'mean_entropy': 0.0, 'unique_individuals': 1, 'consensus_distance': 0.0}]
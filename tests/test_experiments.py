@@ -0,0 +1,40 @@
+# Import the necessary libraries and scripts
+import pytest
+import experiments
+from experiments import run_racing_experiments
+
+# A small instance, so every combination of the grid can run a few trials quickly
+RACING_PROBLEM = {'pop_size': 6, 'num_practical_turns': 2, 'subjects_per_practical_turn': 2, 'days_per_week': 5,
+                  'blocks_per_day': 8, 'generations': 3, 'pc': 0.9, 'pm': 0.2}
+
+
+def test_racing_keeps_the_best_contenders_first_and_is_reproducible():
+    results = run_racing_experiments(**RACING_PROBLEM, initial_trials=2, trials_per_round=1, max_trials=4, seed=3)
+    assert len(results) == 72
+
+    # The combinations still in the race come first, best first, and every one ran between 2 and 4 trials
+    remaining = [result for result in results if not result['eliminated']]
+    assert results[:len(remaining)] == remaining
+    assert [result['mean_final_best_fitness'] for result in remaining] == \
+        sorted(result['mean_final_best_fitness'] for result in remaining)
+    assert all(2 <= result['trials'] <= 4 for result in results)
+    assert all(len(result['average_best_fitnesses']) >= 1 for result in results)
+
+    # Every trial draws from its own stream, keyed by the seed, the combination and the trial
+    assert run_racing_experiments(**RACING_PROBLEM, initial_trials=2, trials_per_round=1, max_trials=4,
+                                  seed=3) == results
+
+
+def test_racing_needs_two_initial_trials():
+    with pytest.raises(ValueError):
+        run_racing_experiments(**RACING_PROBLEM, initial_trials=1)
+
+
+def test_racing_records_the_fitness_of_trials_ending_before_any_generation(monkeypatch):
+    # Every trial returns before finishing a generation, e.g. when its initial population holds a Global Optimum
+    monkeypatch.setattr(experiments, 'evolve_population',
+                        lambda initial_population, *args, **kwargs: (initial_population[0], []))
+    results = run_racing_experiments(**RACING_PROBLEM, initial_trials=2, max_trials=2, seed=3)
+    for result in results:
+        assert result['average_best_fitnesses'] == [result['mean_final_best_fitness']]
+        assert result['mean_final_best_fitness'] > 0
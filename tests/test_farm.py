@@ -0,0 +1,92 @@
+# Import the necessary libraries and scripts
+import json
+import threading
+import time
+import pytest
+from farm import (create_coordinator, experiment_jobs, is_finished, make_coordinator_server, merge_results, run_job,
+                  run_worker, send_message)
+
+PROBLEM = {'pop_size': 6, 'num_practical_turns': 2, 'subjects_per_practical_turn': 2, 'days_per_week': 5,
+           'blocks_per_day': 5, 'generations': 2, 'pc': 0.9, 'pm': 0.2}
+
+# A schedule without any penalty, i.e. a Global Optimum
+OPTIMUM = [[['Subject_1'] * 3 + ['Break'] + ['Subject_2'] * 4 for _ in range(5)]]
+
+
+@pytest.fixture
+def farm(tmp_path):
+    # Serve a coordinator with a short lease timeout on a free local port
+    def start(jobs, lease_timeout=0.2):
+        coordinator = create_coordinator(jobs, PROBLEM, tmp_path / 'results.jsonl', lease_timeout)
+        server = make_coordinator_server(coordinator, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return coordinator, server.server_address[1]
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_expired_leases_are_reissued_and_results_stored_once(farm, tmp_path):
+    jobs = experiment_jobs(1)[:3]
+    coordinator, port = farm(jobs)
+
+    # A worker leases the first job and stops sending heartbeats, so the job is handed out again
+    first_lease = send_message('127.0.0.1', port, {'type': 'lease', 'worker': 'worker-a'})
+    time.sleep(0.3)
+    second_lease = send_message('127.0.0.1', port, {'type': 'lease', 'worker': 'worker-b'})
+    assert first_lease['job']['id'] == second_lease['job']['id'] == 0
+
+    # Both workers complete it, and the late worker is told to drop it
+    result = run_job(second_lease['job'], second_lease['problem'])
+    send_message('127.0.0.1', port, {'type': 'result', 'worker': 'worker-b', 'result': result})
+    assert send_message('127.0.0.1', port, {'type': 'heartbeat', 'worker': 'worker-a', 'job_id': 0}) == {'ok': False}
+    send_message('127.0.0.1', port, {'type': 'result', 'worker': 'worker-a', 'result': result})
+
+    # A worker runs the remaining jobs
+    assert run_worker(port=port, worker='worker-c', heartbeat_interval=0.05, poll_interval=0.05) == 2
+    assert coordinator['finished'].is_set()
+
+    # Every job is stored once, after the header
+    with open(tmp_path / 'results.jsonl') as file:
+        lines = [json.loads(line) for line in file]
+    assert [result['job_id'] for result in lines[1:]] == [0, 1, 2]
+    results, (best_individual, best_fitness) = merge_results(coordinator)
+    assert len(results) == 3
+    assert best_fitness == min(min(result['average_best_fitnesses']) for result in results)
+
+
+def test_trials_after_a_global_optimum_are_skipped(farm):
+    coordinator, port = farm(experiment_jobs(3)[:3], lease_timeout=60)
+
+    # The second trial finds a Global Optimum, so the third one is no longer needed
+    leases = [send_message('127.0.0.1', port, {'type': 'lease', 'worker': 'worker-a'}) for _ in range(2)]
+    assert [lease['job']['trial'] for lease in leases] == [0, 1]
+    send_message('127.0.0.1', port, {'type': 'result', 'worker': 'worker-a',
+                                     'result': {'job_id': 1, 'best_fitness_per_generation': [0],
+                                                'best_individual': OPTIMUM}})
+    assert send_message('127.0.0.1', port, {'type': 'lease', 'worker': 'worker-a'}) == {'job': None, 'wait': True}
+    assert send_message('127.0.0.1', port, {'type': 'heartbeat', 'worker': 'worker-a', 'job_id': 2}) == {'ok': False}
+
+    send_message('127.0.0.1', port, {'type': 'result', 'worker': 'worker-a',
+                                     'result': run_job(leases[0]['job'], leases[0]['problem'])})
+    assert is_finished(coordinator) and coordinator['finished'].is_set()
+    assert merge_results(coordinator)[1][1] == 0
+
+
+def test_results_store_is_resumed_for_the_same_experiment_only(farm, tmp_path):
+    jobs = experiment_jobs(1)[:2]
+    coordinator, port = farm(jobs, lease_timeout=60)
+    lease = send_message('127.0.0.1', port, {'type': 'lease', 'worker': 'worker-a'})
+    send_message('127.0.0.1', port, {'type': 'result', 'worker': 'worker-a',
+                                     'result': run_job(lease['job'], lease['problem'])})
+
+    # The finished trial is loaded back and not handed out again
+    resumed = create_coordinator(jobs, PROBLEM, tmp_path / 'results.jsonl')
+    assert list(resumed['results']) == [0] and list(resumed['pending']) == [1]
+
+    with pytest.raises(ValueError):
+        create_coordinator(experiment_jobs(1, base_seed=1)[:2], PROBLEM, tmp_path / 'results.jsonl')
@@ -0,0 +1,72 @@
+# Import the necessary libraries and scripts
+from charles import copy_individual, initialize_population
+from crossovers import uniform_block_crossover
+from fitness import evaluate_population, fitness_individual
+from hall_of_fame import create_hall_of_fame, hall_of_fame_best, hall_of_fame_insert, hall_of_fame_update
+from mutations import block_swap_mutation
+from optimization_problem import evolve_population
+from random_streams import create_stream
+from selection_algorithms import tournament_selection
+from trajectory import close_trajectory_recorder, load_trajectory, open_trajectory_recorder, trajectory_generation
+
+
+def test_hall_of_fame_keeps_the_best_distinct_individuals():
+    population = initialize_population(50, 3, 4, 5, 8, create_stream(0))
+    fitness_scores = evaluate_population(population)
+    hall_of_fame = create_hall_of_fame(10)
+
+    # Every individual is inserted twice, but archived at most once
+    hall_of_fame_update(hall_of_fame, population, fitness_scores)
+    assert hall_of_fame_update(hall_of_fame, population, fitness_scores) == 0
+
+    best = hall_of_fame_best(hall_of_fame)
+    assert len(best) == 10
+    assert [fitness for _, fitness in best] == sorted(fitness_scores)[:10]
+    assert hall_of_fame_best(hall_of_fame, 3) == best[:3]
+    assert all(fitness_individual(individual) == fitness for individual, fitness in best)
+
+
+def test_hall_of_fame_archives_copies():
+    individual = initialize_population(1, 3, 4, 5, 8, create_stream(0))[0]
+    hall_of_fame = create_hall_of_fame(2)
+    assert hall_of_fame_insert(hall_of_fame, individual, 10)
+    archived = copy_individual(individual)
+
+    # Changing the individual in place does not change the archived one
+    individual[0][0][0] = 'Subject_31' if individual[0][0][0] != 'Subject_31' else 'Subject_30'
+    assert hall_of_fame_best(hall_of_fame) == [(archived, 10)]
+
+    # A worse individual does not enter a full hall of fame, and a better one evicts the worst
+    assert hall_of_fame_insert(hall_of_fame, individual, 5)
+    assert not hall_of_fame_insert(hall_of_fame, initialize_population(1, 3, 4, 5, 8, create_stream(1))[0], 20)
+    assert hall_of_fame_insert(hall_of_fame, initialize_population(1, 3, 4, 5, 8, create_stream(2))[0], 1)
+    assert [fitness for _, fitness in hall_of_fame_best(hall_of_fame)] == [1, 5]
+
+
+def test_genetic_algorithm_archives_every_evaluated_individual():
+    hall_of_fame = create_hall_of_fame(5)
+    best_individual, best_fitness_per_generation = evolve_population(
+        initialize_population(20, 3, 4, 5, 8, create_stream(0)), tournament_selection, uniform_block_crossover, 0.9,
+        block_swap_mutation, 0.2, 5, elite_size=3, hall_of_fame=hall_of_fame, rng=create_stream(1))
+
+    # The hall of fame holds the best individual found, and the elites keep the best fitness from getting worse
+    assert hall_of_fame_best(hall_of_fame, 1)[0][1] == best_fitness_per_generation[-1]
+    assert best_fitness_per_generation == sorted(best_fitness_per_generation, reverse=True)
+    assert fitness_individual(best_individual) == best_fitness_per_generation[-1]
+
+
+def test_top_k_elitism_keeps_the_best_individuals_of_the_population(tmp_path):
+    recorder = open_trajectory_recorder(tmp_path)
+    evolve_population(initialize_population(20, 3, 4, 5, 8, create_stream(0)), tournament_selection,
+                      uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 5, elite_size=4, recorder=recorder,
+                      rng=create_stream(1), stop_at_optimum=False)
+    close_trajectory_recorder(recorder)
+
+    # The first individuals of every generation are the 4 best of the previous one, kept unchanged
+    trajectory = load_trajectory(tmp_path)
+    for generation in range(1, 6):
+        previous_population, previous_fitness_scores, _ = trajectory_generation(trajectory, generation - 1)
+        population, _, provenance = trajectory_generation(trajectory, generation)
+        elite_indexes = provenance[:4, 0].tolist()
+        assert sorted(previous_fitness_scores[elite_indexes]) == sorted(previous_fitness_scores)[:4]
+        assert population[:4] == [previous_population[index] for index in elite_indexes]
@@ -0,0 +1,49 @@
+# Import the necessary libraries and scripts
+import pytest
+import crossovers
+import distances
+import fitness
+from charles import initialize_population
+from kernels import BACKENDS, DEFAULT_BACKEND, KERNEL_NAMES, check_kernel_conformance, get_kernel
+from random_streams import create_stream
+
+
+@pytest.mark.parametrize('backend', ['python', 'numba'])
+def test_kernels_conform_to_reference_functions(backend):
+    # The Numba backend is optional, so it is only checked where numba is installed
+    if backend == 'numba':
+        pytest.importorskip('numba')
+    assert sorted(BACKENDS[backend]) == sorted(KERNEL_NAMES)
+    assert check_kernel_conformance([backend], trials=10) == {backend: []}
+
+
+def test_numba_backend_is_the_default_when_installed():
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        assert DEFAULT_BACKEND == 'python'
+    else:
+        assert DEFAULT_BACKEND == 'numba'
+
+
+def test_public_functions_dispatch_to_the_default_backend(monkeypatch):
+    population = initialize_population(4, 3, 4, 5, 8, create_stream(0))
+    calls = []
+
+    def recording(name, kernel):
+        def recorded_kernel(*args, **kwargs):
+            calls.append(name)
+            return kernel(*args, **kwargs)
+        return recorded_kernel
+
+    # Replace every kernel of the default backend with one recording its calls
+    for name in KERNEL_NAMES:
+        monkeypatch.setitem(BACKENDS[DEFAULT_BACKEND], name, recording(name, get_kernel(name)))
+
+    fitness.fitness_individual(population[0])
+    fitness.evaluate_population(population)
+    fitness.hamming_distance_between_individuals(population[0], population[1])
+    distances.hamming_matrix(population)
+    crossovers.uniform_block_crossover(population[0], population[1], create_stream(1))
+    crossovers.single_point_block_crossover(population[0], population[1], create_stream(1))
+    assert calls == KERNEL_NAMES
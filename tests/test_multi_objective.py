@@ -0,0 +1,61 @@
+# Import the necessary libraries and scripts
+import numpy as np
+import pytest
+from charles import initialize_population
+from constraints import make_objectives_evaluator
+from crossovers import uniform_block_crossover
+from multi_objective import crowding_distance, dominance_matrix, fast_non_dominated_sort
+from mutations import block_swap_mutation
+from optimization_problem import evolve_population_nsga2
+from random_streams import create_stream
+from selection_algorithms import tournament_selection
+
+
+def brute_force_ranks(objectives):
+    # Peel the fronts off one after another, comparing every pair of the remaining individuals
+    ranks = np.full(len(objectives), -1)
+    remaining = set(range(len(objectives)))
+    rank = 0
+    while remaining:
+        front = {i for i in remaining
+                 if not any((objectives[j] <= objectives[i]).all() and (objectives[j] < objectives[i]).any()
+                            for j in remaining)}
+        ranks[list(front)] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_non_dominated_sort_matches_brute_force(seed):
+    objectives = np.random.default_rng(seed).integers(0, 6, size=(60, 3))
+    assert np.array_equal(fast_non_dominated_sort(objectives), brute_force_ranks(objectives))
+
+    # The tiled dominance matrix does not depend on the tile size
+    assert np.array_equal(dominance_matrix(objectives, tile_size=7), dominance_matrix(objectives))
+
+
+def test_crowding_distance_prefers_the_boundaries_of_every_front():
+    objectives = np.array([[0, 4], [1, 2], [2, 1], [4, 0], [3, 3], [5, 5]])
+    ranks = fast_non_dominated_sort(objectives)
+    assert ranks.tolist() == [0, 0, 0, 0, 1, 2]
+
+    distances = crowding_distance(objectives, ranks)
+    assert np.isinf(distances[[0, 3, 4, 5]]).all()
+    assert distances[1] == pytest.approx((2 - 0) / 5 + (4 - 1) / 5)
+    assert distances[2] == pytest.approx((4 - 1) / 5 + (2 - 0) / 5)
+
+
+def test_nsga2_returns_a_distinct_pareto_front():
+    population = initialize_population(20, 4, 4, 5, 8, create_stream(0))
+    objectives_evaluator = make_objectives_evaluator()
+    stats = {}
+
+    pareto_front, pareto_objectives = evolve_population_nsga2(
+        population, tournament_selection, uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 5,
+        objectives_evaluator=objectives_evaluator, stats=stats, rng=create_stream(1))
+
+    assert len(stats['pareto_front_size']) == 5
+    assert np.array_equal(pareto_objectives, objectives_evaluator(pareto_front))
+    assert len({str(individual) for individual in pareto_front}) == len(pareto_front)
+    assert (fast_non_dominated_sort(pareto_objectives) == 0).all()
@@ -0,0 +1,36 @@
+# Import the necessary libraries and scripts
+from charles import initialize_population
+from fitness import hamming_distance_between_individuals_python
+from neighbour_index import build_neighbour_index, nearest_neighbour, update_neighbour_index
+from random_streams import create_stream
+
+
+def brute_force_nearest(population, individual, candidates):
+    # Compare the schedule with every candidate, keeping the first one among ties
+    distances = [hamming_distance_between_individuals_python(individual, population[position])
+                 for position in candidates]
+    nearest = distances.index(min(distances))
+    return candidates[nearest], distances[nearest]
+
+
+def test_nearest_neighbour_matches_brute_force():
+    population = initialize_population(30, 4, 4, 5, 8, create_stream(0))
+    queries = initialize_population(10, 4, 4, 5, 8, create_stream(1))
+    neighbour_index = build_neighbour_index(population)
+
+    for query_index, query in enumerate(queries):
+        assert nearest_neighbour(neighbour_index, query) == brute_force_nearest(population, query, list(range(30)))
+        window = create_stream(2, query_index).sample(range(30), 8)
+        assert nearest_neighbour(neighbour_index, query, window) == brute_force_nearest(population, query, window)
+
+    # An individual of the population is its own nearest neighbour
+    assert nearest_neighbour(neighbour_index, population[7]) == (7, 0)
+
+
+def test_updated_index_finds_the_new_individual():
+    population = initialize_population(30, 4, 4, 5, 8, create_stream(0))
+    neighbour_index = build_neighbour_index(population)
+    individual = initialize_population(1, 4, 4, 5, 8, create_stream(1))[0]
+
+    update_neighbour_index(neighbour_index, 12, individual)
+    assert nearest_neighbour(neighbour_index, individual) == (12, 0)
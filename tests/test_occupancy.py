@@ -0,0 +1,46 @@
+# Import the necessary libraries and scripts
+import numpy as np
+from charles import copy_individual, initialize_population
+from mutations import conflict_free_swap_mutation
+from occupancy import build_occupancy_index, has_conflict, overlap_penalty, swap_blocks
+from random_streams import create_stream
+
+
+def count_overlaps(individual):
+    # Count the Practical Turns beyond the first with the same subject in the same slot, comparing every pair of turns
+    overlaps = 0
+    for day in range(len(individual[0])):
+        for block in range(len(individual[0][0])):
+            subjects = [turn[day][block] for turn in individual if turn[day][block] != 'Break']
+            overlaps += len(subjects) - len(set(subjects))
+    return overlaps
+
+
+def test_occupancy_index_counts_the_overlaps():
+    for individual in initialize_population(20, 10, 4, 5, 8, create_stream(0)):
+        occupancy_index = build_occupancy_index(individual)
+        assert overlap_penalty(occupancy_index) == 3 * count_overlaps(individual)
+        assert has_conflict(occupancy_index, 0, 0, individual[0][0][0]) == \
+            (individual[0][0][0] != 'Break' and sum(turn[0][0] == individual[0][0][0] for turn in individual) > 1)
+
+
+def test_occupancy_index_stays_in_sync_with_swaps():
+    individual = initialize_population(1, 10, 4, 5, 8, create_stream(0))[0]
+    occupancy_index = build_occupancy_index(individual)
+    rng = create_stream(1)
+    for _ in range(50):
+        swap_blocks(individual, occupancy_index, rng.randrange(10), rng.randrange(5), rng.randrange(8),
+                    rng.randrange(8))
+    assert np.array_equal(occupancy_index, build_occupancy_index(individual))
+
+
+def test_conflict_free_swap_mutation_never_adds_overlaps():
+    rng = create_stream(1)
+    for individual in initialize_population(20, 10, 4, 5, 8, create_stream(0)):
+        mutated = conflict_free_swap_mutation(copy_individual(individual), rng=rng)
+        assert count_overlaps(mutated) <= count_overlaps(individual)
+
+        # Blocks are only swapped within their day
+        for turn, mutated_turn in zip(individual, mutated):
+            for day, mutated_day in zip(turn, mutated_turn):
+                assert sorted(day) == sorted(mutated_day)
@@ -0,0 +1,144 @@
+# Import the necessary libraries and scripts
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from charles import initialize_population
+from crossovers import single_point_block_crossover, uniform_block_crossover, uniform_day_crossover
+from fitness import evaluate_population, fitness_individual
+from mutations import block_inversion_mutation, block_swap_mutation
+from optimization_problem import (evolve_population_adaptive, evolve_population_async, evolve_population_rtr,
+                                  evolve_population_with_replacement, update_operator_probabilities)
+from random_streams import create_stream
+from selection_algorithms import tournament_selection
+
+
+def counting_evaluator(evaluated):
+    # An evaluator recording the number of individuals it is given every time it is called
+    def evaluator(population):
+        evaluated.append(len(population))
+        return evaluate_population(population)
+    return evaluator
+
+
+@pytest.mark.parametrize('replacement, offspring_size', [('steady_state', 2), ('mu_plus_lambda', 20),
+                                                         ('mu_comma_lambda', 40)])
+def test_replacement_schemes_evaluate_only_the_offspring(replacement, offspring_size):
+    population = initialize_population(20, 4, 4, 5, 8, create_stream(0))
+    initial_population = list(population)
+    evaluated = []
+
+    best_individual, best_fitness_per_generation = evolve_population_with_replacement(
+        population, tournament_selection, uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 5,
+        replacement=replacement, evaluator=counting_evaluator(evaluated), rng=create_stream(1))
+
+    # The initial population is evaluated once, then only the offspring of every generation
+    assert evaluated == [20] + [offspring_size] * len(best_fitness_per_generation)
+    assert population == initial_population
+
+    # The best fitness never gets worse, and it is the one of the returned individual
+    assert best_fitness_per_generation == sorted(best_fitness_per_generation, reverse=True)
+    assert fitness_individual(best_individual) == best_fitness_per_generation[-1]
+
+
+@pytest.mark.parametrize('replacement, offspring_size', [('steady_state', 20), ('mu_comma_lambda', 10),
+                                                         ('generational', None)])
+def test_replacement_schemes_reject_invalid_settings(replacement, offspring_size):
+    population = initialize_population(20, 4, 4, 5, 8, create_stream(0))
+    with pytest.raises(ValueError):
+        evolve_population_with_replacement(population, tournament_selection, uniform_block_crossover, 0.9,
+                                           block_swap_mutation, 0.2, 5, replacement=replacement,
+                                           offspring_size=offspring_size)
+
+
+def test_async_pipeline_evaluates_a_population_worth_of_offspring_per_generation():
+    population = initialize_population(10, 4, 4, 5, 8, create_stream(0))
+    evaluated = []
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        best_individual, best_fitness_per_generation = evolve_population_async(
+            population, tournament_selection, uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 4, workers=2,
+            executor=executor, evaluator=counting_evaluator(evaluated), rng=create_stream(1))
+
+    # The offspring are evaluated in pairs, and a generation is reported for every population's worth of them
+    assert evaluated[0] == 10 and set(evaluated[1:]) == {2}
+    assert sum(evaluated[1:]) == 10 * len(best_fitness_per_generation)
+    assert len(best_fitness_per_generation) == 4 or best_fitness_per_generation[-1] == 0
+    assert best_fitness_per_generation == sorted(best_fitness_per_generation, reverse=True)
+    assert fitness_individual(best_individual) == best_fitness_per_generation[-1]
+
+
+def test_async_pipeline_runs_its_own_process_pool():
+    population = initialize_population(10, 4, 4, 5, 8, create_stream(0))
+    best_individual, best_fitness_per_generation = evolve_population_async(
+        population, tournament_selection, uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 2, workers=2,
+        rng=create_stream(1))
+    assert fitness_individual(best_individual) == best_fitness_per_generation[-1]
+
+
+def test_async_pipeline_needs_the_size_of_a_given_executor():
+    population = initialize_population(10, 4, 4, 5, 8, create_stream(0))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(ValueError):
+            evolve_population_async(population, tournament_selection, uniform_block_crossover, 0.9,
+                                    block_swap_mutation, 0.2, 2, executor=executor)
+
+
+def test_operator_probabilities_follow_the_rewards_and_keep_their_minimum():
+    qualities = [0.5, 0.5, 0.5]
+    probabilities = update_operator_probabilities(qualities, [[0.5, 0.7], [], [0.0]], 0.5, 0.1)
+    assert sum(probabilities) == pytest.approx(1)
+    assert min(probabilities) >= 0.1
+    assert probabilities[0] > probabilities[1] > probabilities[2]
+
+    # An operator without rewards keeps its quality
+    assert qualities[1] == 0.5
+
+    with pytest.raises(ValueError):
+        update_operator_probabilities([1.0, 1.0, 1.0], [[], [], []], 0.5, 0.4)
+
+
+def test_adaptive_engine_records_valid_operator_probabilities():
+    population = initialize_population(20, 4, 4, 5, 8, create_stream(0))
+    crossovers = [uniform_block_crossover, single_point_block_crossover, uniform_day_crossover]
+    mutations = [block_swap_mutation, block_inversion_mutation]
+    stats = {}
+
+    best_individual, best_fitness_per_generation = evolve_population_adaptive(
+        population, tournament_selection, crossovers, 0.9, mutations, 0.5, 5, min_probability=0.1, stats=stats,
+        rng=create_stream(1))
+
+    assert len(stats['crossover_probabilities']) == len(best_fitness_per_generation)
+    for probabilities in stats['crossover_probabilities'] + stats['mutation_probabilities']:
+        assert sum(probabilities) == pytest.approx(1)
+        assert min(probabilities) >= 0.1 - 1e-12
+    assert best_fitness_per_generation == sorted(best_fitness_per_generation, reverse=True)
+    assert fitness_individual(best_individual) == best_fitness_per_generation[-1]
+
+
+def test_adaptive_engine_rejects_too_high_minimum_probabilities():
+    population = initialize_population(20, 4, 4, 5, 8, create_stream(0))
+    with pytest.raises(ValueError):
+        evolve_population_adaptive(population, tournament_selection, [uniform_block_crossover], 0.9,
+                                   [block_swap_mutation, block_inversion_mutation, block_swap_mutation], 0.5, 5,
+                                   min_probability=0.5)
+
+
+def test_restricted_tournament_replacement_evaluates_only_the_offspring():
+    population = initialize_population(20, 4, 4, 5, 8, create_stream(0))
+    evaluated = []
+    stats = {}
+
+    best_individual, best_fitness_per_generation = evolve_population_rtr(
+        population, tournament_selection, uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 5, window_size=5,
+        stats=stats, evaluator=counting_evaluator(evaluated), rng=create_stream(1))
+
+    assert evaluated == [20] * (len(best_fitness_per_generation) + 1)
+    assert len(stats['diversity']) == len(best_fitness_per_generation)
+    assert best_fitness_per_generation == sorted(best_fitness_per_generation, reverse=True)
+    assert fitness_individual(best_individual) == best_fitness_per_generation[-1]
+
+
+def test_restricted_tournament_replacement_is_reproducible():
+    runs = [evolve_population_rtr(initialize_population(20, 4, 4, 5, 8, create_stream(0)), tournament_selection,
+                                  uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 5, rng=create_stream(1))
+            for _ in range(2)]
+    assert runs[0] == runs[1]
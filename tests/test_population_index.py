@@ -0,0 +1,35 @@
+# Import the necessary libraries and scripts
+from charles import copy_individual, initialize_population
+from crossovers import uniform_block_crossover
+from mutations import block_swap_mutation
+from optimization_problem import evolve_population
+from population_index import individual_key, insert_unique
+from random_streams import bind_stream, create_stream
+from selection_algorithms import tournament_selection
+
+
+def test_duplicates_are_replaced_before_insertion():
+    individual = initialize_population(1, 3, 4, 5, 8, create_stream(0))[0]
+    population_index = {individual_key(individual)}
+    mutation, = bind_stream(create_stream(1), block_swap_mutation)
+
+    replacement, is_duplicate = insert_unique(population_index, copy_individual(individual), mutation)
+    assert is_duplicate and replacement != individual
+    assert population_index == {individual_key(individual), individual_key(replacement)}
+
+    # A new individual is inserted unchanged, and an immigrant replaces a duplicate when given
+    other = initialize_population(1, 3, 4, 5, 8, create_stream(2))[0]
+    assert insert_unique(population_index, other, mutation) == (other, False)
+    immigrant = initialize_population(1, 3, 4, 5, 8, create_stream(3))[0]
+    assert insert_unique(population_index, copy_individual(other), mutation, lambda: immigrant) == (immigrant, True)
+
+
+def test_evolution_without_duplicates_keeps_a_distinct_population():
+    population = initialize_population(20, 3, 4, 5, 8, create_stream(0))
+    stats = {}
+    evolve_population(population, tournament_selection, uniform_block_crossover, 0.2, block_swap_mutation, 0.1, 5,
+                      stats=stats, eliminate_duplicates=True, rng=create_stream(1))
+
+    # With little crossover and mutation many offspring are copies of their parents, and all of them were replaced
+    assert len(stats['duplicate_rate']) == 5 and max(stats['duplicate_rate']) > 0
+    assert all(diversity['unique_individuals'] == 20 for diversity in stats['diversity'])
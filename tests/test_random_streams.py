@@ -0,0 +1,45 @@
+# Import the necessary libraries and scripts
+import random
+from concurrent.futures import ProcessPoolExecutor
+from charles import initialize_population
+from crossovers import uniform_block_crossover
+from mutations import block_swap_mutation
+from optimization_problem import evolve_population
+from random_streams import batch_generator, bind_stream, create_stream, spawn_streams
+from selection_algorithms import tournament_selection
+
+
+def run_trial(trial):
+    # A short run of the Genetic Algorithm drawing only from the stream of the trial
+    rng = create_stream(0, trial)
+    population = initialize_population(10, 3, 4, 5, 8, rng)
+    return evolve_population(population, tournament_selection, uniform_block_crossover, 0.9, block_swap_mutation, 0.2,
+                             3, rng=rng)
+
+
+def test_streams_depend_only_on_their_seed_and_key():
+    assert create_stream(0, 1, 2).random() == create_stream(0, 1, 2).random()
+    assert len({create_stream(0, key).random() for key in range(10)}) == 10
+    assert [stream.random() for stream in spawn_streams(3, 4)] == [create_stream(3, key).random() for key in range(4)]
+    assert batch_generator(create_stream(0)).random() == batch_generator(create_stream(0)).random()
+
+
+def test_bound_operators_draw_from_the_stream():
+    population = initialize_population(4, 3, 4, 5, 8, create_stream(0))
+    crossover, = bind_stream(create_stream(1), uniform_block_crossover)
+    assert crossover(population[0], population[1]) == uniform_block_crossover(population[0], population[1],
+                                                                               rng=create_stream(1))
+    assert bind_stream(None, uniform_block_crossover) == [uniform_block_crossover]
+
+
+def test_trials_do_not_depend_on_the_order_or_process_they_run_in():
+    state = random.getstate()
+    in_order = [run_trial(trial) for trial in range(3)]
+    reversed_order = [run_trial(trial) for trial in reversed(range(3))][::-1]
+
+    # The global random state is never drawn from
+    assert random.getstate() == state
+    assert in_order == reversed_order
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(run_trial, range(3))) == in_order
@@ -0,0 +1,56 @@
+# Import the necessary libraries and scripts
+import numpy as np
+from charles import copy_individual, encode_population, initialize_population
+from constraints import PENALTY_COMPONENTS, compile_constraints, penalty_components
+from fitness import fitness_individual
+from random_streams import create_stream
+from repair import break_and_quota_repair, overlap_repair, repair_population_array
+
+# Penalty components the break and quota repair is meant to remove
+STRUCTURAL_COMPONENTS = [PENALTY_COMPONENTS.index(component)
+                         for component in ['break_outside_preferred', 'missing_break', 'quota_shortfall']]
+
+
+def test_overlap_repair_never_increases_the_penalty():
+    for individual in initialize_population(50, 10, 4, 5, 8, create_stream(0)):
+        repaired = overlap_repair(copy_individual(individual))
+        assert fitness_individual(repaired) <= fitness_individual(individual)
+
+        # Only subject blocks are swapped within their day, so the 'Break' blocks and the weekly counts are unchanged
+        for turn, repaired_turn in zip(individual, repaired):
+            for day, repaired_day in zip(turn, repaired_turn):
+                assert sorted(day) == sorted(repaired_day)
+                assert [block == 'Break' for block in day] == [block == 'Break' for block in repaired_day]
+
+
+def test_overlap_repair_removes_the_overlaps_it_can_swap_away():
+    # Two Practical Turns with the same subjects in the same blocks, which can all be resolved by swapping
+    day = ['Subject_1', 'Subject_2', 'Subject_3', 'Break', 'Break', 'Subject_1', 'Subject_2', 'Subject_3']
+    individual = [[list(day) for _ in range(5)] for _ in range(2)]
+    repaired = overlap_repair(copy_individual(individual))
+    assert fitness_individual(repaired) < fitness_individual(individual)
+
+
+def test_break_and_quota_repair_never_increases_the_structural_penalties():
+    population = initialize_population(50, 10, 4, 5, 8, create_stream(0))
+    repaired_population = [break_and_quota_repair(copy_individual(individual)) for individual in population]
+
+    compiled_constraints = compile_constraints()
+    components = penalty_components(encode_population(population), compiled_constraints)[:, STRUCTURAL_COMPONENTS]
+    repaired_components = penalty_components(encode_population(repaired_population),
+                                             compiled_constraints)[:, STRUCTURAL_COMPONENTS]
+    assert (repaired_components <= components).all()
+
+    # Every day keeps a 'Break', and every Practical Turn keeps its subjects and its number of blocks
+    assert (repaired_components[:, 1] == 0).all()
+    for individual, repaired in zip(population, repaired_population):
+        for turn, repaired_turn in zip(individual, repaired):
+            subjects = {block for day in turn for block in day} - {'Break'}
+            assert {block for day in repaired_turn for block in day} - {'Break'} == subjects
+
+
+def test_population_repair_matches_the_repair_of_every_individual():
+    population = initialize_population(30, 10, 4, 5, 8, create_stream(0))
+    repaired_population = repair_population_array(encode_population(population))
+    expected = encode_population([break_and_quota_repair(copy_individual(individual)) for individual in population])
+    assert np.array_equal(repaired_population, expected)
@@ -0,0 +1,42 @@
+# Import the necessary libraries and scripts
+import pytest
+from charles import initialize_population
+from random_streams import create_stream
+from schedule_io import export_schedules, import_schedules, iter_text_schedules
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl', 'xlsx'])
+def test_exported_schedules_are_imported_back(tmp_path, extension):
+    # Excel files need openpyxl, which is optional
+    if extension == 'xlsx':
+        pytest.importorskip('openpyxl')
+    schedules = initialize_population(25, 3, 4, 5, 8, create_stream(0))
+    file_path = str(tmp_path / f"schedules.{extension}")
+
+    # Export from a generator, in several chunks
+    assert export_schedules((schedule for schedule in schedules), file_path, chunk_size=7) == 25
+    assert import_schedules(file_path) == schedules
+
+
+def test_export_rejects_unsupported_formats_and_skips_empty_exports(tmp_path):
+    with pytest.raises(ValueError):
+        export_schedules(initialize_population(1, 3, 4, 5, 8, create_stream(0)), str(tmp_path / 'schedules.txt'))
+    assert export_schedules([], str(tmp_path / 'schedules.csv')) == 0
+
+
+def test_import_rejects_unknown_blocks(tmp_path):
+    file_path = str(tmp_path / 'schedules.jsonl')
+    with open(file_path, 'w') as file:
+        file.write('{"schedule": 1, "turn": 1, "days": [["Subject_1", "Lunch"]]}\n')
+    with pytest.raises(ValueError):
+        import_schedules(file_path)
+
+
+def test_text_outputs_of_the_experiments_are_streamed(tmp_path):
+    schedules = initialize_population(3, 2, 4, 5, 8, create_stream(0))
+    file_path = tmp_path / 'set_of_global_optima.txt'
+    with open(file_path, 'w') as file:
+        file.write(f"Overall Best Individual: {schedules[0]}\nOverall Best Fitness: 0\n")
+        for schedule in schedules[1:]:
+            file.write(f"Individual: {schedule}\n")
+    assert list(iter_text_schedules(file_path)) == schedules
@@ -0,0 +1,90 @@
+# Import the necessary libraries and scripts
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+import pytest
+from fitness import fitness_individual
+from service import create_service, make_request_handler, shutdown_service
+
+
+@pytest.fixture(scope='module')
+def service_url():
+    # Run the service on a free local port for the whole module
+    service = create_service(workers=2, max_concurrent_jobs=2)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_request_handler(service))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    shutdown_service(service)
+
+
+def request(url, method='GET', body=None):
+    # Send a JSON request, returning the status and the JSON answer, including for error statuses
+    data = None if body is None else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method=method), timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def wait_for_job(url, job_id, statuses=('done', 'cancelled', 'failed'), timeout=20):
+    # Poll the progress of a job until it reaches one of the given statuses
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        status, progress = request(f"{url}/jobs/{job_id}")
+        if progress['status'] in statuses:
+            return progress
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} is still {progress['status']}")
+
+
+def test_service_solves_a_registered_instance(service_url):
+    instance = {'name': 'small', 'num_practical_turns': 4, 'subjects_per_practical_turn': 4, 'days_per_week': 5,
+                'blocks_per_day': 8}
+    assert request(f"{service_url}/instances", 'POST', instance) == (201, {'name': 'small'})
+    assert 'small' in request(f"{service_url}/instances")[1]
+
+    status, answer = request(f"{service_url}/jobs", 'POST', {'instance': 'small', 'deadline': 0.5, 'pop_size': 20,
+                                                              'seed': 0})
+    assert status == 202
+    progress = wait_for_job(service_url, answer['id'])
+
+    # The best individual and the improvements are reported, without the stop event
+    assert progress['status'] == 'done' and progress['error'] is None
+    assert progress['best_fitness'] == fitness_individual(progress['best_individual'])
+    assert progress['improvements'][-1]['fitness'] == progress['best_fitness']
+    assert 'stop_event' not in progress
+
+    # The list of jobs leaves the best individuals out
+    jobs = request(f"{service_url}/jobs")[1]
+    assert answer['id'] in [job['id'] for job in jobs]
+    assert all('best_individual' not in job for job in jobs)
+
+
+def test_service_cancels_a_running_job(service_url):
+    instance = {'name': 'cancelled', 'num_practical_turns': 10, 'subjects_per_practical_turn': 4,
+                'days_per_week': 5, 'blocks_per_day': 8}
+    request(f"{service_url}/instances", 'POST', instance)
+    job_id = request(f"{service_url}/jobs", 'POST', {'instance': 'cancelled', 'deadline': 60, 'pop_size': 20,
+                                                      'seed': 0})[1]['id']
+    wait_for_job(service_url, job_id, statuses=('running',))
+
+    status, answer = request(f"{service_url}/jobs/{job_id}", 'DELETE')
+    assert status == 200 and answer['id'] == job_id
+    assert wait_for_job(service_url, job_id)['status'] == 'cancelled'
+
+
+def test_service_rejects_invalid_requests(service_url):
+    assert request(f"{service_url}/jobs", 'POST', {'instance': 'unknown', 'deadline': 1})[0] == 400
+    assert request(f"{service_url}/jobs", 'POST', {'instance': 'small', 'deadline': 1, 'crossover': 'unknown'})[0] \
+        == 400
+    assert request(f"{service_url}/jobs", 'POST', {'deadline': 1})[0] == 400
+    assert request(f"{service_url}/jobs/999")[0] == 404
+    assert request(f"{service_url}/jobs/999", 'DELETE')[0] == 404
+    assert request(f"{service_url}/unknown")[0] == 404
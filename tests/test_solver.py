@@ -0,0 +1,51 @@
+# Import the necessary libraries and scripts
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fitness import fitness_individual
+from random_streams import create_stream
+from solver import choose_solver_settings, iter_solve, solve
+
+
+def test_solver_streams_strict_improvements_until_the_deadline():
+    start = time.monotonic()
+    improvements = list(iter_solve(4, 4, 5, 8, 0.5, pop_size=20, workers=1, batch_size=2, rng=create_stream(0)))
+    assert time.monotonic() - start < 5
+
+    # Every improvement is strictly better than the previous one, and its fitness is the one of its individual
+    fitnesses = [improvement['fitness'] for improvement in improvements]
+    assert fitnesses == sorted(set(fitnesses), reverse=True)
+    assert all(fitness_individual(improvement['individual']) == improvement['fitness'] for improvement in improvements)
+    evaluations = [improvement['evaluations'] for improvement in improvements]
+    assert evaluations[0] == 20 and evaluations == sorted(evaluations)
+
+
+def test_solve_returns_the_last_improvement():
+    improvements = []
+    best = solve(4, 4, 5, 8, 0.3, on_improvement=improvements.append, pop_size=20, workers=1, batch_size=2,
+                 rng=create_stream(0))
+    assert best is improvements[-1]
+
+
+def test_solver_stops_when_the_event_is_set():
+    stop_event = threading.Event()
+    stop_event.set()
+
+    # Only the initial population is evaluated, however long the deadline
+    start = time.monotonic()
+    improvements = list(iter_solve(4, 4, 5, 8, 60, pop_size=20, workers=1, batch_size=2, stop_event=stop_event,
+                                   rng=create_stream(0)))
+    assert time.monotonic() - start < 5
+    assert len(improvements) == 1 and improvements[0]['evaluations'] == 20
+
+
+def test_solver_evaluates_in_a_given_executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        best = solve(4, 4, 5, 8, 0.3, pop_size=20, workers=2, batch_size=4, executor=executor, rng=create_stream(0))
+    assert fitness_individual(best['individual']) == best['fitness']
+
+
+def test_solver_settings_fit_the_deadline():
+    settings = choose_solver_settings(0.5, 4, 4, 5, 8, rng=create_stream(0))
+    assert settings['workers'] == 1 and settings['batch_size'] == 2
+    assert 20 <= settings['pop_size'] <= 500
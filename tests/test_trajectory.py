@@ -0,0 +1,63 @@
+# Import the necessary libraries and scripts
+import numpy as np
+import pytest
+from charles import initialize_population
+from crossovers import uniform_block_crossover
+from fitness import evaluate_population
+from mutations import block_swap_mutation
+from optimization_problem import evolve_population
+from random_streams import create_stream
+from selection_algorithms import tournament_selection
+from trajectory import (PROVENANCE_FIELDS, close_trajectory_recorder, load_trajectory, open_trajectory_recorder,
+                        record_generation, trajectory_generation)
+
+
+def test_recorded_generations_are_read_back(tmp_path):
+    populations = [initialize_population(6, 3, 4, 5, 8, create_stream(0, generation)) for generation in range(6)]
+    recorder = open_trajectory_recorder(tmp_path, record_every=2, metadata={'run': 'test'})
+    for generation, population in enumerate(populations):
+        record_generation(recorder, generation, population, evaluate_population(population))
+
+        # A trajectory can be read while it is still being recorded
+        assert load_trajectory(tmp_path)['generations'].tolist() == list(range(0, generation + 1, 2))
+    close_trajectory_recorder(recorder)
+
+    trajectory = load_trajectory(tmp_path)
+    assert trajectory['metadata']['run'] == 'test' and trajectory['metadata']['shape'] == [6, 3, 5, 8]
+    assert trajectory['population'].shape == (3, 6, 3, 5, 8)
+    for generation in [0, 2, 4]:
+        population, fitness_scores, provenance = trajectory_generation(trajectory, generation)
+        assert population == populations[generation]
+        assert fitness_scores.tolist() == evaluate_population(populations[generation])
+        assert provenance.shape == (6, len(PROVENANCE_FIELDS)) and (provenance == -1).all()
+
+    with pytest.raises(KeyError):
+        trajectory_generation(trajectory, 3)
+    with pytest.raises(FileExistsError):
+        open_trajectory_recorder(tmp_path)
+
+
+def test_genetic_algorithm_records_the_provenance_of_every_individual(tmp_path):
+    recorder = open_trajectory_recorder(tmp_path)
+    evolve_population(initialize_population(10, 3, 4, 5, 8, create_stream(0)), tournament_selection,
+                      uniform_block_crossover, 0.9, block_swap_mutation, 0.2, 4, recorder=recorder,
+                      rng=create_stream(1), stop_at_optimum=False)
+    close_trajectory_recorder(recorder)
+
+    trajectory = load_trajectory(tmp_path)
+    assert trajectory['generations'].tolist() == [0, 1, 2, 3, 4]
+    for generation in range(1, 5):
+        previous_population, previous_fitness_scores, _ = trajectory_generation(trajectory, generation - 1)
+        population, fitness_scores, provenance = trajectory_generation(trajectory, generation)
+        assert fitness_scores.tolist() == evaluate_population(population)
+
+        # The elite is the best individual of the previous generation, neither crossed nor mutated
+        assert provenance[0].tolist() == [int(np.argmin(previous_fitness_scores)), -1, 0, 0]
+        assert population[0] == previous_population[provenance[0][0]]
+
+        # Every offspring has two parents in the previous generation, and is an unchanged copy of the first one when
+        # neither crossover nor mutation was applied
+        assert (provenance[1:, :2] >= 0).all() and (provenance[1:, :2] < 10).all()
+        for individual, (parent1, _, crossed, mutated) in zip(population[1:], provenance[1:]):
+            if not crossed and not mutated:
+                assert individual == previous_population[parent1]
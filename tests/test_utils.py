@@ -0,0 +1,44 @@
+# Import the necessary libraries and scripts
+import numpy as np
+import pytest
+from utils import convergence_metrics, iter_experiment_results, mean_confidence_interval, streaming_aggregate
+
+RESULTS = [
+    {'selection_algorithm': 'ranking_selection', 'crossover': 'A', 'average_best_fitnesses': [30, 20, 10]},
+    {'selection_algorithm': 'ranking_selection', 'crossover': 'B', 'average_best_fitnesses': [40, 25, 15]},
+    {'selection_algorithm': 'tournament_selection', 'crossover': 'A', 'average_best_fitnesses': [50, 45]},
+    {'selection_algorithm': 'ranking_selection', 'crossover': 'A', 'average_best_fitnesses': [35, 35, 5]}
+]
+
+
+def test_convergence_metrics():
+    assert convergence_metrics([30, 20, 10], threshold=20) == {'final_fitness': 10.0, 'area_under_curve': 60.0,
+                                                               'generations_to_threshold': 2}
+    assert convergence_metrics([30, 20, 10], threshold=5)['generations_to_threshold'] is None
+
+
+def test_streaming_aggregate_matches_the_batch_statistics():
+    aggregated = streaming_aggregate(iter(RESULTS), ['selection_algorithm', ('selection_algorithm', 'crossover')],
+                                     threshold=15)
+
+    # The running statistics match the ones computed on all the results of the group at once
+    ranking = aggregated['selection_algorithm']['ranking_selection']
+    expected = mean_confidence_interval([result['average_best_fitnesses'] for result in RESULTS
+                                         if result['selection_algorithm'] == 'ranking_selection'])
+    assert ranking['count'] == 3
+    assert np.allclose(ranking['mean'], expected['mean'])
+    assert np.allclose(ranking['conf_interval'], expected['conf_interval'])
+    assert ranking['threshold_reached_rate'] == 1
+    assert ranking['final_fitnesses'].tolist() == [5, 10, 15]
+
+    # Shorter sequences are padded with their last value, as done when a trial ends early
+    pair = aggregated[('selection_algorithm', 'crossover')]
+    assert pair[('tournament_selection', 'A')]['mean'].tolist() == [50, 45]
+    assert pair[('ranking_selection', 'A')]['mean'].tolist() == pytest.approx([32.5, 27.5, 7.5])
+    assert aggregated['selection_algorithm']['tournament_selection']['generations_to_threshold'] is None
+
+
+def test_experiment_results_are_streamed_from_their_file(tmp_path):
+    file_path = tmp_path / 'experiment_results.txt'
+    file_path.write_text(''.join(f"{result}\n" for result in RESULTS))
+    assert list(iter_experiment_results(file_path)) == RESULTS
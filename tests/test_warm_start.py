@@ -0,0 +1,47 @@
+# Import the necessary libraries and scripts
+import pytest
+from charles import initialize_population
+from constraints import make_population_evaluator
+from fitness import evaluate_population
+from random_streams import create_stream
+from warm_start import resolve, save_checkpoint, warm_start_population
+
+ENROLLMENT_CHANGES = {1: ['Subject_29', 'Subject_30', 'Subject_31'], 3: ['Subject_1', 'Subject_2']}
+CONSTRAINTS = [
+    None,
+    {'max_consecutive_blocks': 2, 'subject_quotas': {'Subject_30': 12}},
+    {'resources': {'teachers': {'Subject_29': 'Teacher_1', 'Subject_30': 'Teacher_1', 'Subject_1': 'Teacher_2'},
+                   'rooms': 3, 'teacher_unavailability': {'Teacher_1': [(0, 0), (2, 5)]}}}
+]
+
+
+@pytest.mark.parametrize('constraints', CONSTRAINTS)
+@pytest.mark.parametrize('pop_size', [None, 25])
+def test_incremental_fitness_matches_a_full_evaluation(tmp_path, constraints, pop_size):
+    checkpoint_path = tmp_path / 'checkpoint.npz'
+    save_checkpoint(initialize_population(10, 4, 4, 5, 8, create_stream(0)), checkpoint_path, constraints)
+
+    population, fitness_scores = warm_start_population(checkpoint_path, ENROLLMENT_CHANGES, pop_size,
+                                                       constraints=constraints, rng=create_stream(1))
+    assert len(population) == (10 if pop_size is None else pop_size)
+    assert fitness_scores == make_population_evaluator(constraints)(population)
+
+    # The changed Practical Turns only use their new subjects
+    for individual in population:
+        for turn, subjects in ENROLLMENT_CHANGES.items():
+            assert {block for day in individual[turn] for block in day} <= set(subjects) | {'Break'}
+
+
+def test_resolve_rescores_the_population_with_a_given_evaluator(tmp_path):
+    checkpoint_path = tmp_path / 'checkpoint.npz'
+    save_checkpoint(initialize_population(10, 4, 4, 5, 8, create_stream(0)), checkpoint_path)
+    evaluated = []
+
+    def evaluator(population):
+        evaluated.append(len(population))
+        return evaluate_population(population)
+
+    best = resolve(checkpoint_path, ENROLLMENT_CHANGES, 0.2, workers=1, batch_size=2, evaluator=evaluator,
+                   rng=create_stream(1))
+    assert evaluated[0] == 10
+    assert best['fitness'] == evaluate_population([best['individual']])[0]
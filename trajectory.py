@@ -0,0 +1,148 @@
+# Import the necessary libraries and scripts
+import json
+import os
+import numpy as np
+from charles import decode_population, encode_population
+
+# Fields of the provenance record of every individual: the indexes of its parents in the previous generation (-1 for
+# none, e.g. in the initial population), and whether crossover and mutation were applied to it
+PROVENANCE_FIELDS = ['parent1', 'parent2', 'crossover', 'mutation']
+
+
+def open_trajectory_recorder(path, record_every=1, metadata=None):
+    """
+    Open a trajectory recorder, which appends the encoded population, the fitness scores and the provenance of every
+    recorded generation to files in a directory, without keeping any of them in memory.
+
+    Every recorded generation adds (individuals x blocks) bytes for the population, plus 8 bytes of fitness and 16
+    bytes of provenance per individual, so recording every 'record_every' generations bounds both the disk usage and
+    the time spent recording.
+
+    Parameters:
+    - path (str): The directory of the trajectory. It is created if needed, and must not hold another trajectory.
+    - record_every (int): Record only one generation out of every 'record_every'.
+    - metadata (dict): Any JSON serializable description of the run (e.g. the operators used), saved with the
+      trajectory.
+
+    Returns:
+    - dict: The recorder, to be given to 'record_generation' and closed with 'close_trajectory_recorder'.
+    """
+    os.makedirs(path, exist_ok=True)
+    if os.path.exists(os.path.join(path, 'meta.json')):
+        raise FileExistsError(f"A trajectory was already recorded in {path}")
+
+    return {
+        'path': path,
+        'record_every': record_every,
+        'metadata': metadata or {},
+        'files': None,  # Opened on the first recorded generation, once the shape of the population is known
+    }
+
+
+def record_generation(recorder, generation, population, fitness_scores, provenance=None):
+    """
+    Append a generation to the trajectory, if it is one of the generations to be recorded.
+
+    Parameters:
+    - recorder (dict): The recorder (see 'open_trajectory_recorder').
+    - generation (int): The number of the generation (0 for the initial population).
+    - population (list): The population of the generation.
+    - fitness_scores (list): The fitness scores of the population.
+    - provenance (list): For every individual, a tuple with the fields of 'PROVENANCE_FIELDS'. If None, every field is
+      recorded as -1.
+    """
+    if generation % recorder['record_every'] != 0:
+        return
+
+    encoded_population = encode_population(population)
+
+    # Save the shape of the population and open the append-only files on the first recorded generation
+    if recorder['files'] is None:
+        with open(os.path.join(recorder['path'], 'meta.json'), 'w') as file:
+            json.dump({'shape': list(encoded_population.shape), 'record_every': recorder['record_every'],
+                       'provenance_fields': PROVENANCE_FIELDS, **recorder['metadata']}, file)
+        recorder['files'] = {name: open(os.path.join(recorder['path'], name), 'ab')
+                             for name in ['generations.i4', 'population.i1', 'fitness.f8', 'provenance.i4']}
+
+    if provenance is None:
+        provenance = np.full((len(population), len(PROVENANCE_FIELDS)), -1)
+
+    files = recorder['files']
+    for name, data in [('population.i1', encoded_population),
+                       ('fitness.f8', np.asarray(fitness_scores, dtype=np.float64)),
+                       ('provenance.i4', np.asarray(provenance, dtype=np.int32))]:
+        files[name].write(data.tobytes())
+        files[name].flush()
+
+    # The generation number is written and flushed last, so a generation is only visible once all its data is in the
+    # files
+    files['generations.i4'].write(np.int32(generation).tobytes())
+    files['generations.i4'].flush()
+
+
+def close_trajectory_recorder(recorder):
+    """
+    Close the files of a trajectory recorder.
+
+    Parameters:
+    - recorder (dict): The recorder (see 'open_trajectory_recorder').
+    """
+    for file in (recorder['files'] or {}).values():
+        file.close()
+    recorder['files'] = None
+
+
+def load_trajectory(path):
+    """
+    Open a recorded trajectory as read-only memory-mapped arrays, so any generation can be read without loading the
+    others. A trajectory can be opened while it is still being recorded.
+
+    Parameters:
+    - path (str): The directory of the trajectory.
+
+    Returns:
+    - dict: The 'metadata' of the trajectory, and the arrays of all recorded generations: the 'generations' numbers,
+      the encoded 'population' of shape (generations, individuals, Practical Turns, days, blocks), the 'fitness' of
+      shape (generations, individuals) and the 'provenance' of shape (generations, individuals, fields).
+    """
+    with open(os.path.join(path, 'meta.json'), 'r') as file:
+        metadata = json.load(file)
+    shape = tuple(metadata['shape'])
+
+    # Only the generations whose number was written are complete
+    generations = np.fromfile(os.path.join(path, 'generations.i4'), dtype=np.int32)
+    num_generations = len(generations)
+
+    def memory_map(name, dtype, record_shape):
+        if num_generations == 0:
+            return np.empty((0,) + record_shape, dtype=dtype)
+        return np.memmap(os.path.join(path, name), dtype=dtype, mode='r', shape=(num_generations,) + record_shape)
+
+    return {
+        'metadata': metadata,
+        'generations': generations,
+        'population': memory_map('population.i1', np.int8, shape),
+        'fitness': memory_map('fitness.f8', np.float64, shape[:1]),
+        'provenance': memory_map('provenance.i4', np.int32, (shape[0], len(metadata['provenance_fields'])))
+    }
+
+
+def trajectory_generation(trajectory, generation):
+    """
+    Read a recorded generation of a trajectory.
+
+    Parameters:
+    - trajectory (dict): The trajectory (see 'load_trajectory').
+    - generation (int): The number of the generation.
+
+    Returns:
+    - list: The population of the generation.
+    - np.ndarray: The fitness scores of the population.
+    - np.ndarray: The provenance of every individual (see 'PROVENANCE_FIELDS').
+    """
+    index = int(np.searchsorted(trajectory['generations'], generation))
+    if index == len(trajectory['generations']) or trajectory['generations'][index] != generation:
+        raise KeyError(f"Generation {generation} was not recorded")
+
+    return (decode_population(np.asarray(trajectory['population'][index])), np.asarray(trajectory['fitness'][index]),
+            np.asarray(trajectory['provenance'][index]))
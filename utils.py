@@ -4,29 +4,59 @@ import numpy as np
 from scipy.stats import sem, t
 
 
-def load_experiment_results(file_path):
+def iter_experiment_results(file_path):
     """
-    Load experiment results from a file.
+    Stream experiment results from a file, one result at a time, without loading the whole file into memory.
 
     Parameters:
     - file_path (str): The path to the file containing the experiment results.
 
-    Returns:
-    - list: A list of dictionaries containing the experiment results.
+    Yields:
+    - dict: The next experiment result in the file.
     """
-    results = []
     try:
         with open(file_path, 'r') as file:
-            for line in file.readlines():
+            for line in file:
                 try:
                     # eval to convert the string representation of a dictionary back to a dictionary
-                    result = eval(line.strip())
-                    results.append(result)
+                    yield eval(line.strip())
                 except SyntaxError as e:
                     print(f"Error parsing line: {line}. Error: {e}")
     except FileNotFoundError:
         print(f"File not found: {file_path}")
-    return results
+
+
+def load_experiment_results(file_path):
+    """
+    Load experiment results from a file.
+
+    Parameters:
+    - file_path (str): The path to the file containing the experiment results.
+
+    Returns:
+    - list: A list of dictionaries containing the experiment results.
+    """
+    return list(iter_experiment_results(file_path))
+
+
+def mean_confidence_interval(fitness_lists, confidence=0.95):
+    """
+    Calculate the mean and the half-width of the t-based confidence interval of a set of fitness sequences.
+
+    Parameters:
+    - fitness_lists (list): A list of fitness sequences of the same length (or a list of single fitness values).
+    - confidence (float): The confidence level of the interval.
+
+    Returns:
+    - dict: A dictionary with the 'mean' and the 'conf_interval' half-width, computed element-wise across the sequences.
+    """
+    mean = np.mean(fitness_lists, axis=0)
+    se = sem(fitness_lists, axis=0)
+    h = se * t.ppf((1 + confidence) / 2., len(fitness_lists) - 1)
+    return {
+        'mean': mean,
+        'conf_interval': h
+    }
 
 
 def aggregate_results(results, key):
@@ -52,14 +82,166 @@ def aggregate_results(results, key):
 
     # Calculate the mean and 95% confidence interval for each generation across all trials for each key value
     for value, fitness_lists in aggregated_data.items():
-        mean = np.mean(fitness_lists, axis=0)
-        se = sem(fitness_lists, axis=0)
-        h = se * t.ppf((1 + 0.95) / 2., len(fitness_lists) - 1)
-        aggregated_data[value] = {
-            'mean': mean,
-            'conf_interval': h
+        aggregated_data[value] = mean_confidence_interval(fitness_lists)
+
+    return aggregated_data
+
+
+def convergence_metrics(best_fitnesses, threshold=None):
+    """
+    Calculate convergence metrics of a single best fitness sequence.
+
+    Parameters:
+    - best_fitnesses (list): The best fitness value of each generation.
+    - threshold (float): The fitness value the run must reach. If None, 'generations_to_threshold' is None.
+
+    Returns:
+    - dict: A dictionary with the 'final_fitness', the 'area_under_curve' (the sum of the best fitness over all
+      generations, lower is better) and the 'generations_to_threshold' (the number of generations until the best fitness
+      was at most the threshold, or None if it never was).
+    """
+    best_fitnesses = np.asarray(best_fitnesses, dtype=float)
+
+    generations_to_threshold = None
+    if threshold is not None:
+        reached = np.flatnonzero(best_fitnesses <= threshold)
+        if reached.size:
+            generations_to_threshold = int(reached[0]) + 1
+
+    return {
+        'final_fitness': float(best_fitnesses[-1]),
+        'area_under_curve': float(best_fitnesses.sum()),
+        'generations_to_threshold': generations_to_threshold
+    }
+
+
+def welford_update(state, values):
+    """
+    Add one observation to the running mean and sum of squared deviations of a group (Welford's online algorithm).
+
+    The observation may be a single value or a fitness sequence. Sequences of different lengths are handled as if the
+    shorter ones were padded with their last value, as done when a trial ends early due to a Global Optimum.
+
+    Parameters:
+    - state (dict): The running 'count', 'mean' and 'm2' of the group. It is updated in place.
+    - values (np.ndarray): The new observation.
+    """
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+
+    if state['count'] == 0:
+        state['count'] = 1
+        state['mean'] = values.copy()
+        state['m2'] = np.zeros_like(values)
+        return
+
+    # Pad the shorter of the running statistics and the new observation with their last value. For the running
+    # statistics this is exact, since all previous observations were already padded to the same length
+    length = max(len(state['mean']), len(values))
+    if len(state['mean']) < length:
+        state['mean'] = np.pad(state['mean'], (0, length - len(state['mean'])), mode='edge')
+        state['m2'] = np.pad(state['m2'], (0, length - len(state['m2'])), mode='edge')
+    if len(values) < length:
+        values = np.pad(values, (0, length - len(values)), mode='edge')
+
+    state['count'] += 1
+    delta = values - state['mean']
+    state['mean'] += delta / state['count']
+    state['m2'] += delta * (values - state['mean'])
+
+
+def welford_confidence_interval(state, confidence=0.95):
+    """
+    Calculate the mean and the half-width of the t-based confidence interval from the running statistics of a group.
+    The result matches 'mean_confidence_interval' applied to all the observations of the group at once.
+
+    Parameters:
+    - state (dict): The running 'count', 'mean' and 'm2' of the group.
+    - confidence (float): The confidence level of the interval.
+
+    Returns:
+    - dict: A dictionary with the 'mean' and the 'conf_interval' half-width.
+    """
+    count = state['count']
+    if count < 2:
+        return {'mean': state['mean'], 'conf_interval': np.full_like(state['mean'], np.nan)}
+
+    se = np.sqrt(state['m2'] / (count - 1)) / np.sqrt(count)
+    return {
+        'mean': state['mean'],
+        'conf_interval': se * t.ppf((1 + confidence) / 2., count - 1)
+    }
+
+
+def streaming_aggregate(results, groupings, threshold=None, confidence=0.95):
+    """
+    Aggregate experiment results by several groupings in a single pass over the results, keeping only running
+    statistics in memory (Welford's online mean and variance per group and per generation).
+
+    Parameters:
+    - results (iterable): The experiment results, e.g. as streamed by 'iter_experiment_results'.
+    - groupings (list): The groupings to aggregate by, each a key or a tuple of keys, e.g.
+      ['selection_algorithm', ('crossover', 'mutation')].
+    - threshold (float): The fitness value used for the 'generations_to_threshold' convergence metric.
+    - confidence (float): The confidence level of the intervals.
+
+    Returns:
+    - dict: For every grouping, a dictionary mapping every group (the key value, or a tuple of values for several keys)
+      to its aggregated data: the 'mean' and 'conf_interval' of the best fitness per generation, the number of results
+      ('count'), the mean and confidence interval of the 'area_under_curve' and of the 'generations_to_threshold'
+      (over the results that reached it), the 'threshold_reached_rate', and the 'final_fitnesses' distribution.
+    """
+    groupings = [grouping if isinstance(grouping, tuple) else (grouping,) for grouping in groupings]
+    states = {grouping: {} for grouping in groupings}
+
+    def new_state():
+        return {
+            'curve': {'count': 0, 'mean': None, 'm2': None},
+            'area_under_curve': {'count': 0, 'mean': None, 'm2': None},
+            'generations_to_threshold': {'count': 0, 'mean': None, 'm2': None},
+            'final_fitnesses': []
         }
 
+    for result in results:
+        best_fitnesses = result['average_best_fitnesses']
+        metrics = convergence_metrics(best_fitnesses, threshold)
+
+        # Update the running statistics of the group this result belongs to, for every grouping
+        for grouping in groupings:
+            group = tuple(result[key] for key in grouping)
+            group = group[0] if len(group) == 1 else group
+            state = states[grouping].setdefault(group, new_state())
+
+            welford_update(state['curve'], best_fitnesses)
+            welford_update(state['area_under_curve'], metrics['area_under_curve'])
+            if metrics['generations_to_threshold'] is not None:
+                welford_update(state['generations_to_threshold'], metrics['generations_to_threshold'])
+            state['final_fitnesses'].append(metrics['final_fitness'])
+
+    # Turn the running statistics into means and confidence intervals
+    aggregated_data = {}
+    for grouping, groups in states.items():
+        grouping_name = grouping[0] if len(grouping) == 1 else grouping
+        aggregated_data[grouping_name] = {}
+
+        for group, state in groups.items():
+            data = welford_confidence_interval(state['curve'], confidence)
+            data['count'] = state['curve']['count']
+
+            area = welford_confidence_interval(state['area_under_curve'], confidence)
+            data['area_under_curve'] = {'mean': float(area['mean'][0]), 'conf_interval': float(area['conf_interval'][0])}
+
+            reached = state['generations_to_threshold']
+            data['threshold_reached_rate'] = reached['count'] / data['count']
+            if reached['count']:
+                generations = welford_confidence_interval(reached, confidence)
+                data['generations_to_threshold'] = {'mean': float(generations['mean'][0]),
+                                                    'conf_interval': float(generations['conf_interval'][0])}
+            else:
+                data['generations_to_threshold'] = None
+
+            data['final_fitnesses'] = np.sort(state['final_fitnesses'])
+            aggregated_data[grouping_name][group] = data
+
     return aggregated_data
 
 
@@ -101,42 +283,27 @@ def plot_aggregated_data(aggregated_data, title, ylabel, xlabel='Generation', sa
 
 def main():
 
-    # Load experiment results
-    results = load_experiment_results('experiment_results.txt')
+    # Aggregate the experiment results by every grouping in a single pass over the results file
+    aggregated_data = streaming_aggregate(iter_experiment_results('experiment_results.txt'),
+                                          ['selection_algorithm', 'crossover', 'mutation', 'fitness_sharing'])
 
-    if not results:
+    if not aggregated_data['selection_algorithm']:
         print("No results to plot.")
         return
 
-    # Aggregate results by selection algorithm
-    selection_data = aggregate_results(results, 'selection_algorithm')
-    plot_aggregated_data(selection_data, 'Average Best Fitness by Selection Algorithm, Across All Trials', 'Average Best Fitness', save_path='selection_algorithms_plot.png')
-
-    # Aggregate results by crossover
-    crossover_data = aggregate_results(results, 'crossover')
-    plot_aggregated_data(crossover_data, 'Average Best Fitness by Crossover Operator, Across All Trials', 'Average Best Fitness', save_path='crossovers_plot.png')
+    # Plot results by selection algorithm
+    plot_aggregated_data(aggregated_data['selection_algorithm'], 'Average Best Fitness by Selection Algorithm, Across All Trials', 'Average Best Fitness', save_path='selection_algorithms_plot.png')
 
-    # Aggregate results by mutation
-    mutation_data = aggregate_results(results, 'mutation')
-    plot_aggregated_data(mutation_data, 'Average Best Fitness by Mutation Operator, Across All Trials', 'Average Best Fitness', save_path='mutations_plot.png')
+    # Plot results by crossover
+    plot_aggregated_data(aggregated_data['crossover'], 'Average Best Fitness by Crossover Operator, Across All Trials', 'Average Best Fitness', save_path='crossovers_plot.png')
 
-    # Aggregate results by fitness sharing
-    fitness_sharing_data = {'With Fitness Sharing': [], 'Without Fitness Sharing': []}
-    for result in results:
-        if result['fitness_sharing']:
-            fitness_sharing_data['With Fitness Sharing'].append(result['average_best_fitnesses'])
-        else:
-            fitness_sharing_data['Without Fitness Sharing'].append(result['average_best_fitnesses'])
-
-    for key, fitness_lists in fitness_sharing_data.items():
-        mean = np.mean(fitness_lists, axis=0)
-        se = sem(fitness_lists, axis=0)
-        h = se * t.ppf((1 + 0.95) / 2., len(fitness_lists) - 1)
-        fitness_sharing_data[key] = {
-            'mean': mean,
-            'conf_interval': h
-        }
+    # Plot results by mutation
+    plot_aggregated_data(aggregated_data['mutation'], 'Average Best Fitness by Mutation Operator, Across All Trials', 'Average Best Fitness', save_path='mutations_plot.png')
 
+    # Plot results by fitness sharing
+    fitness_sharing_labels = {True: 'With Fitness Sharing', False: 'Without Fitness Sharing'}
+    fitness_sharing_data = {fitness_sharing_labels[value]: data
+                            for value, data in sorted(aggregated_data['fitness_sharing'].items(), reverse=True)}
     plot_aggregated_data(fitness_sharing_data, 'Average Best Fitness with and without Fitness Sharing, Across All Trials', 'Average Best Fitness', save_path='fitness_sharing_plot.png')
 
 
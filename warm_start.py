@@ -0,0 +1,254 @@
+# Import the necessary libraries and scripts
+import random
+import numpy as np
+from charles import BLOCK_CODES, BREAK_CODE, copy_individual, decode_population, encode_population
+from constraints import compile_constraints, count_slots, make_population_evaluator, penalty_components, \
+    slot_penalty_components
+from mutations import block_swap_mutation
+from random_streams import bind_stream
+from solver import solve
+
+
+def turn_penalties(encoded_turns, compiled_constraints):
+    """
+    Calculate the penalty of every Practical Turn on its own, i.e. every penalty that does not depend on the other
+    Practical Turns ('Break' placement, missing 'Break', weekly quotas and consecutive blocks).
+
+    Parameters:
+    - encoded_turns (np.ndarray): The Practical Turns of a compact population, of shape (individuals, Practical Turns,
+      days, blocks).
+    - compiled_constraints (dict): The constraints compiled by 'constraints.compile_constraints'.
+
+    Returns:
+    - np.ndarray: An array of shape (individuals, Practical Turns) with the penalty of every Practical Turn.
+    """
+    pop_size, num_turns, num_days, num_blocks = encoded_turns.shape
+
+    # Score every Practical Turn as an individual of its own, which has no overlaps, and without resources, which only
+    # conflict across Practical Turns
+    single_turns = encoded_turns.reshape(pop_size * num_turns, 1, num_days, num_blocks)
+    components = penalty_components(single_turns, {**compiled_constraints, 'teacher_of_value': None})
+    return components.sum(axis=1).reshape(pop_size, num_turns)
+
+
+def evaluation_state(encoded_population, compiled_constraints):
+    """
+    Build the evaluation state of a compact population, from which its fitness can be updated incrementally when a few
+    Practical Turns change: the penalty of every Practical Turn on its own and the per-slot counters of every
+    individual.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer, of shape (individuals, Practical Turns, days,
+      blocks).
+    - compiled_constraints (dict): The constraints compiled by 'constraints.compile_constraints'.
+
+    Returns:
+    - dict: The 'turn_penalties' of shape (individuals, Practical Turns) and the 'slot_counts' of shape (individuals,
+      slots, block values).
+    """
+    return {
+        'turn_penalties': turn_penalties(encoded_population, compiled_constraints),
+        'slot_counts': count_slots(encoded_population)
+    }
+
+
+def state_fitness(state, compiled_constraints):
+    """
+    Calculate the fitness of every individual from its evaluation state. It is the same fitness the compiled evaluator
+    computes from the whole individuals.
+
+    Parameters:
+    - state (dict): The evaluation state of the population (see 'evaluation_state').
+    - compiled_constraints (dict): The constraints compiled by 'constraints.compile_constraints'.
+
+    Returns:
+    - np.ndarray: The total penalty of every individual (lower is better).
+    """
+    slot_components = slot_penalty_components(state['slot_counts'], compiled_constraints)
+    return slot_components @ compiled_constraints['weights'] + state['turn_penalties'].sum(axis=1)
+
+
+def save_checkpoint(population, file_path='population_checkpoint.npz', constraints=None):
+    """
+    Save a population (or a single best individual, as a population of one) with its evaluation state, so that a later
+    re-solve can start from it.
+
+    Parameters:
+    - population (list): The population to be saved.
+    - file_path (str): The path of the checkpoint file.
+    - constraints (dict): The constraint specification the population is evaluated with. If None, the defaults are
+      used.
+    """
+    encoded_population = encode_population(population)
+    num_days, num_blocks = encoded_population.shape[2:]
+    state = evaluation_state(encoded_population, compile_constraints(constraints, num_blocks, num_days))
+    np.savez_compressed(file_path, population=encoded_population, **state)
+    print(f"Checkpoint saved to {file_path}")
+
+
+def load_checkpoint(file_path='population_checkpoint.npz'):
+    """
+    Load a population saved by 'save_checkpoint'.
+
+    Parameters:
+    - file_path (str): The path of the checkpoint file.
+
+    Returns:
+    - np.ndarray: The compact population buffer.
+    - dict: The evaluation state of the population.
+    """
+    with np.load(file_path) as checkpoint:
+        return checkpoint['population'], {'turn_penalties': checkpoint['turn_penalties'],
+                                          'slot_counts': checkpoint['slot_counts']}
+
+
+def patch_turn(encoded_turn, subjects, rng=None):
+    """
+    Patch the weekly schedule of a Practical Turn after its enrollment changed. The 'Break' blocks and the blocks of the
+    subjects it is still enrolled in are kept in place, and every block of a subject it is no longer enrolled in is
+    given to the enrolled subject with the fewest weekly blocks so far, so the new subjects get closer to their quotas.
+
+    Parameters:
+    - encoded_turn (np.ndarray): The compact weekly schedule of the Practical Turn, of shape (days, blocks). It is
+      patched in place.
+    - subjects (list): The subjects the Practical Turn is now enrolled in.
+    - rng (random.Random): The random stream the order of the subjects is drawn from (see 'random_streams.py'). If
+      None, the global 'random' module is used.
+
+    Returns:
+    - np.ndarray: The flat positions (day * blocks + block) of the patched blocks.
+    - np.ndarray: The previous codes of the patched blocks.
+    """
+    rng = random if rng is None else rng
+    blocks = encoded_turn.reshape(-1)
+    codes = np.array(rng.sample([BLOCK_CODES[subject] for subject in subjects], len(subjects)))
+
+    # Find the subject blocks of subjects the Practical Turn is no longer enrolled in
+    positions = np.flatnonzero((blocks != BREAK_CODE) & ~np.isin(blocks, codes))
+    previous_codes = blocks[positions].copy()
+
+    # Give each of them, in turn, to the enrolled subject with the fewest weekly blocks. Ties go to the first subject in
+    # the shuffled order, so different individuals are patched differently
+    weekly_counts = np.array([np.count_nonzero(blocks == code) for code in codes])
+    for position in positions:
+        subject_index = int(np.argmin(weekly_counts))
+        blocks[position] = codes[subject_index]
+        weekly_counts[subject_index] += 1
+
+    return positions, previous_codes
+
+
+def patch_population(encoded_population, state, enrollment_changes, compiled_constraints, rng=None):
+    """
+    Patch every individual of a compact population after the enrollment of some Practical Turns changed, and update
+    its evaluation state incrementally: only the changed Practical Turns are re-scored, and the per-slot counters are
+    only updated for the patched blocks.
+
+    Parameters:
+    - encoded_population (np.ndarray): The compact population buffer. It is patched in place.
+    - state (dict): The evaluation state of the population (see 'evaluation_state'). It is updated in place.
+    - enrollment_changes (dict): The new list of subjects of every changed Practical Turn, by its index.
+    - compiled_constraints (dict): The constraints compiled by 'constraints.compile_constraints'.
+    - rng (random.Random): The random stream the patches are drawn from. If None, the global 'random' module is used.
+
+    Returns:
+    - np.ndarray: The fitness of every patched individual.
+    """
+    changed_turns = sorted(enrollment_changes)
+
+    for individual_index, encoded_individual in enumerate(encoded_population):
+        slot_counts = state['slot_counts'][individual_index]
+
+        for turn in changed_turns:
+            positions, previous_codes = patch_turn(encoded_individual[turn], enrollment_changes[turn], rng)
+
+            # Move the patched blocks from their previous subjects to the new ones in the per-slot counters
+            np.subtract.at(slot_counts, (positions, previous_codes), 1)
+            np.add.at(slot_counts, (positions, encoded_individual[turn].reshape(-1)[positions]), 1)
+
+    # Re-score only the changed Practical Turns
+    state['turn_penalties'][:, changed_turns] = turn_penalties(encoded_population[:, changed_turns],
+                                                               compiled_constraints)
+
+    return state_fitness(state, compiled_constraints)
+
+
+def warm_start_population(checkpoint_path, enrollment_changes, pop_size=None, mutation=block_swap_mutation,
+                          constraints=None, rng=None):
+    """
+    Build the initial population of a re-solve from a checkpoint, after the enrollment of some Practical Turns changed.
+    Every checkpointed individual is patched (see 'patch_population') and, if the population must be larger than the
+    checkpoint (e.g. when only the previous best individual was saved), it is completed with mutated copies of the
+    patched individuals.
+
+    Parameters:
+    - checkpoint_path (str): The path of the checkpoint file (see 'save_checkpoint').
+    - enrollment_changes (dict): The new list of subjects of every changed Practical Turn, by its index.
+    - pop_size (int): Number of individuals in the population. If None, the size of the checkpoint is kept.
+    - mutation (function): The mutation operator used to complete the population.
+    - constraints (dict): The constraint specification the checkpoint was saved with. If None, the defaults are used.
+    - rng (random.Random): The random stream the patches and the mutations are drawn from (see 'random_streams.py').
+      If None, the global 'random' module is used.
+
+    Returns:
+    - list: The initial population.
+    - list: The fitness scores of the initial population.
+    """
+    encoded_population, state = load_checkpoint(checkpoint_path)
+    num_days, num_blocks = encoded_population.shape[2:]
+    compiled_constraints = compile_constraints(constraints, num_blocks, num_days)
+
+    # Patch the checkpointed individuals and update their fitness incrementally
+    fitness_scores = patch_population(encoded_population, state, enrollment_changes, compiled_constraints,
+                                      rng).tolist()
+    population = decode_population(encoded_population)
+
+    # Complete the population with mutated copies of the patched individuals, which must be evaluated in full
+    pop_size = len(population) if pop_size is None else pop_size
+    mutation, = bind_stream(rng, mutation)
+    immigrants = [mutation(copy_individual(population[index % len(population)]))
+                  for index in range(pop_size - len(population))]
+    if immigrants:
+        evaluator = make_population_evaluator(constraints, num_blocks, num_days)
+        population.extend(immigrants)
+        fitness_scores.extend(evaluator(immigrants))
+
+    return population[:pop_size], fitness_scores[:pop_size]
+
+
+def resolve(checkpoint_path, enrollment_changes, deadline, pop_size=None, constraints=None, **solver_options):
+    """
+    Re-solve the scheduling problem after the enrollment of some Practical Turns changed, continuing the evolution from
+    a checkpointed population (or best individual) instead of a random population.
+
+    Parameters:
+    - checkpoint_path (str): The path of the checkpoint file (see 'save_checkpoint').
+    - enrollment_changes (dict): The new list of subjects of every changed Practical Turn, by its index.
+    - deadline (float): The time budget, in seconds.
+    - pop_size (int): Number of individuals in the population. If None, the size of the checkpoint is kept.
+    - constraints (dict): The constraint specification the checkpoint was saved with. If None, the defaults are used.
+    - solver_options: Any other option of 'solver.iter_solve'. If no 'evaluator' is given, the constraints are compiled
+      into one and the incrementally updated fitness scores of the checkpoint are kept. Otherwise, the initial
+      population is re-scored in full with the given evaluator.
+
+    Returns:
+    - dict: The last improvement, with the best 'individual', its 'fitness', the 'elapsed' seconds and the number of
+      'evaluations' carried out when it was found.
+    """
+    population, fitness_scores = warm_start_population(checkpoint_path, enrollment_changes, pop_size,
+                                                       solver_options.get('mutation', block_swap_mutation),
+                                                       constraints, solver_options.get('rng'))
+    num_practical_turns, days_per_week, blocks_per_day = len(population[0]), len(population[0][0]), \
+        len(population[0][0][0])
+    subjects_per_practical_turn = max(len(subjects) for subjects in enrollment_changes.values())
+
+    # The incremental fitness scores come from the compiled constraints, so they are only comparable with the scores of
+    # the offspring when the same constraints evaluate them
+    if 'evaluator' in solver_options:
+        fitness_scores = None
+    else:
+        solver_options['evaluator'] = make_population_evaluator(constraints, blocks_per_day, days_per_week)
+
+    return solve(num_practical_turns, subjects_per_practical_turn, days_per_week, blocks_per_day, deadline,
+                 pop_size=len(population), initial_population=population,
+                 initial_fitness_scores=fitness_scores, **solver_options)